@@ -0,0 +1,155 @@
+from functools import lru_cache
+from dotenv import load_dotenv
+from typing import Iterable
+import hashlib
+import os
+
+load_dotenv()
+
+ADDRESS_PREFIX = 0x41
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+_BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+_BASE58_CHARS = frozenset(BASE58_ALPHABET)
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+
+# Longest accepted form: "0x" + 42 hex digits.
+MAX_ADDRESS_LENGTH = 44
+
+
+def _checksum(payload: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+
+
+def _b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = []
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded.append(BASE58_ALPHABET[remainder])
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return BASE58_ALPHABET[0] * leading_zeros + "".join(reversed(encoded))
+
+
+def _b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        number = number * 58 + _BASE58_INDEX[char]
+    leading_zeros = len(text) - len(text.lstrip(BASE58_ALPHABET[0]))
+    return b"\x00" * leading_zeros + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def _normalize(address: str) -> tuple[str | None, str | None]:
+    """
+    Converts an address to base58check form without memoization.
+
+    Args:
+        address (str): Address with surrounding whitespace already removed.
+
+    Returns:
+        tuple[str | None, str | None]: The canonical address and None, or None and the reason it is invalid.
+    """
+    if len(address) == 34 and address[0] == "T":
+        if not _BASE58_CHARS.issuperset(address):
+            return None, "invalid base58 character"
+        raw = _b58decode(address)
+        if len(raw) != 25 or raw[0] != ADDRESS_PREFIX:
+            return None, "bad base58check format"
+        if _checksum(raw[:21]) != raw[21:]:
+            return None, "bad checksum"
+        return address, None
+
+    hex_digits = address[2:] if address[:2] in ("0x", "0X") else address
+    if len(hex_digits) == 40 and address[:2] in ("0x", "0X"):
+        # Ethereum-style 20-byte form.
+        hex_digits = "41" + hex_digits
+    if len(hex_digits) != 42 or not _HEX_CHARS.issuperset(hex_digits):
+        return None, "wrong length or format"
+    raw = bytes.fromhex(hex_digits)
+    if raw[0] != ADDRESS_PREFIX:
+        return None, "hex address must start with 41"
+    return _b58encode(raw + _checksum(raw)), None
+
+
+_normalize_cached = lru_cache(maxsize=int(os.getenv("ADDRESS_CACHE_SIZE", "100000")))(_normalize)
+
+
+def normalize_address(address: str) -> str:
+    """
+    Converts a Tron address in any accepted form to its canonical base58check form.
+
+    Accepted forms are base58check ("T..."), hex with the 41 prefix ("41..." or "0x41...") and the
+    20-byte Ethereum-style hex form ("0x...").
+
+    Args:
+        address (str): Tron wallet address.
+
+    Returns:
+        str: The canonical base58check address.
+
+    Raises:
+        ValueError: If the address is invalid; the message is only the reason (e.g. "bad checksum"), for
+            callers to prefix.
+
+    Notes:
+        - Inputs of impossible length or type are rejected before any decoding or hashing.
+        - Results, including failures, are memoized in a bounded LRU (ADDRESS_CACHE_SIZE), so repeated
+          addresses cost a dictionary lookup.
+    """
+    if not isinstance(address, str):
+        raise ValueError("expected a string")
+    address = address.strip()
+    if not 34 <= len(address) <= MAX_ADDRESS_LENGTH:
+        raise ValueError("wrong length or format")
+    canonical, error = _normalize_cached(address)
+    if error is not None:
+        raise ValueError(error)
+    return canonical
+
+
+def is_valid_address(address: str) -> bool:
+    """
+    Tells whether `address` is a valid Tron address in any accepted form.
+
+    Args:
+        address (str): Tron wallet address.
+
+    Returns:
+        bool: True if the address can be normalized.
+    """
+    try:
+        normalize_address(address)
+        return True
+    except ValueError:
+        return False
+
+
+def validate_addresses(addresses: Iterable[str]) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Normalizes a batch of addresses, validating each distinct input once.
+
+    Args:
+        addresses (Iterable[str]): Tron wallet addresses, possibly with duplicates.
+
+    Returns:
+        tuple[dict[str, str], dict[str, str]]: Canonical address by input for valid addresses, and error
+            description by input for invalid ones.
+    """
+    valid, invalid = {}, {}
+    for address in dict.fromkeys(addresses):
+        try:
+            valid[address] = normalize_address(address)
+        except ValueError as e:
+            invalid[address] = str(e)
+    return valid, invalid
+
+
+def get_cache_info() -> dict:
+    """
+    Returns counters of the memoized validator.
+
+    Returns:
+        dict: hits, misses, maxsize and currsize of the validation LRU.
+    """
+    return _normalize_cached.cache_info()._asdict()
@@ -0,0 +1,257 @@
+from collections import deque
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+import asyncio
+import os
+import time
+from app import tron_service
+from app.cache import TTLCache
+from app.logger import setup_logger
+
+if TYPE_CHECKING:
+    from tronpy import AsyncTron
+
+logger = setup_logger("block_follower")
+
+load_dotenv()
+
+# Tron produces a block every 3 seconds.
+BLOCK_INTERVAL = 3.0
+
+
+@dataclass
+class BlockFollowerStats:
+    """
+    Counters of the block follower.
+
+    Attributes:
+        blocks (int): Blocks processed.
+        refreshes (int): Cached wallets refreshed because a block touched them.
+        invalidations (int): Cached wallets dropped because a block touched them.
+        errors (int): Polls that failed.
+        fallbacks (int): Times the follower fell behind and reverted the cache to its own TTL.
+    """
+    blocks: int = 0
+    refreshes: int = 0
+    invalidations: int = 0
+    errors: int = 0
+    fallbacks: int = 0
+
+
+def touched_addresses(block: dict) -> set[str]:
+    """
+    Collects the addresses referenced by the contracts of a block's transactions.
+
+    Args:
+        block (dict): Block as returned by `AsyncTron.get_block` (visible, i.e. with base58check addresses).
+
+    Returns:
+        set[str]: Values of every `*_address` field of the contracts' parameters.
+
+    Notes:
+        - Addresses are not validated: they are only compared with the keys of the wallet cache.
+        - Internal transactions (e.g. TRX sent by a smart contract) are not part of the block, so changes
+          they cause are only picked up when the entry expires.
+    """
+    addresses = set()
+    for transaction in block.get("transactions", []):
+        for contract in transaction.get("raw_data", {}).get("contract", []):
+            value = contract.get("parameter", {}).get("value", {})
+            for field, address in value.items():
+                if field.endswith("_address") and isinstance(address, str):
+                    addresses.add(address)
+    return addresses
+
+
+def _block_number(block: dict) -> int:
+    return block["block_header"]["raw_data"]["number"]
+
+
+class BlockFollower:
+    """
+    Background task following new Tron blocks and updating the cached wallets their transactions touch.
+
+    Each poll fetches the head block and any block since the last one processed, collects the addresses
+    referenced by their transactions and, for those present in the local wallet cache, either refreshes them
+    from the Tron API ("refresh") or drops them ("invalidate"). Touched addresses are handled again for
+    `settle_blocks` further blocks, which covers lookups that started before the block was processed and API
+    nodes lagging behind the head.
+
+    While the follower keeps up, local cache entries stay fresh for `synced_ttl` seconds instead of the
+    cache's own TTL. If it falls more than `max_lag` blocks behind, or cannot reach the Tron API for as long,
+    it reverts the cache to its own TTL, marks local entries stale and resumes from the head block; the long
+    TTL is restored after `settle_blocks` blocks have been processed in order again.
+
+    Args:
+        cache (TTLCache): The wallet cache.
+        call (Callable[[Callable[[AsyncTron], Awaitable[Any]]], Awaitable[Any]]): Issues a Tron API request,
+            e.g. `UpstreamPool.call`.
+        refresh (Callable[[str], Awaitable[dict]]): Fetches and caches current wallet information for an address.
+        mode (str): "invalidate" or "refresh".
+        interval (float): Seconds between polls.
+        synced_ttl (float): Seconds local entries stay fresh while the follower keeps up.
+        max_lag (int): Number of blocks the follower may fall behind before falling back to the cache TTL.
+        settle_blocks (int): Number of further blocks for which touched addresses are handled again.
+        concurrency (int): Maximum number of refreshes in flight at once.
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+
+    Raises:
+        ValueError: If `mode` is unknown.
+
+    Attributes:
+        block_number (int | None): Number of the last processed block.
+        synced (bool): Whether local entries currently use `synced_ttl`.
+        stats (BlockFollowerStats): Counters.
+    """
+
+    def __init__(
+            self,
+            cache: TTLCache,
+            call: Callable[[Callable[["AsyncTron"], Awaitable[Any]]], Awaitable[Any]],
+            refresh: Callable[[str], Awaitable[dict]],
+            mode: str = "invalidate",
+            interval: float = 1.0,
+            synced_ttl: float = 300.0,
+            max_lag: int = 10,
+            settle_blocks: int = 2,
+            concurrency: int = 10,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        if mode not in ("invalidate", "refresh"):
+            raise ValueError("mode must be 'invalidate' or 'refresh'")
+        self.cache = cache
+        self.call = call
+        self.refresh = refresh
+        self.mode = mode
+        self.interval = interval
+        self.synced_ttl = synced_ttl
+        self.max_lag = max_lag
+        self.settle_blocks = settle_blocks
+        self.concurrency = concurrency
+        self.block_number: int | None = None
+        self.synced = False
+        self.stats = BlockFollowerStats()
+        self._clock = clock
+        self._recent: deque[set[str]] = deque(maxlen=settle_blocks + 1)
+        self._in_order = 0
+        self._caught_up_at = clock()
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """
+        Starts following blocks on the running event loop.
+        """
+        if self.running:
+            return
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "Block follower started: mode=%s, interval=%s, synced_ttl=%s, max_lag=%s",
+            self.mode, self.interval, self.synced_ttl, self.max_lag
+        )
+
+    async def stop(self) -> None:
+        """
+        Stops following blocks and reverts the cache to its own TTL.
+        """
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        self._fall_back("stopped")
+        logger.info("Block follower stopped: last block=%s, stats=%s", self.block_number, self.stats)
+
+    async def poll(self) -> None:
+        """
+        Processes the blocks produced since the last poll.
+
+        Raises:
+            Exception: Whatever the Tron API call raises; blocks processed before the failure are kept.
+        """
+        head = await self.call(lambda client: client.get_latest_block())
+        head_number = _block_number(head)
+        if self.block_number is not None and head_number <= self.block_number:
+            self._caught_up_at = self._clock()
+            return
+
+        if self.block_number is None or head_number - self.block_number > self.max_lag:
+            if self.block_number is not None:
+                self._fall_back(f"{head_number - self.block_number} blocks behind")
+            # Changes in skipped blocks are covered by the entries having been marked stale.
+            self._in_order = 0
+            self._recent.clear()
+        else:
+            for number in range(self.block_number + 1, head_number):
+                await self._process(number, await self.call(lambda client, n=number: client.get_block(n)))
+        await self._process(head_number, head)
+        self._caught_up_at = self._clock()
+        if not self.synced and self._in_order > self.settle_blocks:
+            self.synced = True
+            self.cache.ttl_extension = max(0.0, self.synced_ttl - self.cache.ttl)
+            logger.info("Block follower in sync at block %s, wallet cache TTL is %s s", head_number, self.synced_ttl)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                self.stats.errors += 1
+                logger.error("Block follower poll failed: %s", e)
+            if self.synced and self._clock() - self._caught_up_at > self.max_lag * BLOCK_INTERVAL:
+                self._fall_back(f"no block processed for {self._clock() - self._caught_up_at:.0f} s")
+            await asyncio.sleep(self.interval)
+
+    async def _process(self, number: int, block: dict) -> None:
+        self._recent.append(touched_addresses(block))
+        self.block_number = number
+        self._in_order += 1
+        self.stats.blocks += 1
+        cached = [address for address in set().union(*self._recent) if address in self.cache]
+        if cached:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(*(self._update(address, semaphore) for address in cached))
+
+    async def _update(self, address: str, semaphore: asyncio.Semaphore) -> None:
+        if self.mode == "refresh":
+            async with semaphore:
+                try:
+                    await self.refresh(address)
+                    self.stats.refreshes += 1
+                    return
+                except Exception as e:
+                    logger.warning("Block follower failed to refresh address=%s: %s", address, e)
+        await self.cache.invalidate(address)
+        self.stats.invalidations += 1
+
+    def _fall_back(self, reason: str) -> None:
+        self._in_order = 0
+        if not self.synced:
+            return
+        self.synced = False
+        self.cache.ttl_extension = 0.0
+        self.cache.expire_local()
+        self.stats.fallbacks += 1
+        logger.warning("Block follower fell back to the wallet cache TTL: %s", reason)
+
+
+BLOCK_FOLLOWER_ENABLED = os.getenv("BLOCK_FOLLOWER_ENABLED", "false").lower() == "true"
+
+follower = BlockFollower(
+    tron_service.wallet_cache,
+    lambda fn: tron_service.get_upstream_pool().call(fn),
+    tron_service.refresh_wallet_info,
+    mode=os.getenv("BLOCK_FOLLOWER_MODE", "invalidate"),
+    interval=float(os.getenv("BLOCK_FOLLOWER_INTERVAL", "1.0")),
+    synced_ttl=float(os.getenv("BLOCK_FOLLOWER_CACHE_TTL", "300")),
+    max_lag=int(os.getenv("BLOCK_FOLLOWER_MAX_LAG", "10")),
+    settle_blocks=int(os.getenv("BLOCK_FOLLOWER_SETTLE_BLOCKS", "2")),
+    concurrency=int(os.getenv("BLOCK_FOLLOWER_CONCURRENCY", "10"))
+)
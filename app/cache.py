@@ -0,0 +1,387 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable
+import asyncio
+import time
+from app.logger import setup_logger
+from app.shared_state import SharedState
+
+logger = setup_logger("cache")
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached value together with its freshness boundaries.
+
+    Attributes:
+        value (Any): The cached value.
+        fresh_until (float): Wall-clock timestamp until which the value is served as fresh.
+        stale_until (float): Wall-clock timestamp until which the value may still be served while it is refreshed.
+    """
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing cache effectiveness.
+
+    Attributes:
+        hits (int): Lookups answered with a fresh entry.
+        stale_hits (int): Lookups answered with a stale entry while a refresh was scheduled.
+        misses (int): Lookups that had to call the loader.
+        evictions (int): Entries dropped from the local LRU because it was full.
+        refreshes (int): Background refreshes that completed successfully.
+        refresh_errors (int): Background refreshes that failed.
+    """
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class CacheBackend(ABC):
+    """
+    Interface for a shared cache backend (e.g. Redis) used behind the local LRU.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> CacheEntry | None:
+        """Returns the entry stored under `key`, or None if it is absent or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """Stores `entry` under `key` until `entry.stale_until`."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Removes the entry stored under `key`, if any."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local stand-in for a shared cache backend, intended for tests and single-instance deployments.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._entries: dict[str, CacheEntry] = {}
+        self._clock = clock
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.stale_until <= self._clock():
+            del self._entries[key]
+            return None
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SharedStateCacheBackend(CacheBackend):
+    """
+    Cache backend kept in the state shared by all workers (see `app.shared_state`).
+
+    Args:
+        state (SharedState): The shared state.
+        prefix (str): Key prefix separating this cache from other users of the shared state.
+        clock (Callable[[], float], optional): Wall-clock time source, overridable in tests.
+    """
+
+    def __init__(self, state: SharedState, prefix: str = "cache:", clock: Callable[[], float] = time.time):
+        self.state = state
+        self.prefix = prefix
+        self._clock = clock
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await self.state.get(self.prefix + key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ttl = entry.stale_until - self._clock()
+        if ttl > 0:
+            await self.state.set(self.prefix + key, entry, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.state.delete(self.prefix + key)
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Chain of cache backends consulted in order, e.g. a shared in-memory level before a durable one.
+
+    A hit in a later level is copied into the earlier ones. Writes and deletes go to every level.
+
+    Args:
+        backends (list[CacheBackend]): Backends from fastest to slowest.
+    """
+
+    def __init__(self, backends: list[CacheBackend]):
+        self.backends = backends
+
+    async def get(self, key: str) -> CacheEntry | None:
+        for index, backend in enumerate(self.backends):
+            entry = await backend.get(key)
+            if entry is not None:
+                for faster in self.backends[:index]:
+                    await faster.set(key, entry)
+                return entry
+        return None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        for backend in self.backends:
+            await backend.set(key, entry)
+
+    async def delete(self, key: str) -> None:
+        for backend in self.backends:
+            await backend.delete(key)
+
+
+class LRUCache:
+    """
+    Bounded in-process mapping that evicts the least recently used entry when full.
+
+    Args:
+        maxsize (int): Maximum number of entries to keep.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def items(self) -> list[tuple[str, CacheEntry]]:
+        return list(self._data.items())
+
+    def peek(self, key: str) -> CacheEntry | None:
+        # Unlike `get`, does not count as a use.
+        return self._data.get(key)
+
+    def replace(self, key: str, entry: CacheEntry) -> None:
+        # Unlike `set`, keeps the entry's position in the eviction order.
+        if key in self._data:
+            self._data[key] = entry
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache:
+    """
+    Two-level TTL cache with stale-while-revalidate semantics.
+
+    Fresh entries are returned immediately. Entries past their TTL but within the stale window are
+    returned as well, while a single background task reloads them. Anything older is treated as a miss.
+
+    Args:
+        maxsize (int): Maximum number of entries in the local LRU.
+        ttl (float): Seconds an entry is considered fresh.
+        stale_ttl (float): Additional seconds a stale entry may be served while it is refreshed.
+        backend (CacheBackend, optional): Shared backend consulted on local misses.
+        clock (Callable[[], float], optional): Time source, overridable in tests.
+
+    Attributes:
+        ttl_extension (float): Extra seconds local entries stay fresh, set while something else (e.g. the block
+            follower) invalidates changed keys; entries written to the backend always use `ttl`.
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            ttl: float,
+            stale_ttl: float = 0.0,
+            backend: CacheBackend | None = None,
+            clock: Callable[[], float] = time.time
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.ttl_extension = 0.0
+        self.backend = backend
+        self._local = LRUCache(maxsize)
+        self._clock = clock
+        self._stats = CacheStats()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+        """
+        self._stats.evictions = self._local.evictions
+        return CacheStats(**asdict(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._local
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` on a miss.
+
+        Args:
+            key (str): Cache key.
+            loader (Callable[[], Awaitable[Any]]): Coroutine factory producing a fresh value.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+
+        Raises:
+            Exception: Whatever `loader` raises on a miss. Failed loads are never cached.
+        """
+        now = self._clock()
+        entry = await self._lookup(key, now)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._stats.hits += 1
+                return entry.value
+            self._stats.stale_hits += 1
+            self._schedule_refresh(key, loader)
+            return entry.value
+
+        self._stats.misses += 1
+        value = await loader()
+        await self.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Stores `value` under `key` in the local LRU and the shared backend.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Value to store.
+        """
+        now = self._clock()
+        entry = CacheEntry(value=value, fresh_until=now + self.ttl, stale_until=now + self.ttl + self.stale_ttl)
+        if self.ttl_extension > 0:
+            self._local.set(key, CacheEntry(
+                value=value, fresh_until=entry.fresh_until + self.ttl_extension,
+                stale_until=entry.stale_until + self.ttl_extension
+            ))
+        else:
+            self._local.set(key, entry)
+        if self.backend is not None:
+            await self.backend.set(key, entry)
+
+    def peek(self, key: str) -> Any | None:
+        """
+        Returns the locally cached value for `key` regardless of its age, without touching counters.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Any | None: The last known value, or None if the key is not cached locally.
+        """
+        entry = self._local.get(key)
+        return entry.value if entry is not None else None
+
+    def fresh_for(self, key: str) -> float:
+        """
+        Returns how long the local entry for `key` stays fresh, without touching counters or LRU order.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            float: Seconds until the entry becomes stale; 0 if it is stale or not cached locally.
+        """
+        entry = self._local.peek(key)
+        return max(0.0, entry.fresh_until - self._clock()) if entry is not None else 0.0
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Removes `key` from both cache levels.
+
+        Args:
+            key (str): Cache key.
+        """
+        self._local.delete(key)
+        if self.backend is not None:
+            await self.backend.delete(key)
+
+    def expire_local(self) -> None:
+        """
+        Marks every local entry as stale, so the next lookup of each one schedules a refresh.
+
+        Notes:
+            - Values remain servable for at most `stale_ttl` more seconds; used when the invalidation that
+              justified `ttl_extension` can no longer be trusted.
+        """
+        now = self._clock()
+        for key, entry in self._local.items():
+            # Entries may be shared with an in-memory backend, so they are replaced rather than mutated.
+            self._local.replace(key, CacheEntry(
+                value=entry.value, fresh_until=min(entry.fresh_until, now),
+                stale_until=min(entry.stale_until, now + self.stale_ttl)
+            ))
+
+    async def close(self) -> None:
+        """
+        Cancels pending background refreshes.
+        """
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _lookup(self, key: str, now: float) -> CacheEntry | None:
+        entry = self._local.get(key)
+        if entry is None and self.backend is not None:
+            entry = await self.backend.get(key)
+            if entry is not None:
+                self._local.set(key, entry)
+        if entry is not None and entry.stale_until <= now:
+            # Expired entries stay in the LRU until evicted so `peek` can serve them as a last resort.
+            return None
+        return entry
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await loader()
+            await self.set(key, value)
+            self._stats.refreshes += 1
+        except Exception as e:
+            self._stats.refresh_errors += 1
+            logger.error("Background refresh failed for key=%s: %s", key, e)
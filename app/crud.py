@@ -1,8 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Request
+from sqlalchemy import select, insert, delete, text, tuple_, case, Row, Select, func, cast, extract, Integer
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import ColumnElement
+from app.models import Request, WalletSnapshot, AddressRequestCount, MinuteRequestCount
+from collections import Counter
+from typing import AsyncIterator
 from datetime import datetime, UTC
-from app.logger import setup_logger
+import base64
+import json
+from app.logger import setup_logger, SAMPLED
+from app.metrics import stage_duration
 
 logger = setup_logger("crud")
 
@@ -23,17 +30,197 @@ async def create_request(db: AsyncSession, wallet_address: str) -> Request:
     """
     try:
         db_request = Request(wallet_address=wallet_address, created_at=datetime.now(UTC))
-        db.add(db_request)
-        await db.commit()
-        await db.refresh(db_request)
-        logger.info(f"Created request in DB: wallet_address={wallet_address}, id={db_request.id}")
+        with stage_duration.time("db_write"):
+            db.add(db_request)
+            await _update_rollups(db, [(wallet_address, db_request.created_at)])
+            await db.commit()
+            await db.refresh(db_request)
+        logger.info(
+            "Created request in DB: wallet_address=%s, id=%s", wallet_address, db_request.id, extra=SAMPLED
+        )
         return db_request
     except Exception as e:
-        logger.error(f"Failed to create request in DB for wallet_address={wallet_address}: {str(e)}")
+        logger.error("Failed to create request in DB for wallet_address=%s: %s", wallet_address, e)
+        raise
+
+
+async def create_requests(
+        db: AsyncSession,
+        wallet_addresses: list[str],
+        created_at: list[datetime] | None = None
+) -> int:
+    """
+    Creates request records for several wallet addresses in a single bulk insert.
+
+    The request rollups are updated in the same transaction, with one upsert per distinct address and
+    minute in the batch.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        wallet_addresses (list[str]): Tron wallet addresses to record.
+        created_at (list[datetime], optional): Per-address request timestamps; defaults to the current time.
+
+    Returns:
+        int: Number of records written.
+
+    Raises:
+        Exception: If an error occurs while writing to the database (e.g., connection issues).
+    """
+    if not wallet_addresses:
+        return 0
+    try:
+        if created_at is None:
+            created_at = [datetime.now(UTC)] * len(wallet_addresses)
+        with stage_duration.time("db_write"):
+            await db.execute(
+                insert(Request),
+                [
+                    {"wallet_address": wallet_address, "created_at": timestamp}
+                    for wallet_address, timestamp in zip(wallet_addresses, created_at)
+                ]
+            )
+            await _update_rollups(db, list(zip(wallet_addresses, created_at)))
+            await db.commit()
+        logger.info("Created %s requests in DB in bulk", len(wallet_addresses))
+        return len(wallet_addresses)
+    except Exception as e:
+        logger.error("Failed to create %s requests in DB in bulk: %s", len(wallet_addresses), e)
         raise
 
 
-async def get_requests(db: AsyncSession, offset: int, limit: int) -> list[Request]:
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _minute(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp.astimezone(UTC).replace(second=0, microsecond=0)
+
+
+async def _update_rollups(db: AsyncSession, requests: list[tuple[str, datetime]]) -> None:
+    """
+    Adds requests to the per-address and per-minute counters without committing.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        requests (list[tuple[str, datetime]]): Wallet address and creation time of each new request.
+
+    Notes:
+        - Rows are upserted in key order, so concurrent batches lock counters in the same order.
+    """
+    by_address: dict[str, tuple[int, datetime]] = {}
+    by_minute: Counter[datetime] = Counter()
+    for wallet_address, created_at in requests:
+        count, last_requested_at = by_address.get(wallet_address, (0, created_at))
+        by_address[wallet_address] = (count + 1, max(last_requested_at, created_at))
+        by_minute[_minute(created_at)] += 1
+
+    upsert = _UPSERT_INSERTS[db.bind.dialect.name]
+    statement = upsert(AddressRequestCount)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[AddressRequestCount.wallet_address],
+            set_={
+                "request_count": AddressRequestCount.request_count + statement.excluded.request_count,
+                "last_requested_at": case(
+                    (
+                        statement.excluded.last_requested_at > AddressRequestCount.last_requested_at,
+                        statement.excluded.last_requested_at
+                    ),
+                    else_=AddressRequestCount.last_requested_at
+                )
+            }
+        ),
+        [
+            {"wallet_address": wallet_address, "request_count": count, "last_requested_at": last_requested_at}
+            for wallet_address, (count, last_requested_at) in sorted(by_address.items())
+        ]
+    )
+    statement = upsert(MinuteRequestCount)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[MinuteRequestCount.minute],
+            set_={"request_count": MinuteRequestCount.request_count + statement.excluded.request_count}
+        ),
+        [{"minute": minute, "request_count": count} for minute, count in sorted(by_minute.items())]
+    )
+
+
+def encode_cursor(created_at: datetime, request_id: int) -> str:
+    """
+    Encodes the position of a request into an opaque pagination cursor.
+
+    Args:
+        created_at (datetime): Creation time of the last request on a page.
+        request_id (int): Identifier of the last request on a page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = json.dumps([created_at.isoformat(), request_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodes a pagination cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string.
+
+    Returns:
+        tuple[datetime, int]: Creation time and identifier of the last request on the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, request_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(request_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+# Columns of `schemas.RequestResponse`: list reads select plain rows instead of hydrating ORM entities.
+REQUEST_COLUMNS = (Request.id, Request.created_at, Request.wallet_address)
+
+
+def _filter_requests(
+        query: Select,
+        wallet_address: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> Select:
+    """
+    Applies optional wallet address and time range filters to a requests query.
+
+    Args:
+        query (Select): Query selecting from the `requests` table.
+        wallet_address (str, optional): Only keep requests for this wallet address.
+        created_from (datetime, optional): Inclusive lower bound of `created_at`.
+        created_to (datetime, optional): Exclusive upper bound of `created_at`.
+
+    Returns:
+        Select: The filtered query.
+    """
+    if wallet_address is not None:
+        query = query.where(Request.wallet_address == wallet_address)
+    if created_from is not None:
+        query = query.where(Request.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Request.created_at < created_to)
+    return query
+
+
+async def get_requests(
+        db: AsyncSession,
+        offset: int,
+        limit: int,
+        wallet_address: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> list[Row]:
     """
     Retrieves a paginated list of recent requests from the database.
 
@@ -41,23 +228,432 @@ async def get_requests(db: AsyncSession, offset: int, limit: int) -> list[Reques
         db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
         offset (int): Number of records to skip for pagination.
         limit (int): Maximum number of records to return.
+        wallet_address (str, optional): Only return requests for this wallet address.
+        created_from (datetime, optional): Only return requests created at or after this time.
+        created_to (datetime, optional): Only return requests created before this time.
 
     Returns:
-        list[Request]: List of `Request` objects, sorted by creation time (descending).
+        list[Row]: `(id, created_at, wallet_address)` rows, sorted by creation time (descending).
 
     Raises:
         Exception: If an error occurs while reading from the database (e.g., connection issues).
     """
     try:
-        result = await db.execute(
-            select(Request)
-            .order_by(Request.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+        query = _filter_requests(select(*REQUEST_COLUMNS), wallet_address, created_from, created_to)
+        with stage_duration.time("db_read"):
+            result = await db.execute(
+                query
+                .order_by(Request.created_at.desc(), Request.id.desc())
+                .offset(offset)
+                .limit(limit)
+            )
+            requests = list(result.all())
+        logger.info(
+            "Retrieved %s requests from DB with offset=%s, limit=%s", len(requests), offset, limit, extra=SAMPLED
         )
-        requests = list(result.scalars().all())
-        logger.info(f"Retrieved {len(requests)} requests from DB with offset={offset}, limit={limit}")
         return requests
     except Exception as e:
-        logger.error(f"Failed to retrieve requests from DB with offset={offset}, limit={limit}: {str(e)}")
+        logger.error("Failed to retrieve requests from DB with offset=%s, limit=%s: %s", offset, limit, e)
+        raise
+
+
+async def get_requests_page(
+        db: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        wallet_address: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> tuple[list[Row], str | None]:
+    """
+    Retrieves a page of recent requests using keyset pagination.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        limit (int): Maximum number of records to return.
+        cursor (str, optional): Cursor returned for the previous page; None for the first page.
+        wallet_address (str, optional): Only return requests for this wallet address.
+        created_from (datetime, optional): Only return requests created at or after this time.
+        created_to (datetime, optional): Only return requests created before this time.
+
+    Returns:
+        tuple[list[Row], str | None]: `(id, created_at, wallet_address)` rows sorted by creation time
+            (descending) and the cursor of the next page, or None if there are no more records.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+
+    Notes:
+        - Seeks directly past `(created_at, id)` of the cursor, so deep pages cost the same as the first one.
+        - On a partitioned table only partitions up to the cursor (and within `created_from`/`created_to`)
+          are scanned.
+    """
+    query = _filter_requests(select(*REQUEST_COLUMNS), wallet_address, created_from, created_to)
+    if cursor is not None:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        # The plain bound on created_at is implied by the row comparison, but only it lets PostgreSQL skip
+        # partitions newer than the cursor.
+        query = query.where(
+            Request.created_at <= cursor_created_at,
+            tuple_(Request.created_at, Request.id) < tuple_(cursor_created_at, cursor_id)
+        )
+
+    try:
+        with stage_duration.time("db_read"):
+            result = await db.execute(
+                query
+                .order_by(Request.created_at.desc(), Request.id.desc())
+                .limit(limit + 1)
+            )
+            requests = list(result.all())
+    except Exception as e:
+        logger.error("Failed to retrieve requests page from DB with limit=%s: %s", limit, e)
+        raise
+
+    next_cursor = None
+    if len(requests) > limit:
+        requests = requests[:limit]
+        next_cursor = encode_cursor(requests[-1].created_at, requests[-1].id)
+    logger.info("Retrieved page of %s requests from DB with limit=%s", len(requests), limit, extra=SAMPLED)
+    return requests, next_cursor
+
+
+async def stream_requests(
+        db: AsyncSession,
+        batch_size: int = 1000,
+        wallet_address: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> AsyncIterator[list[Row]]:
+    """
+    Streams all matching requests from a server-side cursor in batches.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session, used for this stream only until it is exhausted.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+        wallet_address (str, optional): Only return requests for this wallet address.
+        created_from (datetime, optional): Only return requests created at or after this time.
+        created_to (datetime, optional): Only return requests created before this time.
+
+    Yields:
+        list[Row]: Up to `batch_size` `(id, created_at, wallet_address)` rows, in creation order (ascending).
+
+    Raises:
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+
+    Notes:
+        - Only one batch is held in memory at a time, whatever the size of the result.
+        - On a partitioned table only the partitions within `created_from`/`created_to` are scanned.
+    """
+    query = _filter_requests(select(*REQUEST_COLUMNS), wallet_address, created_from, created_to)
+    exported = 0
+    try:
+        result = await db.stream(
+            query.order_by(Request.created_at, Request.id).execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            exported += len(rows)
+            yield list(rows)
+    except Exception as e:
+        logger.error("Failed to stream requests from DB after %s rows: %s", exported, e)
+        raise
+    logger.info("Streamed %s requests from DB", exported)
+
+
+async def create_snapshots(db: AsyncSession, snapshots: list[tuple[str, datetime, dict]]) -> int:
+    """
+    Stores fetched wallet information in a single bulk insert.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        snapshots (list[tuple[str, datetime, dict]]): Wallet address, fetch time and wallet information
+            (balance_trx, bandwidth, energy) of each snapshot.
+
+    Returns:
+        int: Number of snapshots written.
+
+    Raises:
+        Exception: If an error occurs while writing to the database (e.g., connection issues).
+    """
+    if not snapshots:
+        return 0
+    try:
+        with stage_duration.time("db_write"):
+            await db.execute(
+                insert(WalletSnapshot),
+                [
+                    {
+                        "wallet_address": wallet_address,
+                        "captured_at": captured_at,
+                        "balance_trx": wallet_info["balance_trx"],
+                        "bandwidth": wallet_info["bandwidth"],
+                        "energy": wallet_info["energy"]
+                    }
+                    for wallet_address, captured_at, wallet_info in snapshots
+                ]
+            )
+            await db.commit()
+        logger.info("Created %s wallet snapshots in DB in bulk", len(snapshots))
+        return len(snapshots)
+    except Exception as e:
+        logger.error("Failed to create %s wallet snapshots in DB: %s", len(snapshots), e)
+        raise
+
+
+async def get_latest_snapshot(
+        db: AsyncSession,
+        wallet_address: str,
+        captured_from: datetime | None = None
+) -> WalletSnapshot | None:
+    """
+    Retrieves the most recent snapshot of a wallet.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        wallet_address (str): Tron wallet address in base58check form.
+        captured_from (datetime, optional): Ignore snapshots captured before this time.
+
+    Returns:
+        WalletSnapshot | None: The latest snapshot, or None if there is none (recent enough).
+
+    Raises:
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+    """
+    query = select(WalletSnapshot).where(WalletSnapshot.wallet_address == wallet_address)
+    if captured_from is not None:
+        query = query.where(WalletSnapshot.captured_at >= captured_from)
+    with stage_duration.time("db_read"):
+        result = await db.execute(
+            query.order_by(WalletSnapshot.captured_at.desc(), WalletSnapshot.id.desc()).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+
+def _time_bucket(column: ColumnElement, interval: int, dialect: str) -> ColumnElement:
+    """
+    Builds an expression numbering the `interval`-second bucket (since the Unix epoch) a timestamp falls in.
+
+    Args:
+        column (ColumnElement): Timestamp column.
+        interval (int): Bucket width in seconds.
+        dialect (str): Name of the database dialect.
+
+    Returns:
+        ColumnElement: Integer bucket number.
+    """
+    if dialect == "sqlite":
+        # Integer division of non-negative integers truncates, i.e. floors.
+        return cast(func.strftime("%s", column), Integer) // interval
+    return cast(func.floor(extract("epoch", column) / interval), Integer)
+
+
+async def get_snapshot_history(
+        db: AsyncSession,
+        wallet_address: str,
+        interval: int,
+        limit: int,
+        captured_from: datetime | None = None,
+        captured_to: datetime | None = None
+) -> list[dict]:
+    """
+    Aggregates a wallet's snapshots into time buckets with min, max and last values.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        wallet_address (str): Tron wallet address in base58check form.
+        interval (int): Bucket width in seconds.
+        limit (int): Maximum number of buckets to return (the most recent ones).
+        captured_from (datetime, optional): Inclusive lower bound of `captured_at`.
+        captured_to (datetime, optional): Exclusive upper bound of `captured_at`.
+
+    Returns:
+        list[dict]: Buckets in chronological order, each containing:
+            - start (datetime): Start of the bucket.
+            - samples (int): Number of snapshots in the bucket.
+            - balance_trx, bandwidth, energy (dict): `min`, `max` and `last` value in the bucket.
+
+    Raises:
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+
+    Notes:
+        - Aggregation runs in SQL with window functions over the `(wallet_address, captured_at)` index
+          range, so a single pass returns one row per bucket.
+    """
+    bucket = _time_bucket(WalletSnapshot.captured_at, interval, db.bind.dialect.name)
+    series = (WalletSnapshot.balance_trx, WalletSnapshot.bandwidth, WalletSnapshot.energy)
+    columns = [bucket.label("bucket"), func.count().over(partition_by=bucket).label("samples")]
+    for column in series:
+        columns += [
+            func.min(column).over(partition_by=bucket).label(f"min_{column.key}"),
+            func.max(column).over(partition_by=bucket).label(f"max_{column.key}"),
+            column.label(f"last_{column.key}"),
+        ]
+    columns.append(
+        func.row_number().over(
+            partition_by=bucket, order_by=(WalletSnapshot.captured_at.desc(), WalletSnapshot.id.desc())
+        ).label("position")
+    )
+    query = select(*columns).where(WalletSnapshot.wallet_address == wallet_address)
+    if captured_from is not None:
+        query = query.where(WalletSnapshot.captured_at >= captured_from)
+    if captured_to is not None:
+        query = query.where(WalletSnapshot.captured_at < captured_to)
+    ranked = query.subquery()
+
+    try:
+        with stage_duration.time("db_read"):
+            result = await db.execute(
+                select(ranked).where(ranked.c.position == 1).order_by(ranked.c.bucket.desc()).limit(limit)
+            )
+            rows = result.mappings().all()
+    except Exception as e:
+        logger.error("Failed to retrieve snapshot history for wallet_address=%s: %s", wallet_address, e)
+        raise
+
+    logger.info(
+        "Retrieved %s history buckets for wallet_address=%s, interval=%s", len(rows), wallet_address, interval,
+        extra=SAMPLED
+    )
+    return [
+        {
+            "start": datetime.fromtimestamp(int(row["bucket"]) * interval, UTC),
+            "samples": row["samples"],
+            **{
+                column.key: {stat: row[f"{stat}_{column.key}"] for stat in ("min", "max", "last")}
+                for column in series
+            }
+        }
+        for row in reversed(rows)
+    ]
+
+
+async def get_top_addresses(
+        db: AsyncSession,
+        limit: int,
+        requested_since: datetime | None = None
+) -> list[AddressRequestCount | Row]:
+    """
+    Retrieves the most requested wallet addresses, of all time or within a recent window.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        limit (int): Maximum number of addresses to return.
+        requested_since (datetime, optional): Rank by the requests created at or after this time only.
+
+    Returns:
+        list[AddressRequestCount | Row]: Items with wallet_address, request_count and last_requested_at,
+            sorted by request count (descending); counts are within the window if `requested_since` is given.
+
+    Raises:
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+
+    Notes:
+        - All-time counts are read from the per-address rollup. The rollup cannot tell when its requests were
+          made, so windowed counts are aggregated from the requests in the window, read through the
+          `(created_at, id)` index; the cost grows with the traffic in the window, not with the history.
+    """
+    if requested_since is None:
+        query = select(AddressRequestCount).order_by(
+            AddressRequestCount.request_count.desc(), AddressRequestCount.wallet_address.desc()
+        )
+    else:
+        request_count = func.count().label("request_count")
+        query = (
+            select(Request.wallet_address, request_count, func.max(Request.created_at).label("last_requested_at"))
+            .where(Request.created_at >= requested_since)
+            .group_by(Request.wallet_address)
+            .order_by(request_count.desc(), Request.wallet_address.desc())
+        )
+    try:
+        with stage_duration.time("db_read"):
+            result = await db.execute(query.limit(limit))
+            return list(result.scalars().all() if requested_since is None else result.all())
+    except Exception as e:
+        logger.error("Failed to retrieve top addresses from DB with limit=%s: %s", limit, e)
         raise
+
+
+async def get_requests_per_minute(
+        db: AsyncSession,
+        limit: int,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> list[MinuteRequestCount]:
+    """
+    Retrieves request counts per minute from the per-minute rollup.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        limit (int): Maximum number of minutes to return (the most recent ones).
+        created_from (datetime, optional): Inclusive lower bound of the minute.
+        created_to (datetime, optional): Exclusive upper bound of the minute.
+
+    Returns:
+        list[MinuteRequestCount]: Counters of minutes with at least one request, in chronological order.
+
+    Raises:
+        Exception: If an error occurs while reading from the database (e.g., connection issues).
+    """
+    query = select(MinuteRequestCount)
+    if created_from is not None:
+        query = query.where(MinuteRequestCount.minute >= created_from)
+    if created_to is not None:
+        query = query.where(MinuteRequestCount.minute < created_to)
+    try:
+        with stage_duration.time("db_read"):
+            result = await db.execute(query.order_by(MinuteRequestCount.minute.desc()).limit(limit))
+            return list(reversed(result.scalars().all()))
+    except Exception as e:
+        logger.error("Failed to retrieve requests per minute from DB with limit=%s: %s", limit, e)
+        raise
+
+
+async def rebuild_rollups(db: AsyncSession, batch_size: int = 10000) -> tuple[int, int]:
+    """
+    Recomputes the request rollups from the `requests` table.
+
+    Args:
+        db (AsyncSession): Asynchronous SQLAlchemy session for database operations.
+        batch_size (int): Number of per-minute counters inserted per statement.
+
+    Returns:
+        tuple[int, int]: Number of per-address and per-minute counters written.
+
+    Raises:
+        Exception: If an error occurs while accessing the database (e.g., connection issues).
+
+    Notes:
+        - Runs in one transaction. On PostgreSQL, request writes wait until it commits so that no request
+          is counted twice or missed.
+    """
+    dialect = db.bind.dialect.name
+    try:
+        if dialect == "postgresql":
+            await db.execute(text("LOCK TABLE requests IN SHARE MODE"))
+        await db.execute(delete(AddressRequestCount))
+        await db.execute(delete(MinuteRequestCount))
+
+        addresses = await db.execute(
+            insert(AddressRequestCount).from_select(
+                ["wallet_address", "request_count", "last_requested_at"],
+                select(Request.wallet_address, func.count(), func.max(Request.created_at))
+                .group_by(Request.wallet_address)
+            )
+        )
+
+        bucket = _time_bucket(Request.created_at, 60, dialect).label("bucket")
+        # One row per minute with requests; minutes are computed in SQL to keep the timestamps portable.
+        minutes = (await db.execute(select(bucket, func.count()).group_by(bucket))).all()
+        for start in range(0, len(minutes), batch_size):
+            await db.execute(insert(MinuteRequestCount), [
+                {"minute": datetime.fromtimestamp(int(bucket) * 60, UTC), "request_count": count}
+                for bucket, count in minutes[start:start + batch_size]
+            ])
+        await db.commit()
+    except Exception as e:
+        logger.error("Failed to rebuild request rollups: %s", e)
+        raise
+
+    logger.info("Rebuilt request rollups: %s addresses, %s minutes", addresses.rowcount, len(minutes))
+    return addresses.rowcount, len(minutes)
@@ -1,21 +1,137 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
+from dataclasses import dataclass
 from typing import AsyncGenerator, Any
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not configured in environment variables")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """
+    Engine and connection pool configuration.
+
+    Attributes:
+        url (str): SQLAlchemy database URL.
+        echo (bool): Log every SQL statement (expensive, off by default).
+        pool_size (int): Number of connections kept open in the pool.
+        max_overflow (int): Connections allowed beyond `pool_size` under load.
+        pool_timeout (float): Seconds to wait for a free connection before failing.
+        pool_recycle (int): Seconds after which a connection is replaced (-1 disables recycling).
+        pool_pre_ping (bool): Check connections for liveness when they are checked out.
+        statement_cache_size (int): Size of the asyncpg prepared statement cache per connection.
+    """
+    url: str
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 500
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        """
+        Reads the database settings from environment variables.
+
+        Returns:
+            DatabaseSettings: Settings with defaults for any variable that is not set.
+
+        Raises:
+            ValueError: If DATABASE_URL is not configured.
+        """
+        url = os.getenv("DATABASE_URL")
+        if not url:
+            raise ValueError("DATABASE_URL is not configured in environment variables")
+        return cls(
+            url=url,
+            echo=os.getenv("DB_ECHO", "false").lower() == "true",
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+        )
+
+
+def create_engine(settings: DatabaseSettings) -> AsyncEngine:
+    """
+    Creates an async engine configured from `settings`.
+
+    Args:
+        settings (DatabaseSettings): Engine and pool configuration.
+
+    Returns:
+        AsyncEngine: The configured SQLAlchemy async engine.
+
+    Notes:
+        - Pool sizing options are skipped for SQLite, which manages connections with its own pool class.
+        - The prepared statement cache size is only passed to the asyncpg driver.
+    """
+    url = make_url(settings.url)
+    options: dict[str, Any] = {"echo": settings.echo}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=settings.pool_pre_ping
+        )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.statement_cache_size}
+    return create_async_engine(url, **options)
+
+
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Returns the application's engine, creating it from the environment on first use.
+
+    Returns:
+        AsyncEngine: The configured SQLAlchemy async engine.
+
+    Raises:
+        ValueError: If DATABASE_URL is not configured.
+
+    Notes:
+        - Importing this module does not read the configuration or load a database driver, so code paths
+          that never touch the database (and tooling that only needs the models) start faster.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DatabaseSettings.from_env())
+    return _engine
 
-async_session = async_sessionmaker(
-    engine,
-    expire_on_commit=False,
-    class_=AsyncSession
-)
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Returns the session factory bound to the application's engine, creating both on first use.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: Factory of sessions that do not expire objects on commit.
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False, class_=AsyncSession)
+    return _session_factory
+
+
+def async_session() -> AsyncSession:
+    """
+    Creates a session bound to the application's engine.
+
+    Returns:
+        AsyncSession: A new asynchronous SQLAlchemy session.
+    """
+    return get_session_factory()()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, Any]:
@@ -27,12 +143,65 @@ async def get_db() -> AsyncGenerator[AsyncSession, Any]:
 
     Raises:
         RuntimeError: If the database session cannot be created.
+
+    Notes:
+        - The session checks out a pool connection only when the handler first executes a statement,
+          so handlers that never touch the database do not hold a connection.
+        - Exceptions raised by the handler are propagated unchanged.
     """
     try:
-        async with async_session() as session:
-            yield session
+        session = async_session()
     except Exception as e:
         raise RuntimeError(f"Failed to create database session: {str(e)}")
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns utilization figures of the engine's connection pool.
+
+    Returns:
+        dict: Dictionary containing:
+            - pool_size (int): Configured number of persistent connections (0 if the pool is not sized).
+            - checked_out (int): Connections currently in use.
+            - checked_in (int): Idle connections in the pool.
+            - overflow (int): Connections open beyond the pool size.
+            - max_overflow (int): Configured overflow limit.
+            - utilization (float): Share of the maximum connection count currently in use.
+
+    Notes:
+        - All figures are 0 until the engine is created.
+    """
+    pool = _engine.pool if _engine is not None else None
+    if not hasattr(pool, "checkedout"):
+        return {"pool_size": 0, "checked_out": 0, "checked_in": 0, "overflow": 0, "max_overflow": 0, "utilization": 0.0}
+    pool_size = pool.size()
+    max_overflow = max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    capacity = pool_size + max_overflow
+    return {
+        "pool_size": pool_size,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": max_overflow,
+        "utilization": checked_out / capacity if capacity else 0.0
+    }
+
+
+async def init_worker() -> None:
+    """
+    Prepares the engine for use in the current worker process.
+
+    Notes:
+        - Connections inherited from a parent process (e.g. when workers are forked after the application
+          was imported) are dropped without being closed, so each worker opens its own connections.
+    """
+    if _engine is not None:
+        await _engine.dispose(close=False)
 
 
 async def close_db() -> None:
@@ -41,5 +210,7 @@ async def close_db() -> None:
 
     Notes:
         - Called during application shutdown to ensure proper resource cleanup.
+        - Does nothing if the engine was never created.
     """
-    await engine.dispose()
+    if _engine is not None:
+        await _engine.dispose()
@@ -0,0 +1,91 @@
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import AsyncIterator, Callable
+import csv
+import io
+import orjson
+from app import crud
+
+# Export format -> media type.
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CSV_HEADER = ("id", "created_at", "wallet_address")
+
+
+def encode_ndjson(rows: list[Row]) -> bytes:
+    """
+    Encodes request rows as NDJSON, one `schemas.RequestResponse` object per line.
+
+    Args:
+        rows (list[Row]): `(id, created_at, wallet_address)` rows.
+
+    Returns:
+        bytes: The encoded lines, each terminated by a newline.
+    """
+    return b"".join(
+        orjson.dumps(
+            {"id": request_id, "created_at": created_at, "wallet_address": wallet_address},
+            option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+        )
+        for request_id, created_at, wallet_address in rows
+    )
+
+
+def encode_csv(rows: list[Row]) -> bytes:
+    """
+    Encodes request rows as CSV records without a header.
+
+    Args:
+        rows (list[Row]): `(id, created_at, wallet_address)` rows.
+
+    Returns:
+        bytes: The encoded records; `created_at` is written in ISO 8601 format.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(
+        (request_id, created_at.isoformat(), wallet_address) for request_id, created_at, wallet_address in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def iter_export(
+        session_factory: Callable[[], AsyncSession],
+        export_format: str,
+        batch_size: int = 1000,
+        wallet_address: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None
+) -> AsyncIterator[bytes]:
+    """
+    Exports the matching requests as encoded chunks, reading them from a server-side cursor.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates the session the export runs in.
+        export_format (str): "ndjson" or "csv" (see `EXPORT_FORMATS`).
+        batch_size (int): Number of rows per chunk.
+        wallet_address (str, optional): Only export requests for this wallet address.
+        created_from (datetime, optional): Only export requests created at or after this time.
+        created_to (datetime, optional): Only export requests created before this time.
+
+    Yields:
+        bytes: The CSV header (for "csv"), then one chunk per batch of rows in creation order.
+
+    Raises:
+        ValueError: If `export_format` is unknown.
+        Exception: If an error occurs while reading from the database.
+
+    Notes:
+        - The export holds its own session (and database connection) until the last chunk is consumed, so
+          it outlives the request-scoped session of an HTTP handler.
+        - Memory use is bounded by one batch, whatever the number of exported rows.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of {', '.join(EXPORT_FORMATS)}")
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+    if export_format == "csv":
+        yield (",".join(CSV_HEADER) + "\n").encode()
+    async with session_factory() as db:
+        async for rows in crud.stream_requests(db, batch_size, wallet_address, created_from, created_to):
+            yield encode(rows)
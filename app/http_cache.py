@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from dotenv import load_dotenv
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import Response
+from typing import Callable
+import hashlib
+import os
+import time
+from app import request_log
+from app.cache import CacheEntry, LRUCache
+
+load_dotenv()
+
+CACHE_CONTROL = os.getenv("HTTP_CACHE_CONTROL", "private, no-cache")
+
+
+@dataclass
+class RenderedResponse:
+    """
+    An encoded JSON response body together with its validators.
+
+    Attributes:
+        body (bytes): The encoded body.
+        etag (str): Quoted entity tag of the body.
+        last_modified (datetime | None): Time the represented data last changed, if known.
+    """
+    body: bytes
+    etag: str
+    last_modified: datetime | None = None
+
+
+@dataclass
+class ResponseCacheStats:
+    """
+    Counters of a response cache.
+
+    Attributes:
+        hits (int): Requests answered from a cached body.
+        misses (int): Requests whose body had to be built.
+        invalidations (int): Times the whole cache was dropped because the underlying data changed.
+    """
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+def make_etag(body: bytes, version: int | None = None) -> str:
+    """
+    Builds a strong entity tag for a response body.
+
+    Args:
+        body (bytes): The encoded body.
+        version (int, optional): Version of the represented data (e.g. the newest request id), used as a
+            readable prefix.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f'"{version}-{digest}"' if version is not None else f'"{digest}"'
+
+
+def render(body: bytes, version: int | None = None, last_modified: datetime | None = None) -> RenderedResponse:
+    """
+    Wraps an encoded body with its validators.
+
+    Args:
+        body (bytes): The encoded body.
+        version (int, optional): Version of the represented data (see `make_etag`).
+        last_modified (datetime, optional): Time the represented data last changed; naive values are UTC.
+
+    Returns:
+        RenderedResponse: The body, its entity tag and last modification time.
+    """
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+    return RenderedResponse(body, make_etag(body, version), last_modified)
+
+
+def is_not_modified(request: Request, rendered: RenderedResponse) -> bool:
+    """
+    Evaluates the conditional headers of a request against a rendered response.
+
+    Args:
+        request (Request): The incoming request.
+        rendered (RenderedResponse): The current representation.
+
+    Returns:
+        bool: True if the client's copy is current and `304 Not Modified` may be sent; always False for
+            methods other than GET and HEAD.
+
+    Notes:
+        - If-None-Match takes precedence over If-Modified-Since (RFC 9110, section 13.2.2); entity tags are
+          compared weakly, so `W/` prefixes added by proxies do not prevent a match.
+        - For other methods a matching If-None-Match would call for `412 Precondition Failed` rather than
+          `304`; the conditions are ignored instead, so such responses always carry the body.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = rendered.etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or rendered.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have a resolution of one second.
+    return rendered.last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, rendered: RenderedResponse) -> Response:
+    """
+    Builds the response for a rendered body, honouring the request's conditional headers.
+
+    Args:
+        request (Request): The incoming request.
+        rendered (RenderedResponse): The current representation.
+
+    Returns:
+        Response: `304 Not Modified` without a body if the client's copy is current (GET and HEAD only),
+            otherwise `200` with the body; both carry ETag, Last-Modified (if known) and Cache-Control headers.
+    """
+    headers = {"ETag": rendered.etag, "Cache-Control": CACHE_CONTROL}
+    if rendered.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(rendered.last_modified.astimezone(UTC), usegmt=True)
+    if is_not_modified(request, rendered):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
+
+def cache_key(request: Request) -> str:
+    """
+    Returns a key identifying a GET request by path and query parameters, regardless of their order.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: The cache key.
+    """
+    return request.url.path + "?" + "&".join(
+        f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+    )
+
+
+class ResponseCache:
+    """
+    Bounded cache of rendered response bodies, dropped as a whole when the underlying data changes.
+
+    Args:
+        maxsize (int): Maximum number of cached bodies; 0 disables caching.
+        ttl (float): Seconds a body may be served; bounds staleness caused by writes this process does not see
+            (e.g. those of other workers).
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+
+    Attributes:
+        generation (int): Incremented on every invalidation; a body built from data read before an
+            invalidation is not stored (see `set`).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.enabled = maxsize > 0 and ttl > 0
+        self.ttl = ttl
+        self.generation = 0
+        self.stats = ResponseCacheStats()
+        self._entries = LRUCache(max(maxsize, 1))
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> RenderedResponse | None:
+        """
+        Returns the cached body for `key` if it is still valid.
+
+        Args:
+            key (str): Cache key (see `cache_key`).
+
+        Returns:
+            RenderedResponse | None: The cached body, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry.fresh_until <= self._clock():
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry.value
+
+    def set(self, key: str, rendered: RenderedResponse, generation: int) -> None:
+        """
+        Stores a rendered body under `key`.
+
+        Args:
+            key (str): Cache key (see `cache_key`).
+            rendered (RenderedResponse): The body to cache.
+            generation (int): `generation` read before the data of the body was queried; the body is not
+                stored if the cache has been invalidated since.
+        """
+        if self.enabled and generation == self.generation:
+            expires = self._clock() + self.ttl
+            self._entries.set(key, CacheEntry(value=rendered, fresh_until=expires, stale_until=expires))
+
+    def invalidate(self, _count: int = 0) -> None:
+        """
+        Drops every cached body.
+
+        Args:
+            _count (int): Number of written records; accepted so the method can be a writer callback.
+        """
+        self.generation += 1
+        self.stats.invalidations += 1
+        self._entries.clear()
+
+
+# Rendered GET /requests and /requests/page bodies; every batch of request rows written by this process
+# invalidates them.
+requests_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "1.0"))
+)
+request_log.writer.on_written.append(requests_cache.invalidate)
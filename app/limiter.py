@@ -0,0 +1,265 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
+from typing import AsyncIterator, Callable
+import asyncio
+import math
+import os
+import time
+from app.logger import setup_logger
+from app.upstream import UpstreamUnavailableError
+
+logger = setup_logger("limiter")
+
+load_dotenv()
+
+
+class LimitExceededError(Exception):
+    """
+    Raised when a request is shed because the concurrency limit and the queue are exhausted.
+
+    Args:
+        retry_after (int): Suggested number of seconds before retrying.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Concurrency limit exceeded, retry after {retry_after} s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class LimiterStats:
+    """
+    Counters of an adaptive limiter.
+
+    Attributes:
+        admitted (int): Requests that got a slot, immediately or after queueing.
+        queued (int): Requests that had to wait for a slot.
+        shed (int): Requests rejected because the queue was full or the wait timed out.
+        decreases (int): Multiplicative decreases of the limit.
+    """
+    admitted: int = 0
+    queued: int = 0
+    shed: int = 0
+    decreases: int = 0
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter adjusting its limit with AIMD (additive increase, multiplicative decrease).
+
+    Every completed call is a sample: a call slower than `latency_target`, or failing with one of
+    `congestion_errors`, multiplies the limit by `backoff` (once per episode: calls admitted before the
+    previous decrease are ignored); a fast call made while the limit is fully used raises it by about one
+    per limit's worth of calls. Requests beyond the limit wait in a bounded FIFO
+    queue and are shed with `LimitExceededError` when it is full or they waited `queue_timeout` seconds,
+    so latency stays bounded when the protected resource slows down.
+
+    Args:
+        name (str): Name used in logs and metrics.
+        initial_limit (int): Starting concurrency limit; 0 disables limiting.
+        min_limit (int): Lower bound of the limit.
+        max_limit (int): Upper bound of the limit.
+        max_queue (int): Maximum number of waiting requests.
+        queue_timeout (float): Seconds a request may wait for a slot.
+        latency_target (float): Call latency in seconds above which the limit is decreased.
+        backoff (float): Factor applied to the limit on a decrease.
+        congestion_errors (tuple[type[BaseException], ...]): Errors counted as congestion signals.
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 200,
+            max_queue: int = 100,
+            queue_timeout: float = 1.0,
+            latency_target: float = 2.0,
+            backoff: float = 0.9,
+            congestion_errors: tuple[type[BaseException], ...] = (),
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.enabled = initial_limit > 0
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.congestion_errors = congestion_errors
+        self.inflight = 0
+        self.stats = LimiterStats()
+        self._latency = 0.0
+        self._decreased_at = float("-inf")
+        self._waiters: deque[asyncio.Future] = deque()
+        self._clock = clock
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of requests currently waiting for a slot.
+        """
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """
+        Estimates how long a shed client should wait before retrying.
+
+        Returns:
+            int: Whole seconds, at least 1: the average call latency times the number of limit's worth of
+                requests ahead in the queue.
+        """
+        backlog = (len(self._waiters) + 1) / max(self.limit, 1)
+        return max(1, math.ceil(self._latency * backlog))
+
+    def _shed(self) -> LimitExceededError:
+        self.stats.shed += 1
+        return LimitExceededError(self.retry_after())
+
+    async def _admit(self) -> None:
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            self.stats.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        try:
+            # The releasing call hands its slot over by resolving the future.
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._shed()
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled right after being handed a slot: pass it on.
+                self._free_slot()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.stats.admitted += 1
+
+    def _release(self, started: float, congested: bool) -> None:
+        now = self._clock()
+        latency = now - started
+        self._latency = latency if self._latency == 0 else 0.8 * self._latency + 0.2 * latency
+        if congested or latency > self.latency_target:
+            # Calls admitted before the last decrease report the same congestion episode.
+            if started >= self._decreased_at and self.limit > self.min_limit:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._decreased_at = now
+                self.stats.decreases += 1
+                logger.warning(
+                    "Limiter %s: decreased limit to %.1f (latency %.3f s, congested=%s)",
+                    self.name, self.limit, latency, congested
+                )
+        elif self.inflight >= self.limit - 1:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._free_slot()
+
+    def _free_slot(self) -> None:
+        self.inflight -= 1
+        while self._waiters and self.inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.inflight += 1
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """
+        Holds a concurrency slot for the duration of the block, waiting for one if necessary.
+
+        Raises:
+            LimitExceededError: If the queue is full or no slot became free within `queue_timeout`.
+
+        Notes:
+            - The duration and outcome of the block are used to adapt the limit.
+        """
+        if not self.enabled:
+            yield
+            return
+        await self._admit()
+        started = self._clock()
+        congested = False
+        try:
+            yield
+        except self.congestion_errors:
+            congested = True
+            raise
+        finally:
+            self._release(started, congested)
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        Returns the current state of the limiter.
+
+        Returns:
+            dict[str, float]: limit, inflight and queued.
+        """
+        return {"limit": self.limit, "inflight": self.inflight, "queued": len(self._waiters)}
+
+
+def create_limiter(
+        name: str,
+        prefix: str,
+        initial_limit: int,
+        max_limit: int,
+        latency_target: float,
+        congestion_errors: tuple[type[BaseException], ...] = ()
+) -> AdaptiveLimiter:
+    """
+    Creates an adaptive limiter configured from `<prefix>_*` environment variables.
+
+    Args:
+        name (str): Name used in logs and metrics.
+        prefix (str): Environment variable prefix, e.g. "WALLET" for WALLET_CONCURRENCY.
+        initial_limit (int): Default of <prefix>_CONCURRENCY (0 disables limiting).
+        max_limit (int): Default of <prefix>_CONCURRENCY_MAX.
+        latency_target (float): Default of <prefix>_LATENCY_TARGET in seconds.
+        congestion_errors (tuple[type[BaseException], ...]): Errors counted as congestion signals.
+
+    Returns:
+        AdaptiveLimiter: The configured limiter.
+    """
+    return AdaptiveLimiter(
+        name,
+        initial_limit=int(os.getenv(f"{prefix}_CONCURRENCY", str(initial_limit))),
+        min_limit=int(os.getenv(f"{prefix}_CONCURRENCY_MIN", "1")),
+        max_limit=int(os.getenv(f"{prefix}_CONCURRENCY_MAX", str(max_limit))),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE_SIZE", "100")),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", "1.0")),
+        latency_target=float(os.getenv(f"{prefix}_LATENCY_TARGET", str(latency_target))),
+        congestion_errors=congestion_errors
+    )
+
+
+# Wallet lookups slow down with TronGrid; timeouts and an open circuit breaker (both
+# `UpstreamUnavailableError`) are congestion signals as well.
+wallet_limiter = create_limiter(
+    "wallet", "WALLET", initial_limit=50, max_limit=500, latency_target=2.0,
+    congestion_errors=(UpstreamUnavailableError, asyncio.TimeoutError)
+)
+
+# A separate budget for request-log reads, kept below the database pool size so that they cannot starve
+# the request-log writer or be starved by wallet traffic.
+requests_limiter = create_limiter(
+    "requests", "REQUESTS", initial_limit=10, max_limit=20, latency_target=1.0,
+    congestion_errors=(SQLAlchemyError, asyncio.TimeoutError)
+)
+
+# Exports stream for as long as the client reads and hold a database connection throughout, so only a few
+# may run at once; their duration says nothing about congestion.
+export_limiter = create_limiter(
+    "export", "EXPORT", initial_limit=2, max_limit=2, latency_target=math.inf,
+    congestion_errors=(SQLAlchemyError,)
+)
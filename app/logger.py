@@ -1,6 +1,113 @@
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import random
+from datetime import datetime, UTC
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SAMPLED = {"sampled": True}
+"""Pass as `extra=SAMPLED` to mark high-volume per-request lines subject to LOG_SAMPLE_RATE."""
+
+_handlers: list[logging.Handler] = []
+_queue: queue.SimpleQueue | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as single-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the records marked with `extra=SAMPLED`; other records always pass.
+
+    Args:
+        rate (float): Share of sampled records to keep, between 0 and 1.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or not getattr(record, "sampled", False):
+            return True
+        return random.random() < self.rate
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that only merges the message arguments on the calling thread and leaves
+    formatting (timestamps, JSON, tracebacks) to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _get_handlers() -> list[logging.Handler]:
+    """
+    Creates the shared console and rotating file handlers on first use.
+
+    Returns:
+        list[logging.Handler]: Handlers shared by every configured logger.
+    """
+    if not _handlers:
+        if os.getenv("LOG_FORMAT", "text").lower() == "json":
+            log_format = JsonFormatter()
+        else:
+            log_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(log_format)
+        _handlers.append(console_handler)
+
+        os.makedirs("logs", exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            "logs/app.log", maxBytes=10_000_000, backupCount=5
+        )
+        file_handler.setFormatter(log_format)
+        _handlers.append(file_handler)
+    return _handlers
+
+
+def _get_queue() -> queue.SimpleQueue:
+    """
+    Returns the shared log queue, starting the background listener that drains it if needed.
+
+    Returns:
+        queue.SimpleQueue: Queue the per-logger queue handlers write to.
+    """
+    global _queue, _listener
+    if _queue is None:
+        _queue = queue.SimpleQueue()
+        atexit.register(shutdown_logging)
+    if _listener is None:
+        _listener = logging.handlers.QueueListener(_queue, *_get_handlers(), respect_handler_level=True)
+        _listener.start()
+    return _queue
 
 
 def setup_logger(name: str) -> logging.Logger:
@@ -11,27 +118,41 @@ def setup_logger(name: str) -> logging.Logger:
         name (str): Name of the logger (typically the module name).
 
     Returns:
-        logging.Logger: Configured logger instance with INFO level, console output, and rotating file logs.
+        logging.Logger: Configured logger instance with console output and rotating file logs.
 
     Notes:
         - Logs are written to 'logs/app.log' with a maximum size of 10MB and up to 5 backup files.
         - If the logger already has handlers, it is returned as is to prevent duplicate handlers.
+        - With LOG_ASYNC=true (default) records are put on a queue and written by a background thread,
+          so handlers never block the event loop.
+        - LOG_LEVEL sets the level (default INFO), LOG_FORMAT=json switches to JSON lines and
+          LOG_SAMPLE_RATE keeps only a fraction of records logged with `extra=SAMPLED`.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
     if not logger.handlers:
-        log_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+        if sample_rate < 1.0:
+            logger.addFilter(SamplingFilter(sample_rate))
 
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(log_format)
-        logger.addHandler(console_handler)
-
-        os.makedirs("logs", exist_ok=True)
-        file_handler = logging.handlers.RotatingFileHandler(
-            "logs/app.log", maxBytes=10_000_000, backupCount=5
-        )
-        file_handler.setFormatter(log_format)
-        logger.addHandler(file_handler)
+        if os.getenv("LOG_ASYNC", "true").lower() == "true":
+            logger.addHandler(_LazyQueueHandler(_get_queue()))
+        else:
+            for handler in _get_handlers():
+                logger.addHandler(handler)
 
     return logger
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the background listener after writing out all queued records.
+
+    Notes:
+        - Registered with `atexit`, so queued records are flushed when the process exits.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
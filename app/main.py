@@ -1,12 +1,43 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
-from contextlib import asynccontextmanager
+import time
+
+# Measured before the heavy imports below for the startup-time report.
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Request, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, Response
+from contextlib import asynccontextmanager, AsyncExitStack
 from sqlalchemy.ext.asyncio import AsyncSession
-from app import crud, schemas, tron_service, database
-from app.logger import setup_logger
-from tronpy.keys import to_base58check_address
+from app import (
+    crud, schemas, tron_service, database, request_log, metrics, watch, snapshots, block_follower, export, prefetch,
+    http_cache
+)
+from app.limiter import LimitExceededError, wallet_limiter, requests_limiter, export_limiter
+from app import address as tron_address
+from app.logger import setup_logger, SAMPLED
+from app.upstream import UpstreamTimeoutError, UpstreamUnavailableError
+from dataclasses import asdict
+from pydantic import TypeAdapter
+from dotenv import load_dotenv
+from typing import Any, AsyncIterator, Iterable
+import asyncio
+import json
+import os
 
 logger = setup_logger("main")
 
+load_dotenv()
+
+# Return already-typed handler results as responses directly instead of revalidating them through the
+# route's response model.
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "true").lower() == "true"
+
+WALLET_RESPONSE = TypeAdapter(schemas.WalletResponse)
+REQUEST_LIST_RESPONSE = TypeAdapter(list[schemas.RequestResponse])
+REQUEST_PAGE_RESPONSE = TypeAdapter(schemas.RequestPage)
+
+# Seconds spent importing this module ("import") and running the lifespan startup ("lifespan").
+startup_seconds: dict[str, float] = {}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,20 +51,136 @@ async def lifespan(app: FastAPI):
         None: Yields control back to the application during its runtime.
 
     Notes:
+        - Runs once per worker process: each worker opens its own database connections and Tron API
+          clients; state shared between workers is configured by SHARED_STATE.
+        - Starts the request-log and snapshot writers and flushes them on shutdown.
+        - Starts and stops the shared wallet watcher, and the block follower if BLOCK_FOLLOWER_ENABLED is set.
+        - Starts the cache warm-up and prefetcher in the background; `/health/ready` reports the instance
+          ready once the warm-up is done.
+        - The database engine and Tron API clients are created on first use, not here, so the worker accepts
+          requests as soon as the background tasks are started.
+        - Logs the import and startup time of the worker (see `startup_seconds`).
         - Ensures the Tron client and database connections are properly closed when the application shuts down.
     """
+    started = time.perf_counter()
+    await database.init_worker()
+    await request_log.writer.start()
+    await snapshots.writer.start()
+    await watch.watcher.start()
+    if block_follower.BLOCK_FOLLOWER_ENABLED:
+        await block_follower.follower.start()
+    await prefetch.prefetcher.start()
+    startup_seconds["lifespan"] = time.perf_counter() - started
+    logger.info(
+        "Worker %s started in %.3f s (import %.3f s, lifespan %.3f s)", os.getpid(), sum(startup_seconds.values()),
+        startup_seconds.get("import", 0.0), startup_seconds["lifespan"]
+    )
     yield
-    await tron_service.tron_client.close()
+    await prefetch.prefetcher.stop()
+    await block_follower.follower.stop()
+    await watch.watcher.stop()
+    await request_log.writer.stop()
+    await snapshots.writer.stop()
+    await tron_service.wallet_cache.close()
+    await tron_service.close_upstream_pool()
     await database.close_db()
 
 
-app = FastAPI(title="Tron Wallet Info Service", lifespan=lifespan)
+router = APIRouter()
+
+
+def _encode(content: Any, adapter: TypeAdapter) -> bytes:
+    """
+    Encodes a handler result that already has the shape of the route's response model.
+
+    Args:
+        content (Any): JSON-serializable content matching the response model.
+        adapter (TypeAdapter): Adapter of the route's response model.
+
+    Returns:
+        bytes: The JSON body. If FAST_SERIALIZATION is disabled, `content` is validated and dumped through the
+            response model first, as FastAPI would do for a returned object; both paths produce the same bytes.
+    """
+    if not FAST_SERIALIZATION:
+        content = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return metrics.TimedJSONResponse(content).body
+
+
+def _rendered_requests(rows: list, content: Any, adapter: TypeAdapter) -> http_cache.RenderedResponse:
+    """
+    Encodes a request listing with validators derived from its rows.
+
+    Args:
+        rows (list): `(id, created_at, wallet_address)` rows of the listing.
+        content (Any): Response content built from the rows.
+        adapter (TypeAdapter): Adapter of the route's response model.
+
+    Returns:
+        http_cache.RenderedResponse: The body; its ETag is prefixed with the newest request id.
+
+    Notes:
+        - No Last-Modified is derived: the newest creation time on a page does not change when rows are
+          deleted or written with an earlier `created_at`, so If-Modified-Since could return stale pages.
+    """
+    return http_cache.render(_encode(content, adapter), version=max((row.id for row in rows), default=0))
+
+
+def _overloaded(error: LimitExceededError) -> HTTPException:
+    """
+    Builds the response for a request shed by a concurrency limiter.
+
+    Args:
+        error (LimitExceededError): The limiter's rejection.
+
+    Returns:
+        HTTPException: 503 with a Retry-After header.
+    """
+    return HTTPException(
+        status_code=503, detail="Service is overloaded, retry later", headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+def _normalized_filters(filters: schemas.RequestFilterParams) -> schemas.RequestFilterParams:
+    """
+    Brings the wallet address filter to the canonical form the request log is stored in.
+
+    Args:
+        filters (schemas.RequestFilterParams): Filters as received.
 
+    Returns:
+        schemas.RequestFilterParams: The filters with a base58check `wallet_address`.
 
-@app.post("/wallet", response_model=schemas.WalletResponse)
+    Raises:
+        HTTPException: 400 if the wallet address filter is not a valid Tron address.
+    """
+    if filters.wallet_address is None:
+        return filters
+    try:
+        address = tron_address.normalize_address(filters.wallet_address)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid Tron address: {str(e)}")
+    return filters.model_copy(update={"wallet_address": address})
+
+
+def _request_items(rows: Iterable[tuple]) -> list[dict]:
+    """
+    Converts `(id, created_at, wallet_address)` rows into `schemas.RequestResponse` items.
+
+    Args:
+        rows (Iterable[tuple]): Rows selected with `crud.REQUEST_COLUMNS`.
+
+    Returns:
+        list[dict]: One dictionary per row.
+    """
+    return [
+        {"id": request_id, "created_at": created_at, "wallet_address": wallet_address}
+        for request_id, created_at, wallet_address in rows
+    ]
+
+
+@router.post("/wallet", response_model=schemas.WalletResponse)
 async def get_wallet_info(
         request: schemas.WalletRequest,
-        db: AsyncSession = Depends(database.get_db),
         client_request: Request = None
 ):
     """
@@ -41,7 +188,6 @@ async def get_wallet_info(
 
     Args:
         request (schemas.WalletRequest): The request containing the Tron wallet address.
-        db (AsyncSession): Asynchronous database session for storing the request.
         client_request (Request, optional): FastAPI request object to extract client IP.
 
     Returns:
@@ -50,29 +196,323 @@ async def get_wallet_info(
     Raises:
         HTTPException:
             - 400 if the Tron address is invalid or an error occurs while fetching wallet info.
+            - 500 if TRON_API_KEY is not configured.
+            - 503 if the Tron API is unavailable and no cached wallet info exists.
+            - 504 if the Tron API timed out and no cached wallet info exists.
+            - 503 with Retry-After if the wallet concurrency limit and its queue are exhausted.
+
+    Notes:
+        - Lookups run under an adaptive concurrency limit (see `app.limiter`), which shrinks when TronGrid
+          slows down so that excess requests are rejected quickly instead of piling up.
+        - The address is normalized to base58check form, so hex and base58 forms of the same wallet share
+          cache entries and are recorded identically.
+        - The request is recorded by the request-log writer off the response path.
+        - The response carries an ETag of the wallet data, so clients can tell whether it changed; being a
+          POST, conditional headers are not evaluated and the body is always sent.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info("Incoming request: POST /wallet from %s, address=%s", client_ip, request.address, extra=SAMPLED)
+
+    try:
+        with metrics.stage_duration.time("validation"):
+            address = tron_address.normalize_address(request.address)
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=f"Invalid Tron address: {str(e)}")
+
+    try:
+        async with wallet_limiter.acquire():
+            wallet_info = await tron_service.get_wallet_info(address)
+        await request_log.writer.enqueue(address)
+        logger.info("Successfully processed wallet info for address=%s", address, extra=SAMPLED)
+        return http_cache.conditional_response(
+            client_request, http_cache.render(_encode(wallet_info, WALLET_RESPONSE))
+        )
+    except LimitExceededError as e:
+        logger.warning("Shed request for address=%s: %s", address, e)
+        raise _overloaded(e)
+    except UpstreamTimeoutError as e:
+        logger.error("Tron API timed out for address=%s: %s", address, e)
+        raise HTTPException(status_code=504, detail="Tron API did not respond in time")
+    except UpstreamUnavailableError as e:
+        logger.error("Tron API unavailable for address=%s: %s", address, e)
+        raise HTTPException(status_code=503, detail="Tron API is temporarily unavailable")
+    except tron_service.TronNotConfiguredError as e:
+        logger.error("Cannot process wallet info for address=%s: %s", address, e)
+        raise HTTPException(status_code=500, detail="Tron API access is not configured")
+    except ValueError as e:
+        logger.error("Error processing wallet info for address=%s: %s", address, e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/wallets", response_model=list[schemas.WalletBatchItem])
+async def get_wallets_info(
+        request: schemas.WalletBatchRequest,
+        stream: bool = False,
+        client_request: Request = None
+):
+    """
+    Retrieves wallet information for several Tron addresses in one call.
+
+    Args:
+        request (schemas.WalletBatchRequest): The request containing the Tron wallet addresses.
+        stream (bool): If true, results are streamed as NDJSON in completion order.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        list[schemas.WalletBatchItem]: Per-address wallet information or error, in request order.
+            When `stream` is set, a `application/x-ndjson` stream of the same items is returned instead.
+
+    Notes:
+        - All addresses are validated before any upstream call; invalid ones are reported per address.
+        - Addresses are normalized, so different forms of the same wallet are looked up once; items keep
+          the address as given in the request.
+        - Successful lookups are handed to the request-log writer, which persists them in bulk.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info(
+        "Incoming request: POST /wallets from %s, addresses=%s, stream=%s",
+        client_ip, len(request.addresses), stream, extra=SAMPLED
+    )
+
+    with metrics.stage_duration.time("validation"):
+        canonical, invalid = tron_address.validate_addresses(request.addresses)
+    invalid_items = [
+        schemas.WalletBatchItem(address=address, error=f"Invalid Tron address: {error}")
+        for address, error in invalid.items()
+    ]
+    # Canonical address -> the request's addresses (duplicates included) that normalize to it.
+    originals: dict[str, list[str]] = {}
+    for address in request.addresses:
+        if address in canonical:
+            originals.setdefault(canonical[address], []).append(address)
+
+    if stream:
+        return StreamingResponse(_stream_wallets_info(originals, invalid_items), media_type="application/x-ndjson")
+
+    results = {item.address: item for item in invalid_items}
+    succeeded = []
+    async for address, wallet_info, error in tron_service.iter_wallet_info(list(originals)):
+        for original in originals[address]:
+            results[original] = schemas.WalletBatchItem(address=original, wallet=wallet_info, error=error)
+        if wallet_info is not None:
+            succeeded.extend([address] * len(originals[address]))
+    await request_log.writer.enqueue_many(succeeded)
+    logger.info("Processed batch of %s addresses, succeeded=%s", len(request.addresses), len(succeeded))
+    return [results[address] for address in request.addresses]
+
+
+async def _stream_wallets_info(
+        originals: dict[str, list[str]],
+        invalid_items: list[schemas.WalletBatchItem]
+) -> AsyncIterator[str]:
+    """
+    Streams batch lookup results as NDJSON lines in completion order.
+
+    Args:
+        originals (dict[str, list[str]]): Requested addresses grouped by their canonical form.
+        invalid_items (list[schemas.WalletBatchItem]): Pre-built error items for invalid addresses.
+
+    Yields:
+        str: One JSON-encoded `WalletBatchItem` per line.
+    """
+    for item in invalid_items:
+        yield item.model_dump_json() + "\n"
+
+    succeeded = []
+    async for address, wallet_info, error in tron_service.iter_wallet_info(list(originals)):
+        if wallet_info is not None:
+            succeeded.extend([address] * len(originals[address]))
+        for original in originals[address]:
+            yield schemas.WalletBatchItem(address=original, wallet=wallet_info, error=error).model_dump_json() + "\n"
+
+    await request_log.writer.enqueue_many(succeeded)
+    logger.info(
+        "Streamed batch of %s addresses, succeeded=%s",
+        sum(map(len, originals.values())) + len(invalid_items), len(succeeded)
+    )
+
+
+@router.get("/wallets/{address}/history", response_model=schemas.WalletHistory)
+async def get_wallet_history(
+        address: str,
+        params: schemas.HistoryParams = Depends(),
+        db: AsyncSession = Depends(database.get_db),
+        client_request: Request = None
+):
+    """
+    Retrieves a wallet's recorded balance, bandwidth and energy aggregated into time buckets.
+
+    Args:
+        address (str): Tron wallet address in any accepted form.
+        params (schemas.HistoryParams): Bucket width, bucket limit and time range.
+        db (AsyncSession): Asynchronous database session for querying snapshots.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        schemas.WalletHistory: Min, max and last values per bucket, computed from stored snapshots
+            without contacting the Tron API.
+
+    Raises:
+        HTTPException:
+            - 400 if the Tron address is invalid.
+            - 500 if an error occurs while retrieving snapshots from the database.
     """
     client_ip = client_request.client.host if client_request else "unknown"
-    logger.info(f"Incoming request: POST /wallet from {client_ip}, address={request.address}")
+    logger.info(
+        "Incoming request: GET /wallets/%s/history from %s, interval=%s", address, client_ip, params.interval,
+        extra=SAMPLED
+    )
 
     try:
-        to_base58check_address(request.address)
+        address = tron_address.normalize_address(address)
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Invalid Tron address: {str(e)}")
 
     try:
-        wallet_info = await tron_service.get_wallet_info(request.address)
-        await crud.create_request(db, request.address)
-        logger.info(f"Successfully processed wallet info for address={request.address}")
-        return wallet_info
+        buckets = await crud.get_snapshot_history(
+            db, address, params.interval, params.limit, params.captured_from, params.captured_to
+        )
+        return {"address": address, "interval": params.interval, "buckets": buckets}
+    except Exception as e:
+        logger.error("Error retrieving history for address=%s: %s", address, e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.websocket("/ws/watch")
+async def watch_wallets_ws(websocket: WebSocket):
+    """
+    Pushes wallet information updates for subscribed addresses over a WebSocket.
+
+    Clients send `{"action": "watch" | "unwatch", "addresses": [...]}` messages and receive
+    `{"address", "wallet", "error"}` messages whenever a watched wallet changes.
+
+    Args:
+        websocket (WebSocket): The client connection.
+
+    Notes:
+        - All connections share one poller, so each address costs the same upstream traffic regardless
+          of the number of subscribers.
+        - Invalid addresses, malformed messages and binary frames are answered with an error message; the
+          connection stays open.
+        - A failure of the task pushing updates is logged when it happens.
+    """
+    await websocket.accept()
+    subscription = watch.watcher.subscribe()
+    logger.info("WebSocket watch subscription opened from %s", websocket.client.host if websocket.client else "unknown")
+
+    async def send_updates() -> None:
+        while True:
+            await websocket.send_json(await subscription.get())
+
+    def log_sender_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("WebSocket watch updates stopped: %r", task.exception())
+
+    sender = asyncio.create_task(send_updates())
+    sender.add_done_callback(log_sender_failure)
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+            if frame.get("text") is None:
+                await websocket.send_json({"error": "Binary frames are not supported, send JSON text messages"})
+                continue
+            try:
+                message = json.loads(frame["text"])
+            except json.JSONDecodeError as e:
+                await websocket.send_json({"error": f"Malformed JSON message: {e}"})
+                continue
+            action = message.get("action") if isinstance(message, dict) else None
+            addresses = message.get("addresses") if isinstance(message, dict) else None
+            if action not in ("watch", "unwatch") or not isinstance(addresses, list):
+                await websocket.send_json({"error": 'Expected {"action": "watch" | "unwatch", "addresses": [...]}'})
+                continue
+            valid_addresses = []
+            for address in addresses:
+                try:
+                    valid_addresses.append(tron_address.normalize_address(str(address)))
+                except ValueError as e:
+                    await websocket.send_json(
+                        {"address": address, "wallet": None, "error": f"Invalid Tron address: {str(e)}"}
+                    )
+            try:
+                if action == "watch":
+                    watch.watcher.watch(subscription, valid_addresses)
+                else:
+                    watch.watcher.unwatch(subscription, valid_addresses)
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        watch.watcher.unsubscribe(subscription)
+        logger.info("WebSocket watch subscription closed")
+
+
+@router.get("/watch")
+async def watch_wallets_sse(addresses: list[str] = Query(..., min_length=1), client_request: Request = None):
+    """
+    Streams wallet information updates for the given addresses as Server-Sent Events.
+
+    Args:
+        addresses (list[str]): Tron wallet addresses to watch (repeat the `addresses` query parameter).
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of `{"address", "wallet", "error"}` events, sent whenever
+            a watched wallet changes, with periodic keep-alive comments.
+
+    Raises:
+        HTTPException:
+            - 400 if an address is invalid or too many addresses are requested.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info("Incoming request: GET /watch from %s, addresses=%s", client_ip, len(addresses))
+
+    try:
+        normalized = [tron_address.normalize_address(address) for address in addresses]
     except ValueError as e:
-        logger.error(f"Error processing wallet info for address={request.address}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid Tron address: {str(e)}")
+    subscription = watch.watcher.subscribe()
+    try:
+        watch.watcher.watch(subscription, normalized)
+    except ValueError as e:
+        watch.watcher.unsubscribe(subscription)
         raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        _stream_watch_events(subscription), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _stream_watch_events(subscription: watch.Subscription) -> AsyncIterator[str]:
+    """
+    Formats watch updates as Server-Sent Events until the client disconnects.
+
+    Args:
+        subscription (watch.Subscription): The subscription to read updates from.
+
+    Yields:
+        str: One `data:` event per update, or a keep-alive comment when idle.
+    """
+    try:
+        while True:
+            try:
+                update = await asyncio.wait_for(subscription.get(), watch.WATCH_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {json.dumps(update)}\n\n"
+    finally:
+        watch.watcher.unsubscribe(subscription)
 
 
-@app.get("/requests", response_model=list[schemas.RequestResponse])
+@router.get("/requests", response_model=list[schemas.RequestResponse])
 async def get_requests(
         params: schemas.PaginationParams = Depends(),
+        filters: schemas.RequestFilterParams = Depends(),
         db: AsyncSession = Depends(database.get_db),
         client_request: Request = None
 ):
@@ -81,6 +521,7 @@ async def get_requests(
 
     Args:
         params (schemas.PaginationParams): Pagination parameters (offset and limit).
+        filters (schemas.RequestFilterParams): Optional wallet address and time range filters.
         db (AsyncSession): Asynchronous database session for querying requests.
         client_request (Request, optional): FastAPI request object to extract client IP.
 
@@ -89,15 +530,482 @@ async def get_requests(
 
     Raises:
         HTTPException:
+            - 400 if the wallet address filter is not a valid Tron address.
+            - 500 if an error occurs while retrieving requests from the database.
+            - 503 with Retry-After if the request-log read concurrency limit and its queue are exhausted.
+    Notes:
+        - Rendered bodies are cached per query (see `http_cache.requests_cache`) until request rows are
+          written or RESPONSE_CACHE_TTL passes, so repeated polls skip the database.
+        - Responses carry ETag (newest request id and body hash) and Cache-Control headers; `304 Not Modified`
+          is returned if If-None-Match shows the client's copy is current.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info(
+        "Incoming request: GET /requests from %s, offset=%s, limit=%s",
+        client_ip, params.offset, params.limit, extra=SAMPLED
+    )
+
+    filters = _normalized_filters(filters)
+    key = http_cache.cache_key(client_request)
+    rendered = http_cache.requests_cache.get(key)
+    if rendered is not None:
+        return http_cache.conditional_response(client_request, rendered)
+
+    try:
+        generation = http_cache.requests_cache.generation
+        async with requests_limiter.acquire():
+            requests = await crud.get_requests(
+                db, params.offset, params.limit, filters.wallet_address, filters.created_from, filters.created_to
+            )
+        logger.info("Successfully retrieved %s requests", len(requests), extra=SAMPLED)
+        rendered = _rendered_requests(requests, _request_items(requests), REQUEST_LIST_RESPONSE)
+        http_cache.requests_cache.set(key, rendered, generation)
+        return http_cache.conditional_response(client_request, rendered)
+    except LimitExceededError as e:
+        logger.warning("Shed requests listing: %s", e)
+        raise _overloaded(e)
+    except Exception as e:
+        logger.error("Error retrieving requests: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/requests/page", response_model=schemas.RequestPage)
+async def get_requests_page(
+        params: schemas.CursorPaginationParams = Depends(),
+        filters: schemas.RequestFilterParams = Depends(),
+        db: AsyncSession = Depends(database.get_db),
+        client_request: Request = None
+):
+    """
+    Retrieves a page of requests using cursor (keyset) pagination.
+
+    Args:
+        params (schemas.CursorPaginationParams): Pagination parameters (cursor and limit).
+        filters (schemas.RequestFilterParams): Optional wallet address and time range filters.
+        db (AsyncSession): Asynchronous database session for querying requests.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        schemas.RequestPage: Request records and the cursor of the next page.
+
+    Raises:
+        HTTPException:
+            - 400 if the cursor is malformed or the wallet address filter is not a valid Tron address.
             - 500 if an error occurs while retrieving requests from the database.
+            - 503 with Retry-After if the request-log read concurrency limit and its queue are exhausted.
+    Notes:
+        - Rendered bodies are cached per query (see `http_cache.requests_cache`) until request rows are
+          written or RESPONSE_CACHE_TTL passes, so repeated polls skip the database.
+        - Responses carry ETag (newest request id and body hash) and Cache-Control headers; `304 Not Modified`
+          is returned if If-None-Match shows the client's copy is current.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info(
+        "Incoming request: GET /requests/page from %s, cursor=%s, limit=%s",
+        client_ip, params.cursor, params.limit, extra=SAMPLED
+    )
+
+    filters = _normalized_filters(filters)
+    key = http_cache.cache_key(client_request)
+    rendered = http_cache.requests_cache.get(key)
+    if rendered is not None:
+        return http_cache.conditional_response(client_request, rendered)
+
+    try:
+        generation = http_cache.requests_cache.generation
+        async with requests_limiter.acquire():
+            requests, next_cursor = await crud.get_requests_page(
+                db, params.limit, params.cursor, filters.wallet_address, filters.created_from, filters.created_to
+            )
+        logger.info("Successfully retrieved page of %s requests", len(requests), extra=SAMPLED)
+        rendered = _rendered_requests(
+            requests, {"items": _request_items(requests), "next_cursor": next_cursor}, REQUEST_PAGE_RESPONSE
+        )
+        http_cache.requests_cache.set(key, rendered, generation)
+        return http_cache.conditional_response(client_request, rendered)
+    except LimitExceededError as e:
+        logger.warning("Shed requests page: %s", e)
+        raise _overloaded(e)
+    except ValueError as e:
+        logger.error("Invalid cursor: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error retrieving requests page: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/requests/export")
+async def export_requests(
+        params: schemas.ExportParams = Depends(),
+        filters: schemas.RequestFilterParams = Depends(),
+        client_request: Request = None
+):
+    """
+    Exports all matching requests in one streamed response.
+
+    Args:
+        params (schemas.ExportParams): Export format and chunk size.
+        filters (schemas.RequestFilterParams): Optional wallet address and time range filters.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        StreamingResponse: Chunked NDJSON or CSV of `(id, created_at, wallet_address)` records in creation
+            order, served as an attachment.
+
+    Raises:
+        HTTPException:
+            - 400 if the wallet address filter is not a valid Tron address.
+            - 503 with Retry-After if the export concurrency limit and its queue are exhausted.
+
+    Notes:
+        - Rows are read from a server-side cursor in a session owned by the stream, so memory use does not
+          grow with the size of the export.
+        - A database error after the first chunk can no longer change the status code; the response is
+          then cut short.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info(
+        "Incoming request: GET /requests/export from %s, format=%s, wallet_address=%s, created_from=%s, "
+        "created_to=%s", client_ip, params.format, filters.wallet_address, filters.created_from, filters.created_to
+    )
+
+    filters = _normalized_filters(filters)
+    slot = AsyncExitStack()
+    try:
+        await slot.enter_async_context(export_limiter.acquire())
+    except LimitExceededError as e:
+        logger.warning("Shed requests export: %s", e)
+        raise _overloaded(e)
+    return _ExportResponse(
+        slot,
+        _stream_export(params, filters),
+        media_type=export.EXPORT_FORMATS[params.format],
+        headers={"Content-Disposition": f'attachment; filename="requests.{params.format}"'}
+    )
+
+
+class _ExportResponse(StreamingResponse):
+    """
+    Streaming response releasing the export concurrency slot once it has been sent or abandoned.
+
+    Args:
+        slot (AsyncExitStack): Holds the export limiter slot acquired by the handler.
+        *args: `StreamingResponse` arguments.
+        **kwargs: `StreamingResponse` keyword arguments.
+
+    Notes:
+        - The slot cannot be released by the body generator: it never starts if sending the response head
+          fails or the client disconnects before the first chunk.
+    """
+
+    def __init__(self, slot: AsyncExitStack, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.slot.aclose()
+
+
+async def _stream_export(
+        params: schemas.ExportParams,
+        filters: schemas.RequestFilterParams
+) -> AsyncIterator[bytes]:
+    """
+    Streams an export.
+
+    Args:
+        params (schemas.ExportParams): Export format and chunk size.
+        filters (schemas.RequestFilterParams): Wallet address and time range filters.
+
+    Yields:
+        bytes: Encoded chunks (see `export.iter_export`).
+    """
+    chunks = 0
+    try:
+        async for chunk in export.iter_export(
+                database.async_session, params.format, params.batch_size,
+                filters.wallet_address, filters.created_from, filters.created_to
+        ):
+            chunks += 1
+            yield chunk
+    except Exception as e:
+        logger.error("Export failed after %s chunks: %s", chunks, e)
+        raise
+    logger.info("Exported requests in %s chunks", chunks)
+
+
+@router.get("/analytics/top-addresses", response_model=list[schemas.AddressRequestCountResponse])
+async def get_top_addresses(
+        params: schemas.TopAddressesParams = Depends(),
+        db: AsyncSession = Depends(database.get_db),
+        client_request: Request = None
+):
+    """
+    Retrieves the most requested wallet addresses.
+
+    Args:
+        params (schemas.TopAddressesParams): Number of addresses to return.
+        db (AsyncSession): Asynchronous database session for querying the rollups.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        list[schemas.AddressRequestCountResponse]: Addresses with their request counts, most requested first.
+
+    Raises:
+        HTTPException:
+            - 500 if an error occurs while reading the rollups.
+
+    Notes:
+        - Served from the per-address rollup, so the cost does not depend on the size of the requests table.
+        - Requests still buffered by the request log writer are not counted yet.
+    """
+    client_ip = client_request.client.host if client_request else "unknown"
+    logger.info(
+        "Incoming request: GET /analytics/top-addresses from %s, limit=%s", client_ip, params.limit, extra=SAMPLED
+    )
+
+    try:
+        return await crud.get_top_addresses(db, params.limit)
+    except Exception as e:
+        logger.error("Error retrieving top addresses: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/analytics/requests-per-minute", response_model=list[schemas.MinuteRequestCountResponse])
+async def get_requests_per_minute(
+        params: schemas.RequestsPerMinuteParams = Depends(),
+        db: AsyncSession = Depends(database.get_db),
+        client_request: Request = None
+):
+    """
+    Retrieves the number of requests per minute.
+
+    Args:
+        params (schemas.RequestsPerMinuteParams): Number of minutes and time range.
+        db (AsyncSession): Asynchronous database session for querying the rollups.
+        client_request (Request, optional): FastAPI request object to extract client IP.
+
+    Returns:
+        list[schemas.MinuteRequestCountResponse]: Minutes with at least one request, oldest first.
+
+    Raises:
+        HTTPException:
+            - 500 if an error occurs while reading the rollups.
+
+    Notes:
+        - Served from the per-minute rollup, so the cost does not depend on the size of the requests table.
+        - Requests still buffered by the request log writer are not counted yet.
     """
     client_ip = client_request.client.host if client_request else "unknown"
-    logger.info(f"Incoming request: GET /requests from {client_ip}, offset={params.offset}, limit={params.limit}")
+    logger.info(
+        "Incoming request: GET /analytics/requests-per-minute from %s, limit=%s", client_ip, params.limit,
+        extra=SAMPLED
+    )
 
     try:
-        requests = await crud.get_requests(db, params.offset, params.limit)
-        logger.info(f"Successfully retrieved {len(requests)} requests")
-        return requests
+        return await crud.get_requests_per_minute(db, params.limit, params.created_from, params.created_to)
     except Exception as e:
-        logger.error(f"Error retrieving requests: {str(e)}")
+        logger.error("Error retrieving requests per minute: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/health/ready", response_model=schemas.ReadinessResponse)
+async def get_readiness():
+    """
+    Reports whether the instance should receive traffic.
+
+    Returns:
+        schemas.ReadinessResponse: Status and the number of wallets loaded by the warm-up.
+
+    Raises:
+        HTTPException: 503 while the wallet cache warm-up is running.
+    """
+    if not prefetch.prefetcher.ready:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready", "warmed": prefetch.prefetcher.stats.warmed}
+
+
+@router.get("/cache/stats", response_model=schemas.CacheStatsResponse)
+async def get_cache_stats():
+    """
+    Returns hit, miss and eviction counters of the wallet cache.
+
+    Returns:
+        schemas.CacheStatsResponse: Current wallet cache statistics.
+    """
+    return {"size": len(tron_service.wallet_cache), **asdict(tron_service.get_cache_stats())}
+
+
+@router.get("/db/stats", response_model=schemas.PoolStatsResponse)
+async def get_pool_stats():
+    """
+    Returns utilization of the database connection pool.
+
+    Returns:
+        schemas.PoolStatsResponse: Current connection pool statistics.
+    """
+    return database.get_pool_stats()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Exposes service metrics in the Prometheus text format.
+
+    Returns:
+        Response: Request counters, latency histograms per route and stage, cache, pool,
+            request-log and upstream metrics.
+    """
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def _upstream_clients() -> list:
+    # Metrics must not create the pool; before the first Tron API call there are no clients to report.
+    return tron_service.upstream_pool.clients if tron_service.upstream_pool is not None else []
+
+
+def _register_metrics() -> None:
+    """
+    Registers the callback metrics reading application state in the metrics registry.
+    """
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "wallet_cache_events", "Wallet cache events by kind", ("event",),
+        lambda: [((event,), value) for event, value in asdict(tron_service.get_cache_stats()).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "wallet_cache_size", "Number of entries in the wallet cache", (),
+        lambda: [((), len(tron_service.wallet_cache))]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "address_validation_cache", "Memoized address validation counters", ("stat",),
+        lambda: [((stat,), value) for stat, value in tron_address.get_cache_info().items()]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "db_pool", "Database connection pool state", ("stat",),
+        lambda: [((stat,), value) for stat, value in database.get_pool_stats().items()]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "request_log_records", "Request-log writer record counters", ("outcome",),
+        lambda: [((outcome,), value) for outcome, value in asdict(request_log.writer.stats).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "snapshot_records", "Wallet snapshot writer record counters", ("outcome",),
+        lambda: [((outcome,), value) for outcome, value in asdict(snapshots.writer.stats).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "request_log_queue_size", "Records waiting in the request-log buffer", (),
+        lambda: [((), request_log.writer.queue_size)]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "watch_addresses", "Distinct wallet addresses polled by the watcher", (),
+        lambda: [((), watch.watcher.watched)]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "watch_subscriptions", "Open wallet watch subscriptions", (),
+        lambda: [((), watch.watcher.subscriptions)]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "block_follower_events", "Block follower counters", ("event",),
+        lambda: [((event,), value) for event, value in asdict(block_follower.follower.stats).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "block_follower_synced", "Whether the block follower keeps up and wallets are cached with its TTL", (),
+        lambda: [((), int(block_follower.follower.synced))]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "prefetch_events", "Wallet cache warm-up and prefetch counters", ("event",),
+        lambda: [((event,), value) for event, value in asdict(prefetch.prefetcher.stats).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "response_cache_events", "Rendered response cache counters", ("event",),
+        lambda: [((event,), value) for event, value in asdict(http_cache.requests_cache.stats).items()],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "upstream_circuit_open", "Whether the circuit breaker of an upstream client is open", ("client",),
+        lambda: [((client.name,), int(client.breaker.state == "open")) for client in _upstream_clients()]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "upstream_inflight", "Tron API calls in progress per upstream client", ("client",),
+        lambda: [((client.name,), client.inflight) for client in _upstream_clients()]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "concurrency_limiter", "Adaptive concurrency limiter state", ("limiter", "stat"),
+        lambda: [
+            ((limiter.name, stat), value)
+            for limiter in (wallet_limiter, requests_limiter, export_limiter)
+            for stat, value in limiter.snapshot().items()
+        ]
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "concurrency_limiter_events", "Adaptive concurrency limiter counters", ("limiter", "event"),
+        lambda: [
+            ((limiter.name, event), value)
+            for limiter in (wallet_limiter, requests_limiter, export_limiter)
+            for event, value in asdict(limiter.stats).items()
+        ],
+        metric_type="counter"
+    ))
+    metrics.REGISTRY.register(metrics.CallbackMetric(
+        "startup_seconds", "Seconds spent importing the application and running its startup", ("phase",),
+        lambda: [((phase,), seconds) for phase, seconds in startup_seconds.items()]
+    ))
+
+
+def create_app() -> FastAPI:
+    """
+    Builds the FastAPI application.
+
+    Returns:
+        FastAPI: Application with all routes, the metrics middleware and the lifespan handler.
+
+    Notes:
+        - Construction is cheap: connections and clients are created on first use (see `lifespan`).
+    """
+    application = FastAPI(
+        title="Tron Wallet Info Service", lifespan=lifespan, default_response_class=metrics.TimedJSONResponse
+    )
+    application.add_middleware(metrics.MetricsMiddleware)
+    application.include_router(router)
+    _register_metrics()
+    return application
+
+
+_app: FastAPI | None = None
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Builds the module-level `app` on first access.
+
+    Args:
+        name (str): Attribute name.
+
+    Returns:
+        Any: The application for "app".
+
+    Raises:
+        AttributeError: For any other name.
+
+    Notes:
+        - `app` serves `uvicorn app.main:app` and the tests. `app.run` builds each worker's application with the
+          `create_app` factory instead, so importing this module must not build (and register metrics for)
+          a second one.
+    """
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+startup_seconds["import"] = time.perf_counter() - _IMPORT_STARTED
@@ -0,0 +1,242 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterable, Iterator, TypeVar
+from fastapi.responses import JSONResponse
+import orjson
+import time
+
+T = TypeVar("T")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    """
+    Base class of metrics rendered in the Prometheus text exposition format.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): Help text.
+        labelnames (tuple[str, ...]): Names of the labels, given positionally when recording.
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """Yields (suffix, rendered labels, value) for every sample of the metric."""
+        return ()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {value}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing counter.
+    """
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        for labels, value in self._values.items():
+            yield "_total", _format_labels(self.labelnames, labels), value
+
+
+class Histogram(Metric):
+    """
+    Histogram with fixed cumulative buckets.
+
+    Args:
+        buckets (tuple[float, ...]): Upper bounds of the buckets in seconds, ascending.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # Per-bucket counts (last one is +Inf), then sum.
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """
+        Observes the duration of the enclosed block.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield "_bucket", _format_labels(self.labelnames, labels, f'le="{le}"'), cumulative
+            yield "_sum", _format_labels(self.labelnames, labels), total
+            yield "_count", _format_labels(self.labelnames, labels), cumulative
+
+
+class CallbackMetric(Metric):
+    """
+    Metric whose samples are read from a callback when metrics are rendered, used to expose
+    counters and gauges kept by other components (cache, connection pool, request-log writer).
+
+    Args:
+        callback (Callable[[], Iterable[tuple[tuple[str, ...], float]]]): Returns (label values, value) pairs.
+        metric_type (str): "gauge" or "counter".
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...],
+                 callback: Callable[[], Iterable[tuple[tuple[str, ...], float]]], metric_type: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = metric_type
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        for labels, value in self.callback():
+            yield "", _format_labels(self.labelnames, labels), value
+
+
+class Registry:
+    """
+    Collection of metrics rendered together on the /metrics endpoint.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Renders all registered metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.register(Counter(
+    "http_requests", "HTTP requests by route and status code", ("method", "path", "status")
+))
+http_request_duration = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "path")
+))
+stage_duration = REGISTRY.register(Histogram(
+    "stage_duration_seconds", "Latency of individual request processing stages", ("stage",)
+))
+upstream_calls = REGISTRY.register(Counter(
+    "upstream_calls", "Tron API calls by client and outcome", ("client", "outcome")
+))
+
+
+async def timed(stage: str, awaitable: Awaitable[T]) -> T:
+    """
+    Awaits `awaitable` and records its duration as a processing stage.
+
+    Args:
+        stage (str): Stage name.
+        awaitable (Awaitable[T]): Awaitable to time.
+
+    Returns:
+        T: The result of the awaitable.
+    """
+    with stage_duration.time(stage):
+        return await awaitable
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson that records the time spent encoding its body as the "serialization" stage.
+
+    Notes:
+        - Datetimes are encoded natively, with "Z" for UTC, matching pydantic's output, so handlers may
+          return rows directly instead of response models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with stage_duration.time("serialization"):
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests and measuring their latency per route template.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], path)
+            http_requests.inc(scope["method"], path, str(status))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, Index
 from sqlalchemy.orm import declarative_base
 from datetime import datetime, UTC
 
@@ -14,8 +14,85 @@ class Request(Base):
         id (Column): Primary key, unique identifier for the request.
         created_at (Column): Timestamp when the request was created, defaults to current UTC time.
         wallet_address (Column): Tron wallet address associated with the request, indexed for faster queries.
+
+    Notes:
+        - `(created_at, id)` and `(wallet_address, created_at, id)` indexes back keyset pagination,
+          unfiltered and filtered by wallet address respectively.
+        - On PostgreSQL the table can be range-partitioned by `created_at` (see `utils.partitions`), with
+          a `(id, created_at)` primary key; the mapping is the same for both layouts.
     """
     __tablename__ = "requests"
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
     wallet_address = Column(String, index=True, nullable=False)
+
+    __table_args__ = (
+        Index("ix_requests_created_at_id", "created_at", "id"),
+        Index("ix_requests_wallet_address_created_at_id", "wallet_address", "created_at", "id"),
+    )
+
+
+class WalletSnapshot(Base):
+    """
+    SQLAlchemy model representing wallet information fetched from the Tron network at a point in time.
+
+    Attributes:
+        __tablename__ (str): Name of the database table ('wallet_snapshots').
+        id (Column): Primary key, unique identifier for the snapshot.
+        wallet_address (Column): Tron wallet address in base58check form.
+        captured_at (Column): Timestamp when the wallet information was fetched.
+        balance_trx (Column): Wallet balance in TRX.
+        bandwidth (Column): Available bandwidth.
+        energy (Column): Available energy.
+
+    Notes:
+        - The `(wallet_address, captured_at, id)` index backs latest-snapshot lookups and history queries.
+    """
+    __tablename__ = "wallet_snapshots"
+    id = Column(Integer, primary_key=True)
+    wallet_address = Column(String, nullable=False)
+    captured_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+    balance_trx = Column(Float, nullable=False)
+    bandwidth = Column(BigInteger, nullable=False)
+    energy = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_wallet_snapshots_wallet_address_captured_at_id", "wallet_address", "captured_at", "id"),
+    )
+
+
+class AddressRequestCount(Base):
+    """
+    SQLAlchemy model holding the number of requests per wallet address, maintained as requests are written.
+
+    Attributes:
+        __tablename__ (str): Name of the database table ('request_counts_by_address').
+        wallet_address (Column): Primary key, Tron wallet address.
+        request_count (Column): Number of requests for the address.
+        last_requested_at (Column): Creation time of the latest request for the address.
+
+    Notes:
+        - The `(request_count, wallet_address)` index lets top-N queries read N index entries.
+    """
+    __tablename__ = "request_counts_by_address"
+    wallet_address = Column(String, primary_key=True)
+    request_count = Column(BigInteger, nullable=False, default=0)
+    last_requested_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_request_counts_by_address_request_count", "request_count", "wallet_address"),
+    )
+
+
+class MinuteRequestCount(Base):
+    """
+    SQLAlchemy model holding the number of requests per minute, maintained as requests are written.
+
+    Attributes:
+        __tablename__ (str): Name of the database table ('request_counts_by_minute').
+        minute (Column): Primary key, start of the minute (UTC).
+        request_count (Column): Number of requests created within the minute.
+    """
+    __tablename__ = "request_counts_by_minute"
+    minute = Column(DateTime(timezone=True), primary_key=True)
+    request_count = Column(BigInteger, nullable=False, default=0)
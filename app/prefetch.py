@@ -0,0 +1,213 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from dotenv import load_dotenv
+from typing import Awaitable, Callable
+import asyncio
+import os
+from app import crud, database, tron_service
+from app.cache import TTLCache
+from app.upstream import TokenBucket
+from app.logger import setup_logger
+
+logger = setup_logger("prefetch")
+
+load_dotenv()
+
+
+@dataclass
+class PrefetchStats:
+    """
+    Counters of the prefetcher.
+
+    Attributes:
+        warmed (int): Wallets loaded by the startup warm-up.
+        refreshes (int): Wallets refreshed before their cache entry became stale.
+        errors (int): Failed warm-up loads, refreshes and passes.
+    """
+    warmed: int = 0
+    refreshes: int = 0
+    errors: int = 0
+
+
+class Prefetcher:
+    """
+    Warms the wallet cache with the most requested addresses at startup and keeps them fresh afterwards.
+
+    The warm-up loads the `top_k` addresses with the most requests (within the last `window` seconds) through
+    the cache, so levels shared with other workers are used before the Tron API. The instance reports ready
+    once it is done or `warmup_timeout` seconds have passed. Then, every `interval` seconds, the current top
+    addresses that are cached locally and stay fresh for less than `lead` seconds are refreshed from the Tron
+    API, so requests for hot addresses do not wait for a load or serve stale values.
+
+    Args:
+        cache (TTLCache): The wallet cache.
+        session_factory (Callable[[], AsyncSession]): Creates sessions for reading the top addresses.
+        load (Callable[[str], Awaitable[dict]]): Returns wallet information through the cache.
+        refresh (Callable[[str], Awaitable[dict]]): Fetches wallet information and stores it in the cache.
+        top_k (int): Number of addresses to keep warm; 0 disables the prefetcher.
+        window (float): Only consider addresses requested within this many seconds; 0 for all time.
+        interval (float): Seconds between prefetch passes.
+        lead (float): Refresh entries that stay fresh for less than this many seconds.
+        concurrency (int): Maximum number of loads in flight at once.
+        rate (float): Maximum loads per second, leaving Tron API capacity for live requests; 0 disables.
+        warmup_timeout (float): Seconds after which the instance reports ready even if warm-up is not done.
+
+    Attributes:
+        ready (bool): Whether the warm-up has finished (or was skipped).
+        stats (PrefetchStats): Counters.
+    """
+
+    def __init__(
+            self,
+            cache: TTLCache,
+            session_factory: Callable[[], AsyncSession],
+            load: Callable[[str], Awaitable[dict]],
+            refresh: Callable[[str], Awaitable[dict]],
+            top_k: int = 100,
+            window: float = 3600.0,
+            interval: float = 5.0,
+            lead: float = 3.0,
+            concurrency: int = 10,
+            rate: float = 20.0,
+            warmup_timeout: float = 30.0
+    ):
+        self.cache = cache
+        self.session_factory = session_factory
+        self.load = load
+        self.refresh = refresh
+        self.top_k = top_k
+        self.window = window
+        self.interval = interval
+        self.lead = lead
+        self.concurrency = concurrency
+        self.rate = rate
+        self.warmup_timeout = warmup_timeout
+        self.ready = False
+        self.stats = PrefetchStats()
+        self._bucket = TokenBucket(rate, concurrency)
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """
+        Starts the warm-up and the prefetch passes on the running event loop.
+        """
+        if self.top_k <= 0:
+            self.ready = True
+            return
+        if self.running:
+            return
+        self.ready = False
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "Prefetcher started: top_k=%s, interval=%s, lead=%s, rate=%s", self.top_k, self.interval, self.lead,
+            self.rate
+        )
+
+    async def stop(self) -> None:
+        """
+        Stops the prefetcher, cancelling a warm-up or pass in progress.
+        """
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info("Prefetcher stopped: stats=%s", self.stats)
+
+    async def warm_up(self) -> int:
+        """
+        Loads the top addresses into the cache.
+
+        Returns:
+            int: Number of addresses loaded successfully.
+
+        Raises:
+            Exception: If the top addresses cannot be read from the database.
+        """
+        addresses = await self._top_addresses()
+        warmed = await self._fetch_all(addresses, self.load)
+        self.stats.warmed += warmed
+        logger.info("Warm-up loaded %s of %s top addresses", warmed, len(addresses))
+        return warmed
+
+    async def prefetch(self) -> int:
+        """
+        Refreshes the top addresses whose local cache entries are about to become stale.
+
+        Returns:
+            int: Number of addresses refreshed successfully.
+
+        Raises:
+            Exception: If the top addresses cannot be read from the database.
+        """
+        # Uncached addresses are left to the requests for them, so workers do not all fetch the whole top list.
+        due = [
+            address for address in await self._top_addresses()
+            if address in self.cache and self.cache.fresh_for(address) < self.lead
+        ]
+        refreshed = await self._fetch_all(due, self.refresh)
+        self.stats.refreshes += refreshed
+        return refreshed
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.wait_for(self.warm_up(), self.warmup_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up did not finish within %s s", self.warmup_timeout)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error("Warm-up failed: %s", e)
+        finally:
+            self.ready = True
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.prefetch()
+            except Exception as e:
+                self.stats.errors += 1
+                logger.error("Prefetch pass failed: %s", e)
+
+    async def _top_addresses(self) -> list[str]:
+        requested_since = datetime.now(UTC) - timedelta(seconds=self.window) if self.window > 0 else None
+        async with self.session_factory() as db:
+            counts = await crud.get_top_addresses(db, self.top_k, requested_since)
+        return [count.wallet_address for count in counts]
+
+    async def _fetch_all(self, addresses: list[str], fetch: Callable[[str], Awaitable[dict]]) -> int:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(address: str) -> bool:
+            async with semaphore:
+                await self._bucket.acquire()
+                try:
+                    await fetch(address)
+                    return True
+                except Exception as e:
+                    self.stats.errors += 1
+                    logger.warning("Prefetch failed for address=%s: %s", address, e)
+                    return False
+
+        return sum(await asyncio.gather(*(fetch_one(address) for address in addresses)))
+
+
+prefetcher = Prefetcher(
+    tron_service.wallet_cache,
+    database.async_session,
+    tron_service.get_wallet_info,
+    tron_service.refresh_wallet_info,
+    top_k=int(os.getenv("PREFETCH_TOP_K", "100")),
+    window=float(os.getenv("PREFETCH_WINDOW", "3600")),
+    interval=float(os.getenv("PREFETCH_INTERVAL", "5")),
+    lead=float(os.getenv("PREFETCH_LEAD", "3")),
+    concurrency=int(os.getenv("PREFETCH_CONCURRENCY", "10")),
+    rate=float(os.getenv("PREFETCH_RATE", "20")),
+    warmup_timeout=float(os.getenv("WARMUP_TIMEOUT", "30"))
+)
@@ -0,0 +1,284 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from datetime import datetime, UTC
+from dotenv import load_dotenv
+from typing import Callable
+import asyncio
+import os
+from app import crud, database
+from app.logger import setup_logger
+
+logger = setup_logger("request_log")
+
+load_dotenv()
+
+OVERFLOW_POLICIES = ("block", "drop", "direct")
+
+_STOP = object()
+
+
+@dataclass
+class RequestLogStats:
+    """
+    Counters describing a batch writer (request log, wallet snapshots).
+
+    Attributes:
+        enqueued (int): Records accepted into the buffer.
+        written (int): Records persisted to the database.
+        dropped (int): Records discarded because the buffer was full.
+        direct_writes (int): Records written synchronously, bypassing the buffer.
+        failed (int): Records lost because their batch could not be written.
+        batches (int): Batches flushed to the database.
+    """
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    direct_writes: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class BatchWriter(ABC):
+    """
+    Write-behind buffer that persists records in batches off the request path.
+
+    Records are put into a bounded in-memory queue and a background worker flushes them with a single
+    multi-row INSERT whenever `batch_size` records are collected or `flush_interval` seconds pass.
+    Subclasses define how a batch is written (`_write`) and how records are enqueued.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Factory for sessions used to write batches.
+        max_queue_size (int): Maximum number of buffered records.
+        batch_size (int): Maximum number of records per INSERT.
+        flush_interval (float): Maximum seconds a record waits in the buffer.
+        overflow_policy (str): What to do when the buffer is full:
+            - "block": wait up to `block_timeout` seconds for space, then drop the record.
+            - "drop": drop the record immediately.
+            - "direct": write the record synchronously with its own session.
+        block_timeout (float): Seconds to wait for space under the "block" policy.
+        buffered (bool): If false, every record is written synchronously.
+
+    Attributes:
+        on_written (list[Callable[[int], None]]): Called with the number of records after every successful write,
+            e.g. to invalidate caches derived from the written table.
+    """
+    name = "Batch writer"
+
+    def __init__(
+            self,
+            session_factory: Callable[[], AsyncSession],
+            max_queue_size: int = 10_000,
+            batch_size: int = 500,
+            flush_interval: float = 1.0,
+            overflow_policy: str = "block",
+            block_timeout: float = 1.0,
+            buffered: bool = True
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+        self.session_factory = session_factory
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.buffered = buffered
+        self.stats = RequestLogStats()
+        self.on_written: list[Callable[[int], None]] = []
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """
+        Starts the background flush worker on the running event loop.
+        """
+        if not self.buffered or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "%s started: batch_size=%s, flush_interval=%s, max_queue_size=%s, overflow_policy=%s",
+            self.name, self.batch_size, self.flush_interval, self.max_queue_size, self.overflow_policy
+        )
+
+    async def stop(self) -> None:
+        """
+        Flushes all buffered records and stops the background worker.
+
+        Notes:
+            - Called during application shutdown so that no accepted record is lost.
+        """
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+        remaining = self._drain()
+        if remaining:
+            await self._flush(remaining)
+        self._worker = None
+        logger.info("%s stopped: %s", self.name, asdict(self.stats))
+
+    @abstractmethod
+    async def _write(self, db: AsyncSession, records: list[tuple]) -> None:
+        """
+        Writes a batch of records with the given session.
+
+        Args:
+            db (AsyncSession): Session to write with.
+            records (list[tuple]): Records to write.
+        """
+
+    async def _put_many(self, records: list[tuple]) -> None:
+        """
+        Buffers records for the background worker.
+
+        Args:
+            records (list[tuple]): Records to write.
+
+        Notes:
+            - If the worker is not running (or buffering is disabled), records are written synchronously.
+        """
+        if not self.running:
+            await self._write_direct(records)
+            return
+
+        overflow = []
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+                self.stats.enqueued += 1
+            except asyncio.QueueFull:
+                overflow.append(record)
+        if overflow:
+            await self._handle_overflow(overflow)
+
+    async def _handle_overflow(self, records: list[tuple]) -> None:
+        if self.overflow_policy == "direct":
+            await self._write_direct(records)
+            return
+        if self.overflow_policy == "block":
+            for index, record in enumerate(records):
+                try:
+                    await asyncio.wait_for(self._queue.put(record), self.block_timeout)
+                    self.stats.enqueued += 1
+                except asyncio.TimeoutError:
+                    records = records[index:]
+                    break
+            else:
+                return
+        self.stats.dropped += len(records)
+        logger.warning("%s buffer full, dropped %s records", self.name, len(records))
+
+    async def _write_direct(self, records: list[tuple]) -> None:
+        if not records:
+            return
+        async with self.session_factory() as db:
+            await self._write(db, records)
+        self.stats.direct_writes += len(records)
+        self.stats.written += len(records)
+        self._notify(len(records))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            await self._flush(batch)
+
+    def _drain(self) -> list[tuple]:
+        records = []
+        while not self._queue.empty():
+            record = self._queue.get_nowait()
+            if record is not _STOP:
+                records.append(record)
+        return records
+
+    async def _flush(self, records: list[tuple]) -> None:
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            try:
+                async with self.session_factory() as db:
+                    await self._write(db, batch)
+                self.stats.written += len(batch)
+                self.stats.batches += 1
+            except Exception as e:
+                self.stats.failed += len(batch)
+                logger.error("%s failed to flush %s records: %s", self.name, len(batch), e)
+                continue
+            self._notify(len(batch))
+
+    def _notify(self, count: int) -> None:
+        for callback in self.on_written:
+            try:
+                callback(count)
+            except Exception as e:
+                logger.error("%s write callback failed: %s", self.name, e)
+
+
+class RequestLogWriter(BatchWriter):
+    """
+    Batch writer persisting `(wallet_address, created_at)` request records (see `BatchWriter`).
+    """
+    name = "Request log writer"
+
+    async def enqueue(self, wallet_address: str) -> None:
+        """
+        Records a request for `wallet_address`, timestamped now.
+
+        Args:
+            wallet_address (str): Tron wallet address associated with the request.
+        """
+        await self.enqueue_many([wallet_address])
+
+    async def enqueue_many(self, wallet_addresses: list[str]) -> None:
+        """
+        Records requests for several wallet addresses, timestamped now.
+
+        Args:
+            wallet_addresses (list[str]): Tron wallet addresses associated with the requests.
+
+        Notes:
+            - If the worker is not running (or buffering is disabled), records are written synchronously.
+        """
+        created_at = datetime.now(UTC)
+        await self._put_many([(wallet_address, created_at) for wallet_address in wallet_addresses])
+
+    async def _write(self, db: AsyncSession, records: list[tuple[str, datetime]]) -> None:
+        await crud.create_requests(
+            db, [wallet_address for wallet_address, _ in records], [created_at for _, created_at in records]
+        )
+
+
+writer = RequestLogWriter(
+    database.async_session,
+    max_queue_size=int(os.getenv("REQUEST_LOG_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("REQUEST_LOG_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", "1.0")),
+    overflow_policy=os.getenv("REQUEST_LOG_OVERFLOW_POLICY", "block"),
+    buffered=os.getenv("REQUEST_LOG_BUFFERED", "true").lower() == "true"
+)
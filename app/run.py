@@ -0,0 +1,73 @@
+"""
+Serves the application with one or more uvicorn worker processes.
+
+Each worker builds the application with `app.main.create_app` and runs its lifespan on its own, so database
+connections, Tron API clients and background tasks are per worker. With SHARED_STATE=manager a state server
+is started here, before the workers, so that wallet cache, rate limits and request coalescing are shared
+between them.
+
+Usage:
+    WORKERS=16 python -m app.run
+"""
+from dotenv import load_dotenv
+import os
+import uvicorn
+from app.logger import setup_logger
+from app.shared_state import start_state_server
+
+logger = setup_logger("run")
+
+load_dotenv()
+
+
+def get_worker_count(value: str) -> int:
+    """
+    Parses the WORKERS setting.
+
+    Args:
+        value (str): A positive number of workers, or "auto" for one worker per CPU core.
+
+    Returns:
+        int: Number of worker processes.
+
+    Raises:
+        ValueError: If the value is neither "auto" nor a positive integer.
+    """
+    if value == "auto":
+        return os.cpu_count() or 1
+    workers = int(value)
+    if workers < 1:
+        raise ValueError("WORKERS must be a positive integer or 'auto'")
+    return workers
+
+
+def main() -> None:
+    workers = get_worker_count(os.getenv("WORKERS", "1"))
+    state_server = None
+    if os.getenv("SHARED_STATE") == "manager" and not os.getenv("SHARED_STATE_ADDRESS"):
+        authkey = os.urandom(32)
+        state_server = start_state_server(authkey=authkey)
+        # Workers are separate processes and read their configuration from the inherited environment.
+        os.environ["SHARED_STATE_ADDRESS"] = "%s:%s" % state_server.address
+        os.environ["SHARED_STATE_AUTHKEY"] = authkey.hex()
+    elif workers > 1 and not os.getenv("SHARED_STATE"):
+        logger.warning("Running %s workers without SHARED_STATE: caches and rate limits are per worker", workers)
+
+    try:
+        uvicorn.run(
+            "app.main:create_app",
+            factory=True,
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", "8000")),
+            workers=workers,
+            timeout_graceful_shutdown=int(os.getenv("SHUTDOWN_TIMEOUT", "30")),
+            timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "5")),
+            backlog=int(os.getenv("BACKLOG", "2048"))
+        )
+    finally:
+        if state_server is not None:
+            state_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
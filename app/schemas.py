@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
+from typing import Literal
 
 
 class WalletRequest(BaseModel):
@@ -26,6 +27,30 @@ class WalletResponse(BaseModel):
     energy: int
 
 
+class WalletBatchRequest(BaseModel):
+    """
+    Pydantic model for validating batch wallet lookup requests.
+
+    Attributes:
+        addresses (list[str]): Tron wallet addresses to query (1 to 1000 items).
+    """
+    addresses: list[str] = Field(min_length=1, max_length=1000)
+
+
+class WalletBatchItem(BaseModel):
+    """
+    Pydantic model for a single result of a batch wallet lookup.
+
+    Attributes:
+        address (str): Tron wallet address as given in the request.
+        wallet (WalletResponse | None): Wallet information if the lookup succeeded.
+        error (str | None): Error description if the lookup failed.
+    """
+    address: str
+    wallet: WalletResponse | None = None
+    error: str | None = None
+
+
 class RequestResponse(BaseModel):
     """
     Pydantic model for the response containing request details.
@@ -52,3 +77,223 @@ class PaginationParams(BaseModel):
     """
     offset: int = Field(default=0, ge=0, description="Number of records to skip")
     limit: int = Field(default=10, ge=1, le=100, description="Maximum number of records to return")
+
+
+class ReadinessResponse(BaseModel):
+    """
+    Pydantic model for the readiness of the instance.
+
+    Attributes:
+        status (str): "ready".
+        warmed (int): Number of wallets loaded into the cache by the startup warm-up.
+    """
+    status: str
+    warmed: int
+
+
+class CacheStatsResponse(BaseModel):
+    """
+    Pydantic model for the wallet cache statistics.
+
+    Attributes:
+        size (int): Number of entries currently held in the local cache.
+        hits (int): Lookups answered with a fresh entry.
+        stale_hits (int): Lookups answered with a stale entry while it was refreshed.
+        misses (int): Lookups that required a call to the Tron API.
+        evictions (int): Entries evicted because the cache was full.
+        refreshes (int): Successful background refreshes.
+        refresh_errors (int): Failed background refreshes.
+    """
+    size: int
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    refreshes: int
+    refresh_errors: int
+
+
+class PoolStatsResponse(BaseModel):
+    """
+    Pydantic model for database connection pool utilization.
+
+    Attributes:
+        pool_size (int): Configured number of persistent connections.
+        checked_out (int): Connections currently in use.
+        checked_in (int): Idle connections in the pool.
+        overflow (int): Connections open beyond the pool size.
+        max_overflow (int): Configured overflow limit.
+        utilization (float): Share of the maximum connection count currently in use.
+    """
+    pool_size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    utilization: float
+
+
+class RequestFilterParams(BaseModel):
+    """
+    Pydantic model for optional request filters in API requests.
+
+    Attributes:
+        wallet_address (str | None): Only return requests for this Tron wallet address.
+        created_from (datetime | None): Only return requests created at or after this time.
+        created_to (datetime | None): Only return requests created before this time.
+    """
+    wallet_address: str | None = Field(default=None, description="Filter by Tron wallet address")
+    created_from: datetime | None = Field(default=None, description="Inclusive lower bound of created_at")
+    created_to: datetime | None = Field(default=None, description="Exclusive upper bound of created_at")
+
+
+class CursorPaginationParams(BaseModel):
+    """
+    Pydantic model for cursor (keyset) pagination parameters in API requests.
+
+    Attributes:
+        cursor (str | None): Opaque cursor returned as `next_cursor` by the previous page (default: first page).
+        limit (int): Maximum number of records to return (default: 10, must be between 1 and 100).
+    """
+    cursor: str | None = Field(default=None, description="Cursor of the page to return")
+    limit: int = Field(default=10, ge=1, le=100, description="Maximum number of records to return")
+
+
+class ExportParams(BaseModel):
+    """
+    Pydantic model for request export parameters.
+
+    Attributes:
+        format (str): "ndjson" (one `RequestResponse` object per line) or "csv" (default: "ndjson").
+        batch_size (int): Number of rows read from the database per chunk (default: 1000, between 100 and 10000).
+    """
+    format: Literal["ndjson", "csv"] = Field(default="ndjson", description="Export format")
+    batch_size: int = Field(default=1000, ge=100, le=10000, description="Number of rows per chunk")
+
+
+class RequestPage(BaseModel):
+    """
+    Pydantic model for a page of requests retrieved with cursor pagination.
+
+    Attributes:
+        items (list[RequestResponse]): Request records, newest first.
+        next_cursor (str | None): Cursor of the next page, or None if this is the last page.
+    """
+    items: list[RequestResponse]
+    next_cursor: str | None = None
+
+
+class HistoryParams(BaseModel):
+    """
+    Pydantic model for wallet history query parameters.
+
+    Attributes:
+        interval (int): Bucket width in seconds (default: 3600, between 60 and 2592000).
+        limit (int): Maximum number of buckets to return, the most recent ones (default: 100, at most 1000).
+        captured_from (datetime | None): Only use snapshots captured at or after this time.
+        captured_to (datetime | None): Only use snapshots captured before this time.
+    """
+    interval: int = Field(default=3600, ge=60, le=2_592_000, description="Bucket width in seconds")
+    limit: int = Field(default=100, ge=1, le=1000, description="Maximum number of buckets to return")
+    captured_from: datetime | None = Field(default=None, description="Inclusive lower bound of captured_at")
+    captured_to: datetime | None = Field(default=None, description="Exclusive upper bound of captured_at")
+
+
+class SeriesStats(BaseModel):
+    """
+    Pydantic model for the aggregate of one wallet value within a history bucket.
+
+    Attributes:
+        min (float): Smallest value in the bucket.
+        max (float): Largest value in the bucket.
+        last (float): Most recent value in the bucket.
+    """
+    min: float
+    max: float
+    last: float
+
+
+class WalletHistoryBucket(BaseModel):
+    """
+    Pydantic model for one time bucket of a wallet's history.
+
+    Attributes:
+        start (datetime): Start of the bucket.
+        samples (int): Number of snapshots in the bucket.
+        balance_trx (SeriesStats): Balance in TRX.
+        bandwidth (SeriesStats): Available bandwidth.
+        energy (SeriesStats): Available energy.
+    """
+    start: datetime
+    samples: int
+    balance_trx: SeriesStats
+    bandwidth: SeriesStats
+    energy: SeriesStats
+
+
+class WalletHistory(BaseModel):
+    """
+    Pydantic model for the response containing a wallet's aggregated history.
+
+    Attributes:
+        address (str): Tron wallet address in base58check form.
+        interval (int): Bucket width in seconds.
+        buckets (list[WalletHistoryBucket]): Buckets with at least one snapshot, oldest first.
+    """
+    address: str
+    interval: int
+    buckets: list[WalletHistoryBucket]
+
+
+class TopAddressesParams(BaseModel):
+    """
+    Pydantic model for top addresses query parameters.
+
+    Attributes:
+        limit (int): Maximum number of addresses to return (default: 10, between 1 and 1000).
+    """
+    limit: int = Field(default=10, ge=1, le=1000, description="Maximum number of addresses to return")
+
+
+class AddressRequestCountResponse(BaseModel):
+    """
+    Pydantic model for the number of requests made for a wallet address.
+
+    Attributes:
+        wallet_address (str): Tron wallet address.
+        request_count (int): Number of requests for the address.
+        last_requested_at (datetime): Time of the latest request for the address.
+    """
+    wallet_address: str
+    request_count: int
+    last_requested_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RequestsPerMinuteParams(BaseModel):
+    """
+    Pydantic model for requests-per-minute query parameters.
+
+    Attributes:
+        limit (int): Maximum number of minutes to return, the most recent ones (default: 60, at most 10080).
+        created_from (datetime | None): Only count minutes starting at or after this time.
+        created_to (datetime | None): Only count minutes starting before this time.
+    """
+    limit: int = Field(default=60, ge=1, le=10080, description="Maximum number of minutes to return")
+    created_from: datetime | None = Field(default=None, description="Inclusive lower bound of the minute")
+    created_to: datetime | None = Field(default=None, description="Exclusive upper bound of the minute")
+
+
+class MinuteRequestCountResponse(BaseModel):
+    """
+    Pydantic model for the number of requests made within a minute.
+
+    Attributes:
+        minute (datetime): Start of the minute (UTC).
+        request_count (int): Number of requests created within the minute.
+    """
+    minute: datetime
+    request_count: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,299 @@
+from abc import ABC, abstractmethod
+from multiprocessing.managers import BaseManager
+from dotenv import load_dotenv
+from typing import Any, Callable
+import asyncio
+import os
+import threading
+import time
+from app.logger import setup_logger
+
+logger = setup_logger("shared_state")
+
+load_dotenv()
+
+SHARED_STATE_MODES = ("", "local", "manager")
+
+
+class StateStore:
+    """
+    Thread-safe key-value store with expiry, token buckets and leases.
+
+    Every operation is atomic, so the store can be served to several worker processes by `StateManager`
+    as well as used in-process. Values must be picklable when the store is shared between processes.
+
+    Expired values and token buckets that have refilled completely are removed by a sweep that runs at most
+    every `sweep_interval` seconds, piggybacking on writes, so the store does not grow with the number of
+    distinct keys ever used (addresses, flights, client IPs).
+
+    Args:
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+        sweep_interval (float): Minimum seconds between sweeps.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sweep_interval: float = 60.0):
+        self._clock = clock
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._values: dict[str, tuple[Any, float | None]] = {}
+        # Bucket name -> (tokens, last update, rate, burst).
+        self._buckets: dict[str, tuple[float, float, float, int]] = {}
+        self._swept_at = clock()
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._swept_at >= self.sweep_interval:
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        expired = [key for key, (_, expires_at) in self._values.items() if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._values[key]
+        # A full bucket holds no information: it is recreated full on its next use.
+        idle = [
+            key for key, (tokens, updated, rate, burst) in self._buckets.items()
+            if tokens + (now - updated) * rate >= burst
+        ]
+        for key in idle:
+            del self._buckets[key]
+        self._swept_at = now
+        return len(expired) + len(idle)
+
+    def sweep(self) -> int:
+        """
+        Removes expired values and leases and fully refilled token buckets now.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def _get(self, key: str) -> Any | None:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= self._clock():
+            del self._values[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            self._values[key] = (value, now + ttl if ttl is not None else None)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def take_token(self, key: str, rate: float, burst: int) -> float:
+        """
+        Takes a token from the bucket `key`, or tells how long until one is available.
+
+        Args:
+            key (str): Bucket name.
+            rate (float): Tokens added per second.
+            burst (int): Bucket capacity.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds to wait before trying again.
+        """
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            tokens, updated, _, _ = self._buckets.get(key, (float(burst), now, rate, burst))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now, rate, burst)
+                return 0.0
+            self._buckets[key] = (tokens, now, rate, burst)
+            return (1 - tokens) / rate
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        """
+        Takes the lease `key` for `ttl` seconds unless someone else holds it.
+
+        Args:
+            key (str): Lease name.
+            ttl (float): Seconds after which the lease expires even if not released.
+
+        Returns:
+            bool: True if the lease was taken.
+        """
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            if self._get(key) is not None:
+                return False
+            self._values[key] = (True, now + ttl)
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values) + len(self._buckets)
+
+
+class SharedState(ABC):
+    """
+    Asynchronous interface to state shared by all workers (caches, rate limits, request coalescing).
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Returns the value stored under `key`, or None if it is absent or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Stores `value` under `key`, optionally expiring after `ttl` seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Removes the value or lease stored under `key`, if any."""
+
+    @abstractmethod
+    async def take_token(self, key: str, rate: float, burst: int) -> float:
+        """Takes a token from the bucket `key`; returns 0 or the seconds to wait (see `StateStore.take_token`)."""
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl: float) -> bool:
+        """Takes the lease `key` for `ttl` seconds; returns False if it is held elsewhere."""
+
+
+class LocalSharedState(SharedState):
+    """
+    In-process shared state, intended for tests and single-worker deployments.
+
+    Args:
+        store (StateStore, optional): Store to use; a new one by default.
+    """
+
+    def __init__(self, store: StateStore | None = None):
+        self.store = store or StateStore()
+
+    async def get(self, key: str) -> Any | None:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.store.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    async def take_token(self, key: str, rate: float, burst: int) -> float:
+        return self.store.take_token(key, rate, burst)
+
+    async def acquire(self, key: str, ttl: float) -> bool:
+        return self.store.acquire(key, ttl)
+
+
+class StateManager(BaseManager):
+    """
+    Multiprocessing manager serving one `StateStore` to all worker processes.
+    """
+
+
+_server_store = StateStore()
+
+
+def _get_server_store() -> StateStore:
+    return _server_store
+
+
+StateManager.register("store", callable=_get_server_store)
+
+
+class ManagerSharedState(SharedState):
+    """
+    Shared state kept in a `StateManager` server process and reached over a local socket.
+
+    Manager calls block, so they run in a worker thread to keep the event loop free.
+
+    Args:
+        address (tuple[str, int]): Address of the running manager.
+        authkey (bytes): Authentication key of the manager.
+    """
+
+    def __init__(self, address: tuple[str, int], authkey: bytes):
+        self.address = address
+        self._authkey = authkey
+        self._local = threading.local()
+
+    def _store(self):
+        # Manager proxies are not safe to share between threads, so each thread connects on its own.
+        store = getattr(self._local, "store", None)
+        if store is None:
+            manager = StateManager(address=self.address, authkey=self._authkey)
+            manager.connect()
+            store = self._local.store = manager.store()
+        return store
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        return await asyncio.to_thread(lambda: getattr(self._store(), method)(*args))
+
+    async def get(self, key: str) -> Any | None:
+        return await self._call("get", key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self._call("set", key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._call("delete", key)
+
+    async def take_token(self, key: str, rate: float, burst: int) -> float:
+        return await self._call("take_token", key, rate, burst)
+
+    async def acquire(self, key: str, ttl: float) -> bool:
+        return await self._call("acquire", key, ttl)
+
+
+def start_state_server(host: str = "127.0.0.1", port: int = 0, authkey: bytes | None = None) -> StateManager:
+    """
+    Starts a `StateManager` server process for the workers to connect to.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        authkey (bytes, optional): Authentication key; random by default.
+
+    Returns:
+        StateManager: The started manager; its `address` is passed to the workers.
+    """
+    manager = StateManager(address=(host, port), authkey=authkey or os.urandom(16))
+    manager.start()
+    logger.info("Shared state server started at %s:%s", *manager.address)
+    return manager
+
+
+_shared_state: SharedState | None = None
+
+
+def get_shared_state() -> SharedState | None:
+    """
+    Returns the shared state configured by the environment, creating it on first use.
+
+    Returns:
+        SharedState | None: None when SHARED_STATE is empty (state is per process), a `LocalSharedState`
+            for "local", or a `ManagerSharedState` for "manager".
+
+    Raises:
+        ValueError: If SHARED_STATE is unknown or "manager" is used without SHARED_STATE_ADDRESS.
+    """
+    global _shared_state
+    mode = os.getenv("SHARED_STATE", "")
+    if mode not in SHARED_STATE_MODES:
+        raise ValueError(f"SHARED_STATE must be one of {SHARED_STATE_MODES}")
+    if _shared_state is None and mode == "local":
+        _shared_state = LocalSharedState()
+    elif _shared_state is None and mode == "manager":
+        address = os.getenv("SHARED_STATE_ADDRESS")
+        if not address:
+            raise ValueError("SHARED_STATE_ADDRESS is not configured")
+        host, port = address.rsplit(":", 1)
+        _shared_state = ManagerSharedState((host, int(port)), bytes.fromhex(os.getenv("SHARED_STATE_AUTHKEY", "")))
+    return _shared_state
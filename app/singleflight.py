@@ -0,0 +1,105 @@
+from typing import Any, Awaitable, Callable
+import asyncio
+from app.shared_state import SharedState
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing the same key into a single execution.
+
+    The first caller for a key starts the call; every caller arriving while it is in flight awaits the
+    same task and receives the same result or exception. The call runs as its own task, so a cancelled
+    caller does not cancel the work the other callers are waiting on.
+
+    Attributes:
+        calls (int): Number of calls actually executed.
+        shared (int): Number of callers that joined an in-flight call instead of starting a new one.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `fn` unless a call for `key` is already in flight, and returns its result.
+
+        Args:
+            key (str): Deduplication key.
+            fn (Callable[[], Awaitable[Any]]): Coroutine factory performing the call.
+
+        Returns:
+            Any: The result of the shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away.
+            task.exception()
+
+
+class SharedSingleFlight(SingleFlight):
+    """
+    Coalesces calls sharing the same key across worker processes.
+
+    Within a process calls are coalesced like in `SingleFlight`. Across processes, the first worker takes a
+    lease in the shared state and runs the call; other workers poll for the result it publishes and take
+    over the call if the lease is released or expires without a result (e.g. the call failed).
+
+    Args:
+        state (SharedState): State shared by all workers.
+        lease_ttl (float): Seconds after which an unreleased lease expires (should exceed the call duration).
+        result_ttl (float): Seconds a published result is kept for waiting workers.
+        poll_interval (float): Seconds between checks for a published result.
+
+    Attributes:
+        remote_shared (int): Number of calls answered with a result published by another worker.
+    """
+
+    def __init__(self, state: SharedState, lease_ttl: float = 10.0, result_ttl: float = 1.0,
+                 poll_interval: float = 0.05):
+        super().__init__()
+        self.state = state
+        self.lease_ttl = lease_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.remote_shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await super().do(key, lambda: self._do_shared(key, fn))
+
+    async def _do_shared(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lease_key, result_key = f"singleflight:lease:{key}", f"singleflight:result:{key}"
+        if not await self.state.acquire(lease_key, self.lease_ttl):
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                result = await self.state.get(result_key)
+                if result is not None:
+                    self.remote_shared += 1
+                    return result
+                if await self.state.acquire(lease_key, self.lease_ttl):
+                    break
+        try:
+            result = await fn()
+            await self.state.set(result_key, result, self.result_ttl)
+            return result
+        finally:
+            await self.state.delete(lease_key)
@@ -0,0 +1,113 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import OrderedDict
+from datetime import datetime, UTC
+from dotenv import load_dotenv
+from typing import Callable
+import os
+import time
+from app import crud, database
+from app.cache import CacheBackend, CacheEntry
+from app.request_log import BatchWriter
+from app.logger import setup_logger
+
+logger = setup_logger("snapshots")
+
+load_dotenv()
+
+
+class SnapshotWriter(BatchWriter):
+    """
+    Batch writer persisting fetched wallet information as `WalletSnapshot` rows (see `BatchWriter`).
+    """
+    name = "Snapshot writer"
+
+    async def record(self, wallet_address: str, wallet_info: dict) -> None:
+        """
+        Records wallet information fetched now.
+
+        Args:
+            wallet_address (str): Tron wallet address in base58check form.
+            wallet_info (dict): Dictionary containing balance_trx, bandwidth and energy.
+        """
+        await self._put_many([(wallet_address, datetime.now(UTC), wallet_info)])
+
+    async def _write(self, db: AsyncSession, records: list[tuple[str, datetime, dict]]) -> None:
+        await crud.create_snapshots(db, records)
+
+
+class SnapshotCacheBackend(CacheBackend):
+    """
+    Durable cache level backed by the wallet snapshot table.
+
+    Every value stored in the wallet cache is recorded as a snapshot. On a cache miss, the latest snapshot
+    is served if it is at most `max_age` seconds old, so recently fetched wallets survive restarts and are
+    shared by all instances without another Tron API call. Snapshots captured before a key was deleted
+    (e.g. by the block follower) are not served, so invalidation is not undone by this level.
+
+    Args:
+        writer (SnapshotWriter): Writer recording snapshots; its session factory is also used for reads.
+        max_age (float): Seconds a snapshot may be served from; 0 disables reads.
+        clock (Callable[[], float], optional): Wall-clock time source, overridable in tests.
+    """
+
+    def __init__(self, writer: SnapshotWriter, max_age: float = 0.0, clock: Callable[[], float] = time.time):
+        self.writer = writer
+        self.max_age = max_age
+        self._clock = clock
+        # Key -> wall-clock time of its last deletion, oldest first.
+        self._invalidated: OrderedDict[str, float] = OrderedDict()
+
+    async def get(self, key: str) -> CacheEntry | None:
+        if self.max_age <= 0:
+            return None
+        captured_from = self._clock() - self.max_age
+        invalidated_at = self._invalidated.get(key)
+        if invalidated_at is not None:
+            captured_from = max(captured_from, invalidated_at)
+        try:
+            async with self.writer.session_factory() as db:
+                snapshot = await crud.get_latest_snapshot(db, key, datetime.fromtimestamp(captured_from, UTC))
+        except Exception as e:
+            # The snapshot table is an optimisation; fall through to the Tron API if it is unavailable.
+            logger.error("Failed to read latest snapshot for address=%s: %s", key, e)
+            return None
+        if snapshot is None:
+            return None
+        captured_at = snapshot.captured_at
+        if captured_at.tzinfo is None:
+            captured_at = captured_at.replace(tzinfo=UTC)
+        fresh_until = captured_at.timestamp() + self.max_age
+        return CacheEntry(
+            value={"balance_trx": snapshot.balance_trx, "bandwidth": snapshot.bandwidth, "energy": snapshot.energy},
+            fresh_until=fresh_until,
+            stale_until=fresh_until
+        )
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.writer.record(key, entry.value)
+
+    async def delete(self, key: str) -> None:
+        # Snapshots are history and are kept; reads of `key` skip those captured until now instead.
+        if self.max_age <= 0:
+            return
+        now = self._clock()
+        self._invalidated[key] = now
+        self._invalidated.move_to_end(key)
+        # Older deletions no longer matter: snapshots captured before them are past `max_age` anyway.
+        while self._invalidated and next(iter(self._invalidated.values())) <= now - self.max_age:
+            self._invalidated.popitem(last=False)
+
+
+SNAPSHOTS_ENABLED = os.getenv("WALLET_SNAPSHOTS", "true").lower() == "true"
+
+writer = SnapshotWriter(
+    database.async_session,
+    max_queue_size=int(os.getenv("WALLET_SNAPSHOT_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("WALLET_SNAPSHOT_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("WALLET_SNAPSHOT_FLUSH_INTERVAL", "1.0")),
+    # Snapshots are best effort: by default, never slow a request down because the buffer is full.
+    overflow_policy=os.getenv("WALLET_SNAPSHOT_OVERFLOW_POLICY", "drop"),
+    buffered=os.getenv("WALLET_SNAPSHOT_BUFFERED", "true").lower() == "true"
+)
+
+backend = SnapshotCacheBackend(writer, max_age=float(os.getenv("WALLET_SNAPSHOT_MAX_AGE", "0")))
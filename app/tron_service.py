@@ -1,23 +1,283 @@
-from tronpy import AsyncTron
-from tronpy.exceptions import AddressNotFound, ApiError
-from tronpy.providers import AsyncHTTPProvider
 from dotenv import load_dotenv
+from typing import Any, AsyncIterator, Awaitable
 import os
 import asyncio
+from app.cache import (
+    TTLCache, CacheBackend, InMemoryCacheBackend, SharedStateCacheBackend, TieredCacheBackend, CacheStats
+)
+from app.singleflight import SingleFlight, SharedSingleFlight
+from app.shared_state import get_shared_state
+from app.upstream import UpstreamPool, create_upstream_pool, UpstreamTimeoutError, UpstreamUnavailableError
+from app.metrics import timed
+from app import snapshots
+from app import address as tron_address
 from app.logger import setup_logger
 
 logger = setup_logger("tron_service")
 
 load_dotenv()
 
-TRON_API_KEY = os.getenv("TRON_API_KEY")
+TRON_API_KEYS = [
+    key.strip() for key in os.getenv("TRON_API_KEYS", os.getenv("TRON_API_KEY", "")).split(",") if key.strip()
+]
+TRON_CALL_TIMEOUT = float(os.getenv("TRON_CALL_TIMEOUT", "10"))
+TRON_MAX_RETRIES = int(os.getenv("TRON_MAX_RETRIES", "2"))
 
-if not TRON_API_KEY:
-    raise ValueError("TRON_API_KEY is not configured")
-tron_client = AsyncTron(AsyncHTTPProvider(api_key=TRON_API_KEY, timeout=30))
+shared_state = get_shared_state()
+
+
+class TronNotConfiguredError(RuntimeError):
+    """
+    Raised when the Tron API cannot be called because TRON_API_KEY is not configured.
+    """
+
+# Created on first use by `get_upstream_pool`; tests and benchmarks may assign their own pool.
+upstream_pool: UpstreamPool | None = None
+
+
+def get_upstream_pool() -> UpstreamPool:
+    """
+    Returns the Tron API client pool, creating it from the environment on first use.
+
+    Returns:
+        UpstreamPool: The pool used for all Tron API calls.
+
+    Raises:
+        TronNotConfiguredError: If TRON_API_KEY is not configured.
+
+    Notes:
+        - tronpy and its dependencies are imported here rather than when the application is imported, so
+          processes and requests that never contact the Tron API do not load them.
+    """
+    global upstream_pool
+    if upstream_pool is None:
+        if not TRON_API_KEYS:
+            raise TronNotConfiguredError("TRON_API_KEY is not configured")
+        upstream_pool = create_upstream_pool(
+            TRON_API_KEYS,
+            endpoints=[url.strip() for url in os.getenv("TRON_API_ENDPOINTS", "").split(",") if url.strip()] or None,
+            rate_limit=float(os.getenv("TRON_RATE_LIMIT", "0")),
+            burst=int(os.getenv("TRON_RATE_BURST", "10")),
+            http_timeout=float(os.getenv("TRON_HTTP_TIMEOUT", "10")),
+            max_connections=int(os.getenv("TRON_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("TRON_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            failure_threshold=int(os.getenv("TRON_BREAKER_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("TRON_BREAKER_RESET_TIMEOUT", "30")),
+            strategy=os.getenv("TRON_CLIENT_STRATEGY", "round_robin"),
+            call_timeout=TRON_CALL_TIMEOUT,
+            max_retries=TRON_MAX_RETRIES,
+            shared_state=shared_state
+        )
+    return upstream_pool
+
+
+async def close_upstream_pool() -> None:
+    """
+    Closes the Tron API client pool if it was created; the next call creates a new one.
+    """
+    global upstream_pool
+    if upstream_pool is not None:
+        await upstream_pool.close()
+        upstream_pool = None
+
+
+WALLET_BATCH_CONCURRENCY = int(os.getenv("WALLET_BATCH_CONCURRENCY", "20"))
+
+
+def _create_cache_backend(kind: str, with_snapshots: bool) -> CacheBackend | None:
+    """
+    Creates the wallet cache backend levels behind the local LRU.
+
+    Args:
+        kind (str): Shared level selected by WALLET_CACHE_SHARED_BACKEND: "memory" (process-local stand-in),
+            "shared" (state shared by all workers) or empty.
+        with_snapshots (bool): Whether to record values in, and serve recent values from, wallet snapshots.
+
+    Returns:
+        CacheBackend | None: The backend, or None to use only the local LRU.
+
+    Raises:
+        ValueError: If `kind` is "shared" but SHARED_STATE is not configured, or `kind` is unknown.
+    """
+    backends = []
+    if kind == "memory":
+        backends.append(InMemoryCacheBackend())
+    elif kind == "shared":
+        if shared_state is None:
+            raise ValueError("WALLET_CACHE_SHARED_BACKEND=shared requires SHARED_STATE")
+        backends.append(SharedStateCacheBackend(shared_state, prefix="wallet:"))
+    elif kind:
+        raise ValueError("WALLET_CACHE_SHARED_BACKEND must be one of 'memory', 'shared' or empty")
+    if with_snapshots:
+        backends.append(snapshots.backend)
+    if len(backends) > 1:
+        return TieredCacheBackend(backends)
+    return backends[0] if backends else None
+
+
+wallet_cache = TTLCache(
+    maxsize=int(os.getenv("WALLET_CACHE_MAX_SIZE", "10000")),
+    ttl=float(os.getenv("WALLET_CACHE_TTL", "10")),
+    stale_ttl=float(os.getenv("WALLET_CACHE_STALE_TTL", "30")),
+    backend=_create_cache_backend(os.getenv("WALLET_CACHE_SHARED_BACKEND", ""), snapshots.SNAPSHOTS_ENABLED)
+)
+
+inflight_lookups = (
+    SharedSingleFlight(shared_state, lease_ttl=TRON_CALL_TIMEOUT * (TRON_MAX_RETRIES + 1))
+    if shared_state is not None else SingleFlight()
+)
+
+
+def normalize_address(address: str) -> str:
+    """
+    Converts a Tron address in any accepted format to its base58check form.
+
+    Args:
+        address (str): Tron wallet address in base58check or hex format.
+
+    Returns:
+        str: The base58check representation of the address.
+
+    Raises:
+        ValueError: If the address is invalid.
+
+    Notes:
+        - Validation is memoized (see `app.address.normalize_address`).
+    """
+    try:
+        return tron_address.normalize_address(address)
+    except ValueError:
+        logger.error("Invalid address: %s", address)
+        raise ValueError("Invalid address")
 
 
 async def get_wallet_info(address: str) -> dict:
+    """
+    Retrieves wallet information, serving it from the wallet cache when possible.
+
+    Args:
+        address (str): Tron wallet address to query.
+
+    Returns:
+        dict: Dictionary containing balance_trx, bandwidth and energy (see `fetch_wallet_info`).
+
+    Raises:
+        ValueError: If the wallet information cannot be fetched from the Tron network.
+        UpstreamUnavailableError: If the Tron API is unavailable and nothing is cached for the address.
+
+    Notes:
+        - Fresh cache entries are returned without contacting the Tron API.
+        - Stale entries are returned immediately while a background task refreshes them.
+        - Failed lookups are not cached.
+        - Fetched values are recorded as wallet snapshots; a snapshot younger than WALLET_SNAPSHOT_MAX_AGE
+          is served on a cache miss without contacting the Tron API.
+        - Concurrent lookups of the same normalized address share a single upstream fetch.
+        - If the Tron API is unavailable (all circuit breakers open) or times out, the last known value is served.
+    """
+    key = normalize_address(address)
+    try:
+        wallet_info = await wallet_cache.get_or_load(
+            key, lambda: inflight_lookups.do(key, lambda: fetch_wallet_info(key))
+        )
+    except UpstreamUnavailableError:
+        wallet_info = wallet_cache.peek(key)
+        if wallet_info is None:
+            raise
+        logger.warning("Tron API unavailable, serving last known wallet info for address=%s", key)
+    return dict(wallet_info)
+
+
+async def refresh_wallet_info(address: str) -> dict:
+    """
+    Fetches current wallet information from the Tron network and stores it in the wallet cache.
+
+    Args:
+        address (str): Tron wallet address to query.
+
+    Returns:
+        dict: Dictionary containing balance_trx, bandwidth and energy (see `fetch_wallet_info`).
+
+    Raises:
+        ValueError: If the address is invalid or the wallet information cannot be fetched.
+        UpstreamUnavailableError: If the Tron API is unavailable.
+
+    Notes:
+        - Unlike `get_wallet_info`, a fresh cache entry does not prevent the upstream call; used by pollers
+          that must observe changes. Concurrent fetches of the same address are still shared.
+    """
+    key = normalize_address(address)
+    wallet_info = await inflight_lookups.do(key, lambda: fetch_wallet_info(key))
+    await wallet_cache.set(key, wallet_info)
+    return dict(wallet_info)
+
+
+async def iter_wallet_info(
+        addresses: list[str],
+        concurrency: int = WALLET_BATCH_CONCURRENCY
+) -> AsyncIterator[tuple[str, dict | None, str | None]]:
+    """
+    Looks up several wallets with bounded concurrency, yielding results as they complete.
+
+    Args:
+        addresses (list[str]): Tron wallet addresses to query.
+        concurrency (int): Maximum number of lookups in flight at once.
+
+    Yields:
+        tuple[str, dict | None, str | None]: The address, its wallet information (or None) and an error
+            description (or None if the lookup succeeded).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(address: str) -> tuple[str, dict | None, str | None]:
+        async with semaphore:
+            try:
+                return address, await get_wallet_info(address), None
+            except (ValueError, UpstreamUnavailableError) as e:
+                return address, None, str(e)
+
+    tasks = [asyncio.create_task(lookup(address)) for address in addresses]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def get_cache_stats() -> CacheStats:
+    """
+    Returns the current wallet cache counters.
+
+    Returns:
+        CacheStats: Hit, miss and eviction counters of the wallet cache.
+    """
+    return wallet_cache.stats
+
+
+async def _gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    Runs awaitables concurrently and cancels the remaining ones as soon as one fails.
+
+    Args:
+        *aws (Awaitable[Any]): Awaitables to run.
+
+    Returns:
+        list[Any]: Results in the order the awaitables were given.
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def fetch_wallet_info(address: str) -> dict:
     """
     Retrieves wallet information from the Tron network.
 
@@ -33,12 +293,25 @@ async def get_wallet_info(address: str) -> dict:
     Raises:
         ValueError:
             - If the address is invalid.
-            - If a network error or timeout occurs while contacting the Tron API.
+            - If a network error occurs while contacting the Tron API.
             - If an unexpected error occurs during the API call.
+        TronNotConfiguredError: If TRON_API_KEY is not configured.
+        UpstreamTimeoutError: If the Tron API did not answer in time (a congestion signal for callers).
+        UpstreamUnavailableError: If all Tron API clients are unavailable (circuit open).
+
+    Notes:
+        - Account and resource information are requested concurrently through the upstream pool, which
+          applies rate limiting, per-attempt timeouts (TRON_CALL_TIMEOUT) and retries of transient errors.
+        - If one call fails (e.g. with AddressNotFound), the other one is cancelled.
     """
+    pool = get_upstream_pool()
+    from tronpy.exceptions import AddressNotFound, ApiError
+
     try:
-        account = await tron_client.get_account(address)
-        resources = await tron_client.get_account_resource(address)
+        account, resources = await _gather_or_cancel(
+            timed("upstream_account", pool.call(lambda client: client.get_account(address))),
+            timed("upstream_resource", pool.call(lambda client: client.get_account_resource(address)))
+        )
         balance = account.get("balance", 0) / 1_000_000
         bandwidth = resources["freeNetLimit"] - resources.get("freeNetUsed", 0) + resources.get("NetLimit",
                                                                                                 0) - resources.get(
@@ -50,15 +323,18 @@ async def get_wallet_info(address: str) -> dict:
             "bandwidth": bandwidth,
             "energy": energy
         }
+    except UpstreamUnavailableError:
+        logger.error("Tron API unavailable (circuit open) for address=%s", address)
+        raise
     except AddressNotFound:
-        logger.error(f"Invalid address: {address}")
+        logger.error("Invalid address: %s", address)
         raise ValueError("Invalid address")
     except ApiError as e:
-        logger.error(f"Network error while contacting Tron API for address={address}: {str(e)}")
+        logger.error("Network error while contacting Tron API for address=%s: %s", address, e)
         raise ValueError(f"Network error while contacting Tron API: {str(e)}")
     except asyncio.TimeoutError:
-        logger.error(f"Request to Tron API timed out for address={address}")
-        raise ValueError("Request to Tron API timed out")
+        logger.error("Request to Tron API timed out for address=%s", address)
+        raise UpstreamTimeoutError("Request to Tron API timed out")
     except Exception as e:
-        logger.error(f"Unexpected error while contacting Tron API for address={address}: {str(e)}")
+        logger.error("Unexpected error while contacting Tron API for address=%s: %s", address, e)
         raise ValueError(f"Unexpected error while contacting Tron API: {str(e)}")
@@ -0,0 +1,391 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+import asyncio
+import itertools
+import random
+import time
+import httpx
+from app.logger import setup_logger
+from app.metrics import upstream_calls
+from app.shared_state import SharedState
+
+if TYPE_CHECKING:
+    # tronpy loads a large import graph; it is imported when the first pool is created.
+    from tronpy import AsyncTron
+
+logger = setup_logger("upstream")
+
+T = TypeVar("T")
+
+DEFAULT_ENDPOINT = "https://api.trongrid.io/"
+
+STRATEGIES = ("round_robin", "least_loaded")
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    Raised when no upstream client may be called because all circuit breakers are open.
+    """
+
+
+class UpstreamTimeoutError(UpstreamUnavailableError):
+    """
+    Raised when the Tron API did not answer within the call timeout, after retries.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Args:
+        rate (float): Tokens added per second (sustained requests per second). 0 disables limiting.
+        burst (int): Maximum number of tokens, i.e. the largest allowed burst.
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            bool: True if a token was taken, False if the caller would have to wait.
+        """
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        """
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SharedTokenBucket:
+    """
+    Token bucket kept in the state shared by all workers, so a rate limit holds across processes.
+
+    Args:
+        state (SharedState): The shared state.
+        key (str): Bucket name (e.g. per API key).
+        rate (float): Tokens added per second. 0 disables limiting.
+        burst (int): Maximum number of tokens.
+    """
+
+    def __init__(self, state: SharedState, key: str, rate: float, burst: int):
+        self.state = state
+        self.key = key
+        self.rate = rate
+        self.burst = max(burst, 1)
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        """
+        if self.rate <= 0:
+            return
+        while (wait := await self.state.take_token(self.key, self.rate, self.burst)) > 0:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that stops calling an upstream after repeated failures.
+
+    The breaker opens after `failure_threshold` consecutive failures. While open, calls are rejected
+    until `reset_timeout` seconds pass; then a single trial call is let through (half-open) and its
+    outcome closes or re-opens the breaker.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before a trial call.
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """
+        Returns "closed", "open" or "half_open".
+        """
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Returns whether a call may be made now, reserving the trial call when half-open.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Gives up a reserved trial call without recording an outcome, so the next call can make the trial.
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+
+@dataclass
+class UpstreamClient:
+    """
+    A Tron API client together with its own rate limiter and circuit breaker.
+
+    Attributes:
+        name (str): Human-readable identifier used in logs (endpoint and masked API key).
+        tron (AsyncTron): The underlying tronpy client.
+        limiter (TokenBucket | SharedTokenBucket): Rate limiter for this API key.
+        breaker (CircuitBreaker): Circuit breaker for this client.
+        inflight (int): Number of calls currently in progress.
+    """
+    name: str
+    tron: "AsyncTron"
+    limiter: TokenBucket | SharedTokenBucket = field(default_factory=lambda: TokenBucket(rate=0, burst=1))
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    inflight: int = 0
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Tells whether an upstream error is worth retrying.
+
+    Args:
+        error (BaseException): Error raised by an upstream call.
+
+    Returns:
+        bool: True for API errors, timeouts, transport errors and 429/5xx responses.
+    """
+    from tronpy.exceptions import ApiError
+
+    if isinstance(error, (ApiError, asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class UpstreamPool:
+    """
+    Pool of Tron API clients with client selection, retries and fail-fast behaviour.
+
+    Args:
+        clients (list[UpstreamClient]): Clients to spread calls over (e.g. one per API key).
+        strategy (str): "round_robin" or "least_loaded" (fewest calls in flight).
+        call_timeout (float): Seconds allowed for a single attempt.
+        max_retries (int): Retries of transient failures after the first attempt.
+        backoff_base (float): Base delay in seconds for exponential backoff.
+        backoff_max (float): Upper bound of a single backoff delay in seconds.
+    """
+
+    def __init__(
+            self,
+            clients: list[UpstreamClient],
+            strategy: str = "round_robin",
+            call_timeout: float = 10.0,
+            max_retries: int = 2,
+            backoff_base: float = 0.1,
+            backoff_max: float = 2.0
+    ):
+        if not clients:
+            raise ValueError("At least one upstream client is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        self.clients = clients
+        self.strategy = strategy
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._round_robin = itertools.cycle(range(len(clients)))
+
+    @property
+    def healthy(self) -> bool:
+        """
+        Returns whether at least one client's circuit breaker is not open.
+        """
+        return any(client.breaker.state != "open" for client in self.clients)
+
+    def _select(self) -> UpstreamClient:
+        if self.strategy == "least_loaded":
+            candidates = sorted(self.clients, key=lambda client: client.inflight)
+        else:
+            start = next(self._round_robin)
+            candidates = self.clients[start:] + self.clients[:start]
+        for client in candidates:
+            if client.breaker.allow():
+                return client
+        upstream_calls.inc("none", "rejected")
+        raise UpstreamUnavailableError("All Tron API clients are unavailable (circuit open)")
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def call(self, fn: Callable[["AsyncTron"], Awaitable[T]]) -> T:
+        """
+        Calls the Tron API through a selected client, retrying transient failures.
+
+        Args:
+            fn (Callable[[AsyncTron], Awaitable[T]]): Function issuing the request with a given client.
+
+        Returns:
+            T: The result of `fn`.
+
+        Raises:
+            UpstreamUnavailableError: If every client's circuit breaker is open.
+            Exception: The last error if all attempts failed, or any non-transient error immediately.
+        """
+        attempt = 0
+        while True:
+            client = self._select()
+            # No await since `_select`, so the state is the one the breaker allowed the call in.
+            trial = client.breaker.state == "half_open"
+            try:
+                await client.limiter.acquire()
+            except BaseException:
+                if trial:
+                    client.breaker.release_trial()
+                raise
+            client.inflight += 1
+            try:
+                result = await asyncio.wait_for(fn(client.tron), self.call_timeout)
+            except asyncio.CancelledError:
+                # The outcome is unknown; without this a cancelled trial would keep the breaker half-open forever.
+                if trial:
+                    client.breaker.release_trial()
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    # The upstream answered (e.g. AddressNotFound), so it is healthy.
+                    upstream_calls.inc(client.name, "error")
+                    client.breaker.record_success()
+                    raise
+                upstream_calls.inc(client.name, "transient_error")
+                client.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning("Transient error from %s (attempt %s): %r", client.name, attempt + 1, e)
+            else:
+                upstream_calls.inc(client.name, "success")
+                client.breaker.record_success()
+                return result
+            finally:
+                client.inflight -= 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def close(self) -> None:
+        """
+        Closes the HTTP clients of all upstream clients.
+        """
+        await asyncio.gather(*(client.tron.close() for client in self.clients))
+
+
+def create_upstream_pool(
+        api_keys: list[str],
+        endpoints: list[str] | None = None,
+        rate_limit: float = 0.0,
+        burst: int = 1,
+        http_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        shared_state: SharedState | None = None,
+        **pool_options: Any
+) -> UpstreamPool:
+    """
+    Builds an upstream pool with one client per API key and endpoint.
+
+    Args:
+        api_keys (list[str]): TronGrid API keys.
+        endpoints (list[str], optional): Base URLs of the Tron HTTP API (default: TronGrid).
+        rate_limit (float): Requests per second allowed per client (0 disables limiting).
+        burst (int): Burst size of each client's token bucket.
+        http_timeout (float): HTTP timeout of the underlying httpx client in seconds.
+        max_connections (int): Maximum open connections per client.
+        max_keepalive_connections (int): Maximum idle keep-alive connections per client.
+        keepalive_expiry (float): Seconds an idle keep-alive connection is kept.
+        failure_threshold (int): Consecutive failures that open a client's circuit breaker.
+        reset_timeout (float): Seconds a circuit breaker stays open before a trial call.
+        shared_state (SharedState, optional): If given, rate limits are enforced across all workers.
+        **pool_options (Any): Extra keyword arguments for `UpstreamPool`.
+
+    Returns:
+        UpstreamPool: The configured pool.
+    """
+    from tronpy import AsyncTron
+    from tronpy.providers import AsyncHTTPProvider
+    from tronpy.version import VERSION as TRONPY_VERSION
+
+    clients = []
+    for endpoint in endpoints or [DEFAULT_ENDPOINT]:
+        for api_key in api_keys:
+            http_client = httpx.AsyncClient(
+                headers={"User-Agent": f"Tronpy/{TRONPY_VERSION}", "Tron-Pro-Api-Key": api_key},
+                timeout=httpx.Timeout(http_timeout),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry
+                )
+            )
+            provider = AsyncHTTPProvider(endpoint_uri=endpoint, timeout=http_timeout, client=http_client)
+            clients.append(UpstreamClient(
+                name=f"{endpoint} key=...{api_key[-4:]}",
+                tron=AsyncTron(provider),
+                limiter=(
+                    SharedTokenBucket(shared_state, f"ratelimit:{endpoint}:{api_key}", rate=rate_limit, burst=burst)
+                    if shared_state is not None else TokenBucket(rate=rate_limit, burst=burst)
+                ),
+                breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+            ))
+    return UpstreamPool(clients, **pool_options)
@@ -0,0 +1,247 @@
+from dotenv import load_dotenv
+from typing import Awaitable, Callable
+import asyncio
+import os
+import time
+from app import tron_service
+from app.logger import setup_logger
+
+logger = setup_logger("watch")
+
+load_dotenv()
+
+WATCH_KEEPALIVE = float(os.getenv("WATCH_KEEPALIVE", "15"))
+
+
+class Subscription:
+    """
+    A subscriber's set of watched addresses and its buffer of pending updates.
+
+    Updates are dicts with `address`, `wallet` and `error` keys (the shape of `schemas.WalletBatchItem`).
+    If the subscriber reads slower than updates arrive, the oldest pending update is dropped.
+
+    Args:
+        max_pending (int): Maximum number of buffered updates.
+    """
+
+    def __init__(self, max_pending: int = 100):
+        self.addresses: set[str] = set()
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    def push(self, update: dict) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(update)
+
+    async def get(self) -> dict:
+        """
+        Waits for the next update.
+
+        Returns:
+            dict: The update.
+        """
+        return await self._queue.get()
+
+
+class WalletWatcher:
+    """
+    Shared poller that refreshes each watched address once per interval and fans changes out to subscribers.
+
+    Upstream traffic grows with the number of distinct watched addresses, not with the number of subscribers.
+    Subscribers only receive an update when an address's wallet information (or error) changes, plus the
+    last known state when they start watching an address.
+
+    Args:
+        fetch (Callable[[str], Awaitable[dict]]): Fetches current wallet information for a normalized address.
+        interval (float): Seconds between refreshes of the same address.
+        concurrency (int): Maximum number of fetches in flight at once.
+        max_addresses (int): Maximum number of addresses a single subscription may watch.
+        max_pending (int): Maximum number of buffered updates per subscription.
+        clock (Callable[[], float], optional): Monotonic time source, overridable in tests.
+
+    Attributes:
+        fetches (int): Number of upstream refreshes performed.
+        updates (int): Number of updates delivered to subscribers.
+    """
+
+    def __init__(
+            self,
+            fetch: Callable[[str], Awaitable[dict]],
+            interval: float = 5.0,
+            concurrency: int = 20,
+            max_addresses: int = 100,
+            max_pending: int = 100,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self.concurrency = concurrency
+        self.max_addresses = max_addresses
+        self.max_pending = max_pending
+        self.fetches = 0
+        self.updates = 0
+        self._clock = clock
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._subscriptions: set[Subscription] = set()
+        self._states: dict[str, dict] = {}
+        self._due: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def watched(self) -> int:
+        """
+        Returns the number of distinct addresses being watched.
+        """
+        return len(self._subscribers)
+
+    @property
+    def subscriptions(self) -> int:
+        """
+        Returns the number of open subscriptions.
+        """
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """
+        Opens a subscription that does not watch any address yet.
+
+        Returns:
+            Subscription: The new subscription.
+        """
+        subscription = Subscription(self.max_pending)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def watch(self, subscription: Subscription, addresses: list[str]) -> None:
+        """
+        Adds normalized addresses to a subscription.
+
+        Args:
+            subscription (Subscription): The subscription.
+            addresses (list[str]): Normalized addresses to watch.
+
+        Raises:
+            ValueError: If the subscription would watch more than `max_addresses` addresses.
+
+        Notes:
+            - Addresses nobody watched before are refreshed right away; for the others the last known
+              state is delivered immediately.
+        """
+        new = [address for address in dict.fromkeys(addresses) if address not in subscription.addresses]
+        if len(subscription.addresses) + len(new) > self.max_addresses:
+            raise ValueError(f"A subscription may watch at most {self.max_addresses} addresses")
+        for address in new:
+            subscription.addresses.add(address)
+            subscribers = self._subscribers.setdefault(address, set())
+            subscribers.add(subscription)
+            if address in self._states:
+                subscription.push(self._states[address])
+            elif address not in self._due:
+                self._due[address] = self._clock()
+                self._wakeup.set()
+
+    def unwatch(self, subscription: Subscription, addresses: list[str]) -> None:
+        """
+        Removes addresses from a subscription; addresses left without subscribers stop being polled.
+
+        Args:
+            subscription (Subscription): The subscription.
+            addresses (list[str]): Normalized addresses to stop watching.
+        """
+        for address in addresses:
+            if address not in subscription.addresses:
+                continue
+            subscription.addresses.discard(address)
+            subscribers = self._subscribers.get(address)
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[address]
+                self._states.pop(address, None)
+                self._due.pop(address, None)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Closes a subscription.
+
+        Args:
+            subscription (Subscription): The subscription.
+        """
+        self.unwatch(subscription, list(subscription.addresses))
+        self._subscriptions.discard(subscription)
+
+    async def start(self) -> None:
+        """
+        Starts the background poller on the running event loop.
+        """
+        if self.running:
+            return
+        # The event binds to the loop it is first awaited on, so each start gets a fresh one.
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Wallet watcher started: interval=%s, concurrency=%s", self.interval, self.concurrency)
+
+    async def stop(self) -> None:
+        """
+        Stops the background poller.
+        """
+        if not self.running:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info("Wallet watcher stopped: fetches=%s, updates=%s", self.fetches, self.updates)
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            self._wakeup.clear()
+            now = self._clock()
+            due = [address for address, due_at in self._due.items() if due_at <= now]
+            if due:
+                await asyncio.gather(*(self._refresh(address, semaphore) for address in due))
+                continue
+            timeout = min(self._due.values()) - now if self._due else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh(self, address: str, semaphore: asyncio.Semaphore) -> None:
+        if address not in self._subscribers:
+            return
+        # Reschedule before fetching so a slow fetch does not make the address due again.
+        self._due[address] = self._clock() + self.interval
+        async with semaphore:
+            try:
+                state = {"address": address, "wallet": await self.fetch(address), "error": None}
+            except Exception as e:
+                state = {"address": address, "wallet": None, "error": str(e)}
+            finally:
+                self.fetches += 1
+
+        subscribers = self._subscribers.get(address)
+        if not subscribers or self._states.get(address) == state:
+            return
+        self._states[address] = state
+        for subscription in subscribers:
+            subscription.push(state)
+        self.updates += len(subscribers)
+
+
+watcher = WalletWatcher(
+    tron_service.refresh_wallet_info,
+    interval=float(os.getenv("WATCH_INTERVAL", "5")),
+    concurrency=int(os.getenv("WATCH_CONCURRENCY", "20")),
+    max_addresses=int(os.getenv("WATCH_MAX_ADDRESSES", "100")),
+    max_pending=int(os.getenv("WATCH_MAX_PENDING", "100"))
+)
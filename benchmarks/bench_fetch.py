@@ -0,0 +1,60 @@
+"""
+Compares sequential and concurrent upstream fetching in `tron_service.fetch_wallet_info`.
+
+Usage:
+    python -m benchmarks.bench_fetch [--latency 0.05] [--iterations 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("TRON_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("WALLET_SNAPSHOTS", "false")
+
+from app import tron_service
+from app.upstream import create_upstream_pool
+from benchmarks.mock_trongrid import create_mock_trongrid, serve
+from benchmarks.stats import summarize, format_summary
+
+ADDRESS = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+
+async def fetch_sequential(address: str) -> None:
+    await tron_service.upstream_pool.call(lambda client: client.get_account(address))
+    await tron_service.upstream_pool.call(lambda client: client.get_account_resource(address))
+
+
+async def measure(fetch, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fetch(ADDRESS)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def main(latency: float, iterations: int) -> None:
+    async with serve(create_mock_trongrid(latency=latency)) as url:
+        tron_service.upstream_pool = create_upstream_pool(["benchmark"], endpoints=[url])
+        try:
+            await tron_service.fetch_wallet_info(ADDRESS)
+            sequential = await measure(fetch_sequential, iterations)
+            concurrent = await measure(tron_service.fetch_wallet_info, iterations)
+        finally:
+            await tron_service.upstream_pool.close()
+
+    print(f"mock TronGrid latency: {latency * 1000:.0f} ms, iterations: {iterations}")
+    print(format_summary("sequential", summarize(sequential)))
+    print(format_summary("concurrent", summarize(concurrent)))
+    print(f"p50 speedup: {statistics.median(sequential) / statistics.median(concurrent):.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock TronGrid latency in seconds")
+    parser.add_argument("--iterations", type=int, default=50, help="Number of measured fetches per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.iterations))
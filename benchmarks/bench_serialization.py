@@ -0,0 +1,89 @@
+"""
+Compares the validated and the fast serialization path of a GET /requests page.
+
+The validated path loads ORM entities and runs them through the response model (pydantic validation with
+`from_attributes`, `jsonable_encoder`, stdlib json), as FastAPI does for a returned object. The fast path
+selects plain rows and encodes them with orjson, as the handlers do with FAST_SERIALIZATION enabled.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 100] [--iterations 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, UTC
+
+os.environ.setdefault("TRON_API_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("WALLET_SNAPSHOTS", "false")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app import crud, schemas
+from app.main import _request_items
+from app.metrics import TimedJSONResponse
+from app.models import Base, Request
+from benchmarks.stats import summarize, format_summary
+
+ADDRESS = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+REQUEST_LIST = TypeAdapter(list[schemas.RequestResponse])
+
+
+async def validated(db: AsyncSession, limit: int) -> bytes:
+    result = await db.execute(select(Request).order_by(Request.created_at.desc(), Request.id.desc()).limit(limit))
+    requests = REQUEST_LIST.validate_python(list(result.scalars().all()), from_attributes=True)
+    return json.dumps(
+        jsonable_encoder(requests), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+async def fast(db: AsyncSession, limit: int) -> bytes:
+    return TimedJSONResponse(_request_items(await crud.get_requests(db, 0, limit))).body
+
+
+async def measure(serialize, session_factory, limit: int, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await serialize(db, limit)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def main(rows: int, iterations: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    start = datetime.now(UTC)
+    async with session_factory() as db:
+        await crud.create_requests(db, [ADDRESS] * rows, [start + timedelta(seconds=i) for i in range(rows)])
+
+    try:
+        async with session_factory() as db:
+            if await validated(db, rows) != await fast(db, rows):
+                raise RuntimeError("Serialization paths produce different bodies")
+        slow_samples = await measure(validated, session_factory, rows, iterations)
+        fast_samples = await measure(fast, session_factory, rows, iterations)
+    finally:
+        await engine.dispose()
+
+    print(f"page size: {rows} rows, iterations: {iterations}")
+    print(format_summary("validated", summarize(slow_samples)))
+    print(format_summary("fast", summarize(fast_samples)))
+    print(f"p50 speedup: {statistics.median(slow_samples) / statistics.median(fast_samples):.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Number of requests per page")
+    parser.add_argument("--iterations", type=int, default=200, help="Number of measured pages per path")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations))
@@ -0,0 +1,198 @@
+"""
+Load test of the service against a local mock TronGrid.
+
+Starts the mock TronGrid and the FastAPI application (backed by a fresh local SQLite database by default) in
+this process, drives POST /wallet and GET /requests at the requested concurrency and reports
+throughput, latency percentiles and upstream call counts. Results are saved as JSON and can be
+compared with a previous run to catch regressions.
+
+The load generator shares the event loop with the service, so absolute numbers are lower than on a
+dedicated deployment; compare runs made with the same settings.
+
+Usage:
+    python -m benchmarks.load_test --scenario wallet --requests 2000 --concurrency 50
+    python -m benchmarks.load_test --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+from tronpy.keys import to_base58check_address
+
+from benchmarks.mock_trongrid import create_mock_trongrid, serve
+from benchmarks.stats import summarize, format_summary
+
+SCENARIOS = ("wallet", "requests", "mixed")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def generate_addresses(count: int, seed: int = 0) -> list[str]:
+    """
+    Generates deterministic, valid Tron addresses.
+
+    Args:
+        count (int): Number of addresses.
+        seed (int): Random seed, so runs query the same addresses.
+
+    Returns:
+        list[str]: Base58check addresses.
+    """
+    rng = random.Random(seed)
+    return [to_base58check_address(b"\x41" + rng.randbytes(20)) for _ in range(count)]
+
+
+async def run_scenario(
+        make_request: Callable[[int], Awaitable[httpx.Response]],
+        total: int,
+        concurrency: int
+) -> dict:
+    """
+    Issues `total` requests from `concurrency` workers and measures them.
+
+    Args:
+        make_request (Callable[[int], Awaitable[httpx.Response]]): Sends the i-th request.
+        total (int): Number of requests to send.
+        concurrency (int): Number of concurrent workers.
+
+    Returns:
+        dict: Request count, elapsed seconds, requests per second, latency summary and status counts.
+    """
+    latencies = []
+    statuses = Counter()
+    pending = iter(range(total))
+
+    async def worker() -> None:
+        for index in pending:
+            started = time.perf_counter()
+            try:
+                status = (await make_request(index)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "elapsed": elapsed,
+        "rps": total / elapsed if elapsed else 0.0,
+        "latency": summarize(latencies),
+        "statuses": dict(statuses),
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    Prints the change of each scenario against a baseline run.
+
+    Args:
+        results (dict): Results of the current run.
+        baseline (dict): Results of the baseline run.
+        max_regression (float): Tolerated relative drop in RPS or rise in p95 latency (0.1 = 10%).
+
+    Returns:
+        bool: True if no scenario regressed beyond `max_regression`.
+    """
+    ok = True
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        rps_change = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0.0
+        changes = {"rps": rps_change}
+        for key in ("p50", "p95", "p99"):
+            before = previous["latency"][key]
+            changes[key] = current["latency"][key] / before - 1 if before else 0.0
+        regressed = rps_change < -max_regression or changes["p95"] > max_regression
+        ok = ok and not regressed
+        print(
+            f"{name:<16} " + "  ".join(f"{key} {value:+.1%}" for key, value in changes.items())
+            + ("  REGRESSION" if regressed else "")
+        )
+    return ok
+
+
+async def main(args: argparse.Namespace) -> dict:
+    mock = create_mock_trongrid(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate
+    )
+    async with serve(mock) as mock_url:
+        # The service reads its configuration at import time, so it is imported once the mock is up.
+        os.environ["TRON_API_KEY"] = "benchmark"
+        os.environ["TRON_API_ENDPOINTS"] = mock_url
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("LOG_LEVEL", args.log_level)
+        from app.database import get_engine
+        from app.main import app
+        from app.models import Base
+
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        addresses = generate_addresses(args.addresses)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        results = {"timestamp": datetime.now(UTC).isoformat(), "config": vars(args), "scenarios": {}}
+
+        async with serve(app) as app_url, httpx.AsyncClient(base_url=app_url, limits=limits, timeout=60) as client:
+            async def post_wallet(index: int) -> httpx.Response:
+                return await client.post("/wallet", json={"address": random.choice(addresses)})
+
+            async def get_requests(index: int) -> httpx.Response:
+                return await client.get("/requests", params={"offset": random.randint(0, 1000), "limit": 100})
+
+            async def mixed(index: int) -> httpx.Response:
+                return await (post_wallet(index) if index % 10 < 8 else get_requests(index))
+
+            scenarios = {"wallet": post_wallet, "requests": get_requests, "mixed": mixed}
+            selected = SCENARIOS if args.scenario == "all" else (args.scenario,)
+            for name in selected:
+                calls_before = dict(mock.state.calls)
+                result = await run_scenario(scenarios[name], args.requests, args.concurrency)
+                result["upstream_calls"] = {
+                    method: count - calls_before.get(method, 0) for method, count in mock.state.calls.items()
+                }
+                results["scenarios"][name] = result
+                print(f"{format_summary(name, result['latency'])}  rps={result['rps']:8.1f}")
+                print(f"{'':<16} statuses={result['statuses']}  upstream_calls={result['upstream_calls']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all", help="Workload to run")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--addresses", type=int, default=100, help="Distinct wallet addresses to query")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock TronGrid latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mock TronGrid random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock TronGrid 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of mock TronGrid 429 responses")
+    parser.add_argument(
+        "--database-url", help="Database URL of the service under test (default: a fresh SQLite file)"
+    )
+    parser.add_argument("--log-level", default="WARNING", help="Service log level unless LOG_LEVEL is set")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json", help="Where to save results")
+    parser.add_argument("--compare", type=Path, help="Baseline results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="Tolerated relative regression")
+    args = parser.parse_args()
+    if args.database_url is None:
+        args.database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='tron_service_bench_')}/bench.db"
+
+    results = asyncio.run(main(args))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2, default=str))
+    print(f"Results saved to {args.output}")
+    if args.compare and not compare(results, json.loads(args.compare.read_text()), args.max_regression):
+        sys.exit(1)
@@ -0,0 +1,91 @@
+from fastapi import FastAPI, Body
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import asyncio
+import random
+import uvicorn
+
+
+def create_mock_trongrid(
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        missing: set[str] | None = None
+) -> FastAPI:
+    """
+    Creates a minimal TronGrid-compatible HTTP API for local benchmarks.
+
+    Args:
+        latency (float): Seconds each request is delayed to emulate network and node latency.
+        jitter (float): Maximum extra random delay in seconds added to `latency`.
+        error_rate (float): Share of requests answered with HTTP 500.
+        rate_limit_rate (float): Share of requests answered with HTTP 429, as TronGrid does over quota.
+        missing (set[str], optional): Addresses reported as not found on-chain.
+
+    Returns:
+        FastAPI: The mock TronGrid application. Per-method call counters are kept in `app.state.calls`
+            and per-status response counters in `app.state.statuses`.
+    """
+    missing = missing or set()
+    app = FastAPI(title="Mock TronGrid")
+    app.state.calls = {}
+    app.state.statuses = {}
+
+    def count(status: int) -> None:
+        app.state.statuses[status] = app.state.statuses.get(status, 0) + 1
+
+    async def respond(method: str, address: str, payload: dict):
+        app.state.calls[method] = app.state.calls.get(method, 0) + 1
+        await asyncio.sleep(latency + random.uniform(0, jitter))
+        roll = random.random()
+        if roll < rate_limit_rate:
+            count(429)
+            return JSONResponse({"Error": "rate limit exceeded"}, status_code=429)
+        if roll < rate_limit_rate + error_rate:
+            count(500)
+            return JSONResponse({"Error": "internal error"}, status_code=500)
+        count(200)
+        return {} if address in missing else payload
+
+    @app.post("/wallet/getaccount")
+    async def get_account(params: dict = Body(...)):
+        address = params.get("address", "")
+        return await respond("getaccount", address, {"address": address, "balance": 123_456_789})
+
+    @app.post("/wallet/getaccountresource")
+    async def get_account_resource(params: dict = Body(...)):
+        address = params.get("address", "")
+        return await respond(
+            "getaccountresource", address,
+            {"freeNetLimit": 600, "freeNetUsed": 100, "EnergyLimit": 5000, "EnergyUsed": 1000}
+        )
+
+    return app
+
+
+@asynccontextmanager
+async def serve(app: FastAPI, host: str = "127.0.0.1") -> AsyncIterator[str]:
+    """
+    Serves an ASGI application with uvicorn on an ephemeral local port.
+
+    Args:
+        app (FastAPI): Application to serve.
+        host (str): Interface to bind to.
+
+    Yields:
+        str: Base URL of the running server, with a trailing slash.
+    """
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}/"
+    finally:
+        server.should_exit = True
+        await task
@@ -0,0 +1,41 @@
+import statistics
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Summarizes latency samples.
+
+    Args:
+        samples (list[float]): Latencies in milliseconds.
+
+    Returns:
+        dict: Dictionary containing count, mean, p50, p95 and p99 (all 0 for an empty sample).
+    """
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"count": len(samples), "mean": value, "p50": value, "p95": value, "p99": value}
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "mean": statistics.mean(samples),
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+    }
+
+
+def format_summary(name: str, summary: dict) -> str:
+    """
+    Formats a latency summary as a single report line.
+
+    Args:
+        name (str): Label of the measured operation.
+        summary (dict): Output of `summarize`.
+
+    Returns:
+        str: Human-readable report line.
+    """
+    return (
+        f"{name:<16} n={summary['count']:<6} p50={summary['p50']:8.2f} ms  p95={summary['p95']:8.2f} ms  "
+        f"p99={summary['p99']:8.2f} ms  mean={summary['mean']:8.2f} ms"
+    )
@@ -1,8 +1,10 @@
 import pytest
+import time
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.sql import text
 from app.main import app
+from app import request_log, snapshots, prefetch, http_cache
 from app.database import get_db
 from app.models import Base, Request
 from datetime import datetime, UTC
@@ -46,19 +48,23 @@ async def async_session(async_engine):
         async_engine, expire_on_commit=False, class_=AsyncSession
     )
     async with async_session() as session:
-        # Clear the requests table before each test
+        # Clear the tables before each test
         await session.execute(text("DELETE FROM requests"))
+        await session.execute(text("DELETE FROM wallet_snapshots"))
+        await session.execute(text("DELETE FROM request_counts_by_address"))
+        await session.execute(text("DELETE FROM request_counts_by_minute"))
         await session.commit()
         yield session
         await session.rollback()
 
 
 @pytest.fixture(scope="function")
-async def client(async_session):
+async def client(async_engine, async_session):
     """
     Provides a FastAPI TestClient with mocked database dependency.
 
     Args:
+        async_engine: The async SQLAlchemy engine fixture.
         async_session: The async SQLAlchemy session fixture.
 
     Yields:
@@ -69,8 +75,21 @@ async def client(async_session):
         yield async_session
 
     app.dependency_overrides[get_db] = override_get_db
+    # Tests insert rows through their own session, which does not invalidate rendered responses.
+    http_cache.requests_cache.invalidate()
+    writers = (request_log.writer, snapshots.writer, prefetch.prefetcher)
+    session_factories = [writer.session_factory for writer in writers]
+    for writer in writers:
+        writer.session_factory = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
     with TestClient(app) as client:
+        # The warm-up shares the single in-memory SQLite connection; let it finish before the test writes.
+        for _ in range(100):
+            if client.get("/health/ready").status_code == 200:
+                break
+            time.sleep(0.01)
         yield client
+    for writer, session_factory in zip(writers, session_factories):
+        writer.session_factory = session_factory
     app.dependency_overrides.clear()
 
 
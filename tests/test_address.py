@@ -0,0 +1,76 @@
+import pytest
+from tronpy.keys import to_base58check_address, to_hex_address
+from app.address import normalize_address, is_valid_address, validate_addresses, get_cache_info
+
+ADDRESS = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+
+def test_normalize_address_accepts_all_forms():
+    """
+    Tests that base58check, 41-prefixed hex and 0x forms normalize to the same address.
+    """
+    hex_address = to_hex_address(ADDRESS)
+
+    assert normalize_address(ADDRESS) == ADDRESS
+    assert normalize_address(hex_address) == ADDRESS
+    assert normalize_address(hex_address.upper()) == ADDRESS
+    assert normalize_address("0x" + hex_address) == ADDRESS
+    assert normalize_address("0x" + hex_address[2:]) == ADDRESS
+    assert normalize_address(f"  {ADDRESS} ") == ADDRESS
+
+
+def test_normalize_address_matches_tronpy():
+    """
+    Tests that the built-in base58check encoder agrees with tronpy on random addresses.
+    """
+    for index in range(50):
+        raw = b"\x41" + bytes([index]) * 20
+        assert normalize_address(raw.hex()) == to_base58check_address(raw)
+
+
+@pytest.mark.parametrize("address", [
+    "",
+    "invalid_address",
+    "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwc",
+    "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWw0",
+    "00" + "11" * 20,
+    "41" + "zz" * 20,
+    "T" * 10_000,
+    None,
+])
+def test_normalize_address_rejects_invalid(address):
+    """
+    Tests that malformed addresses, bad checksums and wrong prefixes are rejected.
+
+    Args:
+        address: Invalid input.
+    """
+    with pytest.raises(ValueError):
+        normalize_address(address)
+    assert not is_valid_address(address)
+
+
+def test_validation_is_memoized():
+    """
+    Tests that repeated validation, including of invalid input, is answered from the memo.
+    """
+    normalize_address(ADDRESS)
+    hits = get_cache_info()["hits"]
+    normalize_address(ADDRESS)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            normalize_address("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwc")
+
+    assert get_cache_info()["hits"] >= hits + 2
+
+
+def test_validate_addresses_batch():
+    """
+    Tests that the batch validator splits inputs into canonical and invalid addresses.
+    """
+    hex_address = to_hex_address(ADDRESS)
+
+    valid, invalid = validate_addresses([ADDRESS, hex_address, "bad", ADDRESS])
+
+    assert valid == {ADDRESS: ADDRESS, hex_address: ADDRESS}
+    assert invalid == {"bad": "wrong length or format"}
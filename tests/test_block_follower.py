@@ -0,0 +1,245 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.block_follower import BlockFollower, touched_addresses
+from app.cache import InMemoryCacheBackend, TieredCacheBackend, TTLCache
+from app.snapshots import SnapshotCacheBackend, SnapshotWriter
+
+SENDER = "TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy"
+RECEIVER = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+IDLE = "TNPeeaaFB7K9cmo4uQpcU32zGK8G1NYqeL"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChain:
+    """
+    Fake Tron client serving blocks that each transfer TRX between the given addresses.
+    """
+
+    def __init__(self):
+        self.blocks: dict[int, dict] = {}
+        self.head = 0
+        self.error: Exception | None = None
+        self.block_calls = 0
+
+    def produce(self, *transfers: tuple[str, str]) -> None:
+        self.head += 1
+        self.blocks[self.head] = {
+            "block_header": {"raw_data": {"number": self.head}},
+            "transactions": [
+                {"raw_data": {"contract": [{
+                    "type": "TransferContract",
+                    "parameter": {"value": {"owner_address": owner, "to_address": to, "amount": 1}}
+                }]}}
+                for owner, to in transfers
+            ]
+        }
+
+    async def get_latest_block(self) -> dict:
+        if self.error:
+            raise self.error
+        return self.blocks[self.head]
+
+    async def get_block(self, number: int) -> dict:
+        self.block_calls += 1
+        return self.blocks[number]
+
+    async def call(self, fn):
+        return await fn(self)
+
+
+async def sleep_value(value):
+    await asyncio.sleep(0.01)
+    return value
+
+
+def make_follower(chain: FakeChain, cache: TTLCache, clock: FakeClock, **kwargs) -> BlockFollower:
+    """
+    Creates a follower reading blocks from a fake chain.
+
+    Args:
+        chain (FakeChain): The fake chain.
+        cache (TTLCache): The wallet cache.
+        clock (FakeClock): Time source of the follower.
+        **kwargs: Further `BlockFollower` arguments.
+
+    Returns:
+        BlockFollower: The follower.
+    """
+    async def refresh(address: str) -> dict:
+        await cache.set(address, "refreshed")
+        return {}
+
+    kwargs.setdefault("settle_blocks", 1)
+    return BlockFollower(cache, chain.call, refresh, synced_ttl=300, max_lag=3, clock=clock, **kwargs)
+
+
+def test_touched_addresses():
+    """
+    Tests that every `*_address` field of the transactions' contracts is collected.
+    """
+    chain = FakeChain()
+    chain.produce((SENDER, RECEIVER))
+
+    assert touched_addresses(chain.blocks[1]) == {SENDER, RECEIVER}
+    assert touched_addresses({"block_header": {"raw_data": {"number": 2}}}) == set()
+
+
+@pytest.mark.anyio
+async def test_follower_invalidates_touched_addresses_and_extends_ttl():
+    """
+    Tests that only cached addresses touched by new blocks are dropped, and entries get the long TTL once in sync.
+    """
+    chain, clock = FakeChain(), FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    follower = make_follower(chain, cache, clock)
+    chain.produce()
+    await follower.poll()
+    chain.produce()
+    await follower.poll()
+    assert follower.synced
+    assert cache.ttl_extension == 290
+
+    await cache.set(SENDER, "sender")
+    await cache.set(IDLE, "idle")
+    chain.produce((SENDER, RECEIVER))
+    chain.produce()
+    await follower.poll()
+
+    assert chain.block_calls == 1
+    assert follower.block_number == 4
+    assert SENDER not in cache
+    assert cache.peek(IDLE) == "idle"
+    assert follower.stats.invalidations == 1
+
+    # Handled again in the next block, e.g. for a lookup that started before the block was processed.
+    chain.produce((SENDER, RECEIVER))
+    await follower.poll()
+    await cache.set(SENDER, "sender")
+    chain.produce()
+    await follower.poll()
+    assert SENDER not in cache
+    await cache.set(SENDER, "sender")
+    chain.produce()
+    await follower.poll()
+    assert cache.peek(SENDER) == "sender"
+
+    clock.now += 200
+    assert await cache.get_or_load(IDLE, None) == "idle"
+
+
+@pytest.mark.anyio
+async def test_follower_invalidation_is_not_undone_by_snapshots(async_engine, async_session):
+    """
+    Tests that an address invalidated by a block is loaded again instead of being served from its snapshot.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture (clears the tables).
+    """
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    snapshots = SnapshotCacheBackend(SnapshotWriter(session_factory), max_age=60)
+    backend = TieredCacheBackend([InMemoryCacheBackend(), snapshots])
+    chain, clock = FakeChain(), FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, backend=backend)
+    follower = make_follower(chain, cache, clock)
+    chain.produce()
+    await follower.poll()
+    loads = []
+
+    async def loader():
+        loads.append(len(loads))
+        return {"balance_trx": float(len(loads)), "bandwidth": 0, "energy": 0}
+
+    assert (await cache.get_or_load(SENDER, loader))["balance_trx"] == 1.0
+    chain.produce((SENDER, RECEIVER))
+    chain.produce()
+    await follower.poll()
+
+    assert (await cache.get_or_load(SENDER, loader))["balance_trx"] == 2.0
+    assert len(loads) == 2
+    # The snapshot recorded after the invalidation is served again, e.g. to a restarted instance.
+    assert (await snapshots.get(SENDER)).value["balance_trx"] == 2.0
+
+
+@pytest.mark.anyio
+async def test_follower_refreshes_touched_addresses():
+    """
+    Tests that refresh mode replaces touched entries instead of dropping them.
+    """
+    chain, clock = FakeChain(), FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    follower = make_follower(chain, cache, clock, mode="refresh")
+    chain.produce()
+    await follower.poll()
+    await cache.set(RECEIVER, "old")
+    chain.produce((SENDER, RECEIVER))
+    await follower.poll()
+
+    assert cache.peek(RECEIVER) == "refreshed"
+    assert SENDER not in cache
+    assert follower.stats.refreshes == 1
+
+
+@pytest.mark.anyio
+async def test_follower_falls_back_when_behind():
+    """
+    Tests that falling behind reverts to the cache TTL, marks entries stale and resumes from the head.
+    """
+    chain, clock = FakeChain(), FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    follower = make_follower(chain, cache, clock)
+    for _ in range(2):
+        chain.produce()
+        await follower.poll()
+    await cache.set(IDLE, "idle")
+    clock.now += 100
+
+    for _ in range(5):
+        chain.produce()
+    await follower.poll()
+
+    assert not follower.synced
+    assert cache.ttl_extension == 0
+    assert follower.block_number == 7
+    assert chain.block_calls == 0
+    assert follower.stats.fallbacks == 1
+    assert await cache.get_or_load(IDLE, lambda: sleep_value("new")) == "idle"
+    assert cache.stats.stale_hits == 1
+    await cache.close()
+
+    chain.produce()
+    await follower.poll()
+    assert follower.synced
+
+
+@pytest.mark.anyio
+async def test_follower_falls_back_when_upstream_fails():
+    """
+    Tests that the follower stops extending the TTL when it cannot reach the Tron API for too long.
+    """
+    chain, clock = FakeChain(), FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    follower = make_follower(chain, cache, clock, interval=0.01)
+    for _ in range(2):
+        chain.produce()
+        await follower.poll()
+    chain.error = RuntimeError("connection reset")
+    clock.now += 10
+
+    await follower.start()
+    try:
+        while follower.stats.errors == 0:
+            await asyncio.sleep(0.01)
+        assert not follower.synced
+        assert cache.ttl_extension == 0
+        assert follower.stats.fallbacks == 1
+    finally:
+        await follower.stop()
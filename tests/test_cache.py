@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.cache import TTLCache, InMemoryCacheBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.anyio
+async def test_fresh_hit_skips_loader():
+    """
+    Tests that a fresh entry is served without calling the loader again.
+    """
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    loader = AsyncMock(return_value={"balance_trx": 1.0})
+
+    assert await cache.get_or_load("addr", loader) == {"balance_trx": 1.0}
+    assert await cache.get_or_load("addr", loader) == {"balance_trx": 1.0}
+
+    assert loader.await_count == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.anyio
+async def test_stale_entry_served_while_refreshing():
+    """
+    Tests that a stale entry is returned immediately and refreshed in the background.
+    """
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    await cache.set("addr", "old")
+    clock.now += 15
+
+    loader = AsyncMock(return_value="new")
+    assert await cache.get_or_load("addr", loader) == "old"
+    await asyncio.sleep(0)
+
+    assert await cache.get_or_load("addr", loader) == "new"
+    assert loader.await_count == 1
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.refreshes == 1
+
+
+@pytest.mark.anyio
+async def test_expired_entry_is_a_miss():
+    """
+    Tests that an entry past its stale window is reloaded synchronously.
+    """
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, clock=clock)
+    await cache.set("addr", "old")
+    clock.now += 41
+
+    assert await cache.get_or_load("addr", AsyncMock(return_value="new")) == "new"
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.anyio
+async def test_lru_eviction_and_shared_backend():
+    """
+    Tests that the local LRU evicts old entries and falls back to the shared backend.
+    """
+    cache = TTLCache(maxsize=2, ttl=10, backend=InMemoryCacheBackend())
+    for key in ("a", "b", "c"):
+        await cache.set(key, key.upper())
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+    loader = AsyncMock()
+    assert await cache.get_or_load("a", loader) == "A"
+    loader.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_loader_errors_are_not_cached():
+    """
+    Tests that a failing loader propagates its error and leaves nothing cached.
+    """
+    cache = TTLCache(maxsize=10, ttl=10)
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("addr", AsyncMock(side_effect=ValueError("boom")))
+
+    assert len(cache) == 0
+
+
+@pytest.mark.anyio
+async def test_ttl_extension_applies_to_local_entries_only():
+    """
+    Tests that extended local entries revert to stale on `expire_local` and the backend keeps the base TTL.
+    """
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(clock=clock)
+    cache = TTLCache(maxsize=10, ttl=10, stale_ttl=30, backend=backend, clock=clock)
+    cache.ttl_extension = 290
+    await cache.set("addr", "old")
+    clock.now += 20
+
+    loader = AsyncMock(return_value="new")
+    assert await cache.get_or_load("addr", loader) == "old"
+    assert cache.stats.hits == 1
+    assert (await backend.get("addr")).fresh_until == 1010
+
+    cache.expire_local()
+    assert (await backend.get("addr")).fresh_until == 1010
+    assert await cache.get_or_load("addr", loader) == "old"
+    await asyncio.sleep(0)
+    assert cache.stats.stale_hits == 1
+    assert await cache.get_or_load("addr", loader) == "new"
@@ -3,7 +3,7 @@ from app import crud
 from app.models import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime
+from datetime import datetime, timedelta, UTC
 
 
 @pytest.mark.anyio
@@ -43,3 +43,211 @@ async def test_get_requests(async_session: AsyncSession, sample_request: Request
 
     assert len(requests) == 1
     assert requests[0].wallet_address == sample_request.wallet_address
+
+
+@pytest.mark.anyio
+async def test_create_requests_bulk(async_session: AsyncSession):
+    """
+    Tests the create_requests function in crud.py with several addresses.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    wallet_addresses = ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7"]
+
+    written = await crud.create_requests(async_session, wallet_addresses)
+
+    result = await async_session.execute(select(Request.wallet_address))
+    assert written == 2
+    assert sorted(result.scalars().all()) == sorted(wallet_addresses)
+
+
+@pytest.mark.anyio
+async def test_get_requests_page_keyset(async_session: AsyncSession):
+    """
+    Tests the get_requests_page function in crud.py walking all pages with cursors.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    async_session.add_all([
+        Request(wallet_address=f"T{index}", created_at=base + timedelta(minutes=index // 2))
+        for index in range(5)
+    ])
+    await async_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        requests, cursor = await crud.get_requests_page(async_session, limit=2, cursor=cursor)
+        seen.extend(request.wallet_address for request in requests)
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+    assert seen[0] == "T4"
+
+
+@pytest.mark.anyio
+async def test_get_requests_page_filters(async_session: AsyncSession):
+    """
+    Tests wallet address and time range filters of get_requests_page.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    async_session.add_all([
+        Request(wallet_address="TA", created_at=base),
+        Request(wallet_address="TA", created_at=base + timedelta(hours=2)),
+        Request(wallet_address="TB", created_at=base + timedelta(hours=2)),
+    ])
+    await async_session.commit()
+
+    requests, next_cursor = await crud.get_requests_page(
+        async_session, limit=10, wallet_address="TA", created_from=base + timedelta(hours=1)
+    )
+
+    assert [request.wallet_address for request in requests] == ["TA"]
+    assert next_cursor is None
+
+
+@pytest.mark.anyio
+async def test_stream_requests_batches(async_session: AsyncSession):
+    """
+    Tests that stream_requests yields all matching requests in ascending batches.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    await crud.create_requests(
+        async_session, ["TA", "TB"] * 5, [base + timedelta(minutes=i) for i in range(10)]
+    )
+
+    batches = [batch async for batch in crud.stream_requests(async_session, batch_size=2, wallet_address="TA")]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    created = [request.created_at for batch in batches for request in batch]
+    assert created == sorted(created)
+    assert {request.wallet_address for batch in batches for request in batch} == {"TA"}
+
+    batches = [
+        batch async for batch in crud.stream_requests(
+            async_session, created_from=base + timedelta(minutes=8), created_to=base + timedelta(hours=1)
+        )
+    ]
+    assert [request.wallet_address for batch in batches for request in batch] == ["TA", "TB"]
+
+
+def test_decode_cursor_rejects_garbage():
+    """
+    Tests that a malformed cursor raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        crud.decode_cursor("not-a-cursor")
+
+
+@pytest.mark.anyio
+async def test_get_latest_snapshot(async_session: AsyncSession):
+    """
+    Tests that the latest snapshot is returned and older ones are ignored outside the freshness bound.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    wallet_address = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    now = datetime.now(UTC)
+    await crud.create_snapshots(async_session, [
+        (wallet_address, now - timedelta(minutes=10), {"balance_trx": 1.0, "bandwidth": 10, "energy": 100}),
+        (wallet_address, now - timedelta(minutes=5), {"balance_trx": 2.0, "bandwidth": 20, "energy": 200}),
+    ])
+
+    latest = await crud.get_latest_snapshot(async_session, wallet_address)
+    assert latest.balance_trx == 2.0
+    assert latest.energy == 200
+    assert await crud.get_latest_snapshot(async_session, wallet_address, now - timedelta(minutes=1)) is None
+
+
+@pytest.mark.anyio
+async def test_get_snapshot_history_buckets(async_session: AsyncSession):
+    """
+    Tests that snapshots are aggregated into min, max and last values per time bucket.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    wallet_address = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    hour = datetime(2026, 1, 1, 10, tzinfo=UTC)
+    await crud.create_snapshots(async_session, [
+        (wallet_address, hour + timedelta(minutes=5), {"balance_trx": 3.0, "bandwidth": 30, "energy": 300}),
+        (wallet_address, hour + timedelta(minutes=50), {"balance_trx": 1.0, "bandwidth": 10, "energy": 100}),
+        (wallet_address, hour + timedelta(minutes=20), {"balance_trx": 5.0, "bandwidth": 50, "energy": 500}),
+        (wallet_address, hour + timedelta(hours=2), {"balance_trx": 7.0, "bandwidth": 70, "energy": 700}),
+        ("TOtherAddress", hour, {"balance_trx": 100.0, "bandwidth": 0, "energy": 0}),
+    ])
+
+    buckets = await crud.get_snapshot_history(async_session, wallet_address, interval=3600, limit=10)
+
+    assert [bucket["start"] for bucket in buckets] == [hour, hour + timedelta(hours=2)]
+    assert buckets[0]["samples"] == 3
+    assert buckets[0]["balance_trx"] == {"min": 1.0, "max": 5.0, "last": 1.0}
+    assert buckets[0]["energy"] == {"min": 100, "max": 500, "last": 100}
+    assert buckets[1]["bandwidth"] == {"min": 70, "max": 70, "last": 70}
+
+    recent = await crud.get_snapshot_history(async_session, wallet_address, interval=3600, limit=1)
+    assert [bucket["start"] for bucket in recent] == [hour + timedelta(hours=2)]
+
+
+@pytest.mark.anyio
+async def test_request_rollups(async_session: AsyncSession):
+    """
+    Tests that request writes maintain the rollups and that a rebuild from raw rows gives the same counts.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    start = datetime(2026, 1, 1, 12, 0, 30, tzinfo=UTC)
+    first, second = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7", "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    await crud.create_requests(async_session, [first, second, first], [start, start, start + timedelta(minutes=1)])
+    await crud.create_requests(async_session, [first], [start + timedelta(seconds=10)])
+
+    async def snapshot():
+        top = [
+            (row.wallet_address, row.request_count, row.last_requested_at.replace(tzinfo=UTC))
+            for row in await crud.get_top_addresses(async_session, 10)
+        ]
+        minutes = [
+            (row.minute.replace(tzinfo=UTC), row.request_count)
+            for row in await crud.get_requests_per_minute(async_session, 10)
+        ]
+        async_session.expunge_all()
+        return top, minutes
+
+    top, minutes = await snapshot()
+    assert top == [(first, 3, start + timedelta(minutes=1)), (second, 1, start)]
+    assert minutes == [(datetime(2026, 1, 1, 12, 0, tzinfo=UTC), 3), (datetime(2026, 1, 1, 12, 1, tzinfo=UTC), 1)]
+
+    assert await crud.rebuild_rollups(async_session) == (2, 2)
+    assert await snapshot() == (top, minutes)
+
+
+@pytest.mark.anyio
+async def test_get_top_addresses_within_window(async_session: AsyncSession):
+    """
+    Tests that a windowed top list ranks addresses by their requests within the window only.
+
+    Args:
+        async_session: Async SQLAlchemy session fixture.
+    """
+    now = datetime.now(UTC)
+    old, recent = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7", "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    await crud.create_requests(
+        async_session, [old] * 3 + [old, recent, recent], [now - timedelta(days=2)] * 3 + [now] * 3
+    )
+
+    assert [row.wallet_address for row in await crud.get_top_addresses(async_session, 10)] == [old, recent]
+    top = await crud.get_top_addresses(async_session, 10, now - timedelta(hours=1))
+    assert [(row.wallet_address, row.request_count) for row in top] == [(recent, 2), (old, 1)]
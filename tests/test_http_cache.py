@@ -0,0 +1,81 @@
+from datetime import datetime, UTC
+from starlette.requests import Request
+from app.http_cache import ResponseCache, conditional_response, is_not_modified, render
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(method: str = "GET", **headers: str) -> Request:
+    """
+    Builds a request with the given headers.
+
+    Args:
+        method (str): HTTP method.
+        **headers (str): Header values by name, with underscores for dashes.
+
+    Returns:
+        Request: The request.
+    """
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": method, "path": "/requests", "query_string": b"", "headers": raw})
+
+
+def test_conditional_headers():
+    """
+    Tests If-None-Match (with weak and multiple tags) and If-Modified-Since evaluation.
+    """
+    rendered = render(b"[]", version=7, last_modified=datetime(2025, 1, 1, 12, 0, 0, 500000))
+
+    assert rendered.etag.startswith('"7-')
+    assert is_not_modified(make_request(if_none_match=rendered.etag), rendered)
+    assert is_not_modified(make_request(if_none_match=f'"other", W/{rendered.etag}'), rendered)
+    assert is_not_modified(make_request(if_none_match="*"), rendered)
+    assert not is_not_modified(make_request(if_none_match='"other"'), rendered)
+    assert is_not_modified(make_request(if_modified_since="Wed, 01 Jan 2025 12:00:00 GMT"), rendered)
+    assert not is_not_modified(make_request(if_modified_since="Wed, 01 Jan 2025 11:59:59 GMT"), rendered)
+    # If-None-Match takes precedence.
+    assert not is_not_modified(
+        make_request(if_none_match='"other"', if_modified_since="Wed, 01 Jan 2025 12:00:00 GMT"), rendered
+    )
+    assert not is_not_modified(make_request(if_modified_since="garbage"), rendered)
+    assert is_not_modified(make_request("HEAD", if_none_match="*"), rendered)
+    assert not is_not_modified(make_request("POST", if_none_match="*"), rendered)
+
+    response = conditional_response(make_request(if_none_match=rendered.etag), rendered)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["last-modified"] == "Wed, 01 Jan 2025 12:00:00 GMT"
+    assert conditional_response(make_request(), rendered).body == b"[]"
+
+
+def test_response_cache_invalidation_and_ttl():
+    """
+    Tests that bodies expire, are dropped on invalidation and are not stored from data read before it.
+    """
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=10, ttl=1.0, clock=clock)
+    rendered = render(b"[]", last_modified=datetime.now(UTC))
+
+    cache.set("a", rendered, cache.generation)
+    assert cache.get("a") is rendered
+    clock.now += 1
+    assert cache.get("a") is None
+
+    generation = cache.generation
+    cache.set("a", rendered, generation)
+    cache.invalidate()
+    assert cache.get("a") is None
+    cache.set("a", rendered, generation)
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.invalidations == 1
+
+    disabled = ResponseCache(maxsize=0, ttl=1.0, clock=clock)
+    disabled.set("a", rendered, disabled.generation)
+    assert disabled.get("a") is None
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from contextlib import AsyncExitStack
+from app.limiter import AdaptiveLimiter, LimitExceededError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.anyio
+async def test_limiter_queues_then_sheds():
+    """
+    Tests that requests beyond the limit wait in the queue and are shed once it is full.
+    """
+    limiter = AdaptiveLimiter("test", initial_limit=1, max_queue=1, queue_timeout=1.0)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.acquire():
+            await release.wait()
+
+    first = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert (limiter.inflight, limiter.queued) == (1, 1)
+
+    with pytest.raises(LimitExceededError) as error:
+        async with limiter.acquire():
+            pass
+    assert error.value.retry_after >= 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert (limiter.inflight, limiter.queued) == (0, 0)
+    assert (limiter.stats.admitted, limiter.stats.queued, limiter.stats.shed) == (2, 1, 1)
+
+
+@pytest.mark.anyio
+async def test_limiter_sheds_after_queue_timeout():
+    """
+    Tests that a queued request is shed when no slot frees up in time.
+    """
+    limiter = AdaptiveLimiter("test", initial_limit=1, max_queue=10, queue_timeout=0.01)
+
+    async with limiter.acquire():
+        with pytest.raises(LimitExceededError):
+            async with limiter.acquire():
+                pass
+
+    assert (limiter.inflight, limiter.queued, limiter.stats.shed) == (0, 0, 1)
+
+
+@pytest.mark.anyio
+async def test_limiter_adapts_to_latency_and_congestion():
+    """
+    Tests the multiplicative decrease on slow or failed calls and the additive increase under full use.
+    """
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(
+        "test", initial_limit=10, max_limit=11, latency_target=1.0, backoff=0.5,
+        congestion_errors=(TimeoutError,), clock=clock
+    )
+
+    async with limiter.acquire():
+        clock.now += 2.0
+    assert limiter.limit == 5
+
+    clock.now += 1.0
+    with pytest.raises(TimeoutError):
+        async with limiter.acquire():
+            raise TimeoutError
+    assert limiter.limit == 2.5
+
+    # Fast calls without using the limit leave it unchanged.
+    async with limiter.acquire():
+        pass
+    assert limiter.limit == 2.5
+
+    for _ in range(200):
+        async with AsyncExitStack() as stack:
+            for _ in range(int(limiter.limit)):
+                await stack.enter_async_context(limiter.acquire())
+    assert limiter.limit == 11
+
+
+@pytest.mark.anyio
+async def test_limiter_decreases_once_per_congestion_episode():
+    """
+    Tests that slow calls admitted before a decrease do not decrease the limit again.
+    """
+    clock = FakeClock()
+    limiter = AdaptiveLimiter("test", initial_limit=10, latency_target=1.0, backoff=0.5, clock=clock)
+
+    async with limiter.acquire():
+        async with limiter.acquire():
+            clock.now += 2.0
+    assert limiter.limit == 5
+    assert limiter.stats.decreases == 1
@@ -0,0 +1,48 @@
+import json
+import logging
+from app.logger import JsonFormatter, SamplingFilter, SAMPLED, setup_logger
+
+
+def make_record(sampled: bool = False) -> logging.LogRecord:
+    record = logging.LogRecord("main", logging.INFO, __file__, 1, "address=%s", ("T9yD14",), None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_json_formatter():
+    """
+    Tests that records are rendered as single-line JSON with the merged message.
+    """
+    payload = json.loads(JsonFormatter().format(make_record()))
+
+    assert payload["message"] == "address=T9yD14"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "main"
+
+
+def test_sampling_filter_only_drops_sampled_records():
+    """
+    Tests that the sampling filter drops marked records and keeps everything else.
+    """
+    sampling_filter = SamplingFilter(rate=0.0)
+
+    assert sampling_filter.filter(make_record()) is True
+    assert sampling_filter.filter(make_record(sampled=True)) is False
+
+
+def test_disabled_level_skips_argument_formatting():
+    """
+    Tests that arguments of disabled log calls are never formatted.
+    """
+    class Expensive:
+        formatted = False
+
+        def __str__(self):
+            Expensive.formatted = True
+            return "expensive"
+
+    logger = setup_logger("test_logger")
+    logger.debug("value=%s", Expensive(), extra=SAMPLED)
+
+    assert Expensive.formatted is False
@@ -1,6 +1,16 @@
+import asyncio
+import json
+import math
 import pytest
+from datetime import datetime, timedelta, UTC
+from app import crud, http_cache, main, schemas, tron_service, watch
+from app.limiter import AdaptiveLimiter, export_limiter
 from app.models import Request
+from app.upstream import UpstreamClient, UpstreamPool, UpstreamUnavailableError
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import ClientDisconnect
+from tronpy.keys import to_hex_address
 from unittest.mock import AsyncMock
 
 
@@ -26,6 +36,78 @@ async def test_get_wallet_info_success(client, mocker):
     assert response.json() == mock_wallet_info
 
 
+@pytest.mark.anyio
+async def test_get_wallet_info_sheds_load(client, mocker):
+    """
+    Tests that /wallet answers 503 with Retry-After when the concurrency limit and queue are exhausted.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    limiter = AdaptiveLimiter("wallet", initial_limit=1, max_queue=0)
+    limiter.inflight = 1
+    mocker.patch("app.main.wallet_limiter", limiter)
+    get_wallet_info = mocker.patch("app.tron_service.get_wallet_info", AsyncMock())
+
+    response = client.post("/wallet", json={"address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    get_wallet_info.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_get_wallet_info_timeout_shrinks_limit(client, mocker):
+    """
+    Tests that a Tron API timeout answers 504 and makes the wallet limiter back off.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    class HangingTron:
+        async def get_account(self, address):
+            await asyncio.sleep(10)
+
+        async def get_account_resource(self, address):
+            await asyncio.sleep(10)
+
+    limiter = AdaptiveLimiter("wallet", initial_limit=10, latency_target=math.inf, congestion_errors=(
+        UpstreamUnavailableError,
+    ))
+    mocker.patch("app.main.wallet_limiter", limiter)
+    mocker.patch.object(tron_service, "upstream_pool", UpstreamPool(
+        [UpstreamClient("hanging", HangingTron())], call_timeout=0.01, max_retries=0
+    ))
+    await tron_service.wallet_cache.invalidate("TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy")
+
+    response = client.post("/wallet", json={"address": "TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy"})
+
+    assert response.status_code == 504
+    assert limiter.limit < 10
+    assert limiter.stats.decreases == 1
+
+
+@pytest.mark.anyio
+async def test_get_wallet_info_without_api_key(client, mocker):
+    """
+    Tests that a missing TRON_API_KEY is reported as a server error, not as a bad request.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(tron_service, "upstream_pool", None)
+    mocker.patch.object(tron_service, "TRON_API_KEYS", [])
+    await tron_service.wallet_cache.invalidate("TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy")
+
+    response = client.post("/wallet", json={"address": "TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy"})
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Tron API access is not configured"
+
+
 @pytest.mark.anyio
 async def test_get_wallet_info_invalid_address(client):
     """
@@ -82,4 +164,456 @@ async def test_get_requests_empty(client, async_session):
     response = client.get("/requests?offset=0&limit=10")
 
     assert response.status_code == 200
-    assert response.json() == []
\ No newline at end of file
+    assert response.json() == []
+
+
+@pytest.mark.anyio
+async def test_get_wallets_info_batch(client, mocker):
+    """
+    Tests the /wallets endpoint with a mix of valid and invalid addresses.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mock_wallet_info = {"balance_trx": 100.5, "bandwidth": 500, "energy": 1000}
+    mocker.patch("app.tron_service.get_wallet_info", AsyncMock(return_value=mock_wallet_info))
+    enqueue_many = mocker.patch("app.request_log.writer.enqueue_many", AsyncMock())
+
+    response = client.post(
+        "/wallets", json={"addresses": ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "invalid_address"]}
+    )
+
+    assert response.status_code == 200
+    items = response.json()
+    assert items[0] == {"address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "wallet": mock_wallet_info, "error": None}
+    assert items[1]["wallet"] is None
+    assert "Invalid Tron address" in items[1]["error"]
+    enqueue_many.assert_awaited_once_with(["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"])
+
+
+@pytest.mark.anyio
+async def test_get_wallets_info_batch_stream(client, mocker):
+    """
+    Tests the /wallets endpoint in NDJSON streaming mode.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mock_wallet_info = {"balance_trx": 100.5, "bandwidth": 500, "energy": 1000}
+    mocker.patch("app.tron_service.get_wallet_info", AsyncMock(return_value=mock_wallet_info))
+    enqueue_many = mocker.patch("app.request_log.writer.enqueue_many", AsyncMock())
+
+    response = client.post(
+        "/wallets?stream=true", json={"addresses": ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "invalid_address"]}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {line["address"] for line in lines} == {"T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "invalid_address"}
+    enqueue_many.assert_awaited_once_with(["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"])
+
+
+@pytest.mark.anyio
+async def test_get_wallets_info_normalizes_addresses(client, mocker):
+    """
+    Tests that hex and base58 forms of the same wallet are looked up once and recorded in canonical form.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mock_wallet_info = {"balance_trx": 100.5, "bandwidth": 500, "energy": 1000}
+    get_wallet_info = mocker.patch("app.tron_service.get_wallet_info", AsyncMock(return_value=mock_wallet_info))
+    enqueue_many = mocker.patch("app.request_log.writer.enqueue_many", AsyncMock())
+    hex_address = "41" + "00" * 20
+    canonical = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+    response = client.post("/wallets", json={"addresses": [canonical, hex_address]})
+
+    assert response.status_code == 200
+    assert [item["address"] for item in response.json()] == [canonical, hex_address]
+    get_wallet_info.assert_awaited_once_with(canonical)
+    enqueue_many.assert_awaited_once_with([canonical, canonical])
+
+
+@pytest.mark.anyio
+async def test_get_wallet_history(client, async_session):
+    """
+    Tests the /wallets/{address}/history endpoint with stored snapshots.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    await crud.create_snapshots(async_session, [
+        ("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", start, {"balance_trx": 1.0, "bandwidth": 1, "energy": 1}),
+        (
+            "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", start + timedelta(minutes=1),
+            {"balance_trx": 3.0, "bandwidth": 1, "energy": 1}
+        ),
+    ])
+
+    response = client.get("/wallets/410000000000000000000000000000000000000000/history", params={"interval": 3600})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["address"] == "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    assert body["buckets"][0]["samples"] == 2
+    assert body["buckets"][0]["balance_trx"] == {"min": 1.0, "max": 3.0, "last": 3.0}
+
+    assert client.get("/wallets/invalid_address/history").status_code == 400
+
+
+@pytest.mark.anyio
+async def test_get_analytics(client, async_session):
+    """
+    Tests the /analytics endpoints against rollups maintained by request writes.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    minute = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+    await crud.create_requests(
+        async_session,
+        ["TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7"] * 2 + ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"],
+        [minute, minute, minute + timedelta(minutes=1)]
+    )
+
+    response = client.get("/analytics/top-addresses", params={"limit": 1})
+    assert response.status_code == 200
+    assert [(item["wallet_address"], item["request_count"]) for item in response.json()] == [
+        ("TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7", 2)
+    ]
+
+    response = client.get("/analytics/requests-per-minute", params={"created_from": minute.isoformat()})
+    assert response.status_code == 200
+    assert [item["request_count"] for item in response.json()] == [2, 1]
+
+
+@pytest.mark.anyio
+async def test_get_requests_page(client, async_session, sample_request):
+    """
+    Tests the /requests/page endpoint with cursor pagination.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+        sample_request: Sample Request object fixture.
+    """
+    async_session.add(sample_request)
+    await async_session.commit()
+
+    response = client.get("/requests/page?limit=10")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    assert response.json()["next_cursor"] is None
+
+    response = client.get("/requests/page?cursor=garbage")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_get_requests_normalizes_wallet_address_filter(client, async_session, sample_request):
+    """
+    Tests that request listings accept the wallet address filter in any address form and reject invalid ones.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+        sample_request: Sample Request object fixture.
+    """
+    async_session.add(sample_request)
+    await async_session.commit()
+    hex_address = to_hex_address(sample_request.wallet_address)
+
+    for path in ("/requests", "/requests/page"):
+        response = client.get(path, params={"wallet_address": "0x" + hex_address[2:]})
+
+        assert response.status_code == 200
+        items = response.json() if path == "/requests" else response.json()["items"]
+        assert [item["wallet_address"] for item in items] == [sample_request.wallet_address]
+
+        response = client.get(path, params={"wallet_address": "bad"})
+
+        assert response.status_code == 400
+        assert "Invalid Tron address" in response.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_export_requests(client, async_engine, async_session, mocker):
+    """
+    Tests that /requests/export streams all matching requests as NDJSON and CSV.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch("app.database.async_session", async_sessionmaker(async_engine, class_=AsyncSession))
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    first, second = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7", "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+    await crud.create_requests(
+        async_session, [first, second] * 150, [base + timedelta(seconds=i) for i in range(300)]
+    )
+
+    response = client.get("/requests/export", params={"wallet_address": to_hex_address(first), "batch_size": 100})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert len(items) == 150
+    assert {item["wallet_address"] for item in items} == {first}
+    assert [item["id"] for item in items] == sorted(item["id"] for item in items)
+
+    response = client.get("/requests/export", params={
+        "format": "csv", "created_from": (base + timedelta(seconds=298)).isoformat()
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="requests.csv"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert lines[0] == "id,created_at,wallet_address"
+    assert [line.split(",")[2] for line in lines[1:]] == [first, second]
+    assert export_limiter.inflight == 0
+
+    response = client.get("/requests/export", params={"wallet_address": "TA"})
+
+    assert response.status_code == 400
+    assert export_limiter.inflight == 0
+
+
+@pytest.mark.anyio
+async def test_export_requests_sheds_load(client, mocker):
+    """
+    Tests that /requests/export answers 503 when the export concurrency limit is exhausted.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    limiter = AdaptiveLimiter("export", initial_limit=1, max_queue=0)
+    limiter.inflight = 1
+    mocker.patch("app.main.export_limiter", limiter)
+
+    response = client.get("/requests/export")
+
+    assert response.status_code == 503
+
+
+@pytest.mark.anyio
+async def test_export_slot_released_when_body_never_sent(mocker):
+    """
+    Tests that the export concurrency slot is released when sending the response fails before the body starts.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    limiter = AdaptiveLimiter("export", initial_limit=1, max_queue=0)
+    mocker.patch("app.main.export_limiter", limiter)
+    iter_export = mocker.patch("app.export.iter_export")
+
+    response = await main.export_requests(schemas.ExportParams(), schemas.RequestFilterParams())
+    assert limiter.inflight == 1
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    with pytest.raises(ClientDisconnect):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+    assert limiter.inflight == 0
+    iter_export.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_fast_serialization_matches_response_model(client, async_session, sample_request, mocker):
+    """
+    Tests that responses built from rows are byte-identical to responses validated through the response model.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+        sample_request: Sample Request object fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    async_session.add(sample_request)
+    await async_session.commit()
+    urls = ["/requests?offset=0&limit=10", "/requests/page?limit=10"]
+
+    mocker.patch("app.main.FAST_SERIALIZATION", True)
+    fast = [client.get(url).content for url in urls]
+    mocker.patch("app.main.FAST_SERIALIZATION", False)
+    validated = [client.get(url).content for url in urls]
+
+    assert fast == validated
+
+
+@pytest.mark.anyio
+async def test_watch_websocket_pushes_updates(client, mocker):
+    """
+    Tests that the /ws/watch endpoint pushes wallet information for watched addresses and reports invalid ones.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    wallet_info = {"balance_trx": 1.5, "bandwidth": 10, "energy": 20}
+    mocker.patch("app.watch.watcher.fetch", AsyncMock(return_value=wallet_info))
+
+    with client.websocket_connect("/ws/watch") as websocket:
+        websocket.send_json({"action": "watch", "addresses": ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "invalid"]})
+        assert websocket.receive_json()["error"] == "Invalid Tron address: wrong length or format"
+        assert websocket.receive_json() == {
+            "address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "wallet": wallet_info, "error": None
+        }
+
+
+@pytest.mark.anyio
+async def test_watch_websocket_survives_malformed_messages(client, mocker):
+    """
+    Tests that /ws/watch answers malformed messages and binary frames with an error and keeps the subscription open.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    wallet_info = {"balance_trx": 1.5, "bandwidth": 10, "energy": 20}
+    mocker.patch("app.watch.watcher.fetch", AsyncMock(return_value=wallet_info))
+
+    with client.websocket_connect("/ws/watch") as websocket:
+        websocket.send_text("{not json")
+        assert websocket.receive_json()["error"].startswith("Malformed JSON message")
+        websocket.send_bytes(b"\x00")
+        assert websocket.receive_json()["error"].startswith("Binary frames are not supported")
+        websocket.send_json({"action": "watch", "addresses": ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"]})
+        assert websocket.receive_json()["wallet"] == wallet_info
+
+
+@pytest.mark.anyio
+async def test_watch_websocket_logs_sender_failure(client, mocker):
+    """
+    Tests that an error in the task pushing /ws/watch updates is logged rather than lost when it is cancelled.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(watch.Subscription, "get", AsyncMock(side_effect=RuntimeError("boom")))
+    log_error = mocker.patch.object(main.logger, "error")
+
+    with client.websocket_connect("/ws/watch") as websocket:
+        websocket.send_text("{not json")
+        assert websocket.receive_json()["error"].startswith("Malformed JSON message")
+
+    log_error.assert_called_once()
+    assert "boom" in repr(log_error.call_args.args[1])
+
+
+@pytest.mark.anyio
+async def test_watch_sse_rejects_invalid_address(client):
+    """
+    Tests that the /watch SSE endpoint rejects invalid addresses before streaming.
+
+    Args:
+        client: FastAPI TestClient fixture.
+    """
+    response = client.get("/watch", params={"addresses": ["invalid_address"]})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_readiness_waits_for_warm_up(client, mocker):
+    """
+    Tests that /health/ready answers 503 until the wallet cache warm-up is done.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "warmed": 0}
+
+    mocker.patch("app.prefetch.prefetcher.ready", False)
+
+    assert client.get("/health/ready").status_code == 503
+
+
+@pytest.mark.anyio
+async def test_get_requests_conditional(client, async_session, sample_request, mocker):
+    """
+    Tests ETag headers, 304 responses and the rendered-body cache of /requests.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        async_session: Async SQLAlchemy session fixture.
+        sample_request: Sample Request object fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    async_session.add(sample_request)
+    await async_session.commit()
+    get_requests = mocker.spy(crud, "get_requests")
+
+    response = client.get("/requests", params={"limit": 10})
+
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith(f'"{sample_request.id}-')
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in response.headers
+
+    response = client.get("/requests", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    response = client.get(
+        "/requests", params={"limit": 10}, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+    assert get_requests.call_count == 1
+
+    async_session.add(Request(wallet_address="TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy", created_at=datetime.now(UTC)))
+    await async_session.commit()
+    http_cache.requests_cache.invalidate()
+
+    response = client.get("/requests", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["etag"] != etag
+    assert get_requests.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_get_wallet_info_ignores_conditional_headers(client, mocker):
+    """
+    Tests that /wallet returns an ETag of the wallet data but, being a POST, always sends the body.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    wallet_info = {"balance_trx": 100.5, "bandwidth": 500, "energy": 1000}
+    mocker.patch("app.tron_service.get_wallet_info", AsyncMock(return_value=wallet_info))
+    body = {"address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"}
+
+    etag = client.post("/wallet", json=body).headers["etag"]
+    for if_none_match in (etag, "*"):
+        response = client.post("/wallet", json=body, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+        assert response.json() == wallet_info
+
+    wallet_info["balance_trx"] = 99.0
+    assert client.post("/wallet", json=body).headers["etag"] != etag
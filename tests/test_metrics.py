@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.metrics import Counter, Histogram, CallbackMetric, Registry
+
+
+def test_counter_renders_labelled_totals():
+    """
+    Tests that counters are rendered with a `_total` suffix per label set.
+    """
+    counter = Counter("calls", "Calls", ("outcome",))
+    counter.inc("success")
+    counter.inc("success")
+    counter.inc("error", amount=3)
+
+    rendered = counter.render()
+
+    assert "# TYPE calls counter" in rendered
+    assert 'calls_total{outcome="success"} 2.0' in rendered
+    assert 'calls_total{outcome="error"} 3.0' in rendered
+
+
+def test_histogram_buckets_are_cumulative():
+    """
+    Tests that histogram buckets are cumulative and include +Inf, sum and count.
+    """
+    histogram = Histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "db")
+
+    rendered = histogram.render()
+
+    assert 'latency_seconds_bucket{stage="db",le="0.1"} 1' in rendered
+    assert 'latency_seconds_bucket{stage="db",le="1.0"} 2' in rendered
+    assert 'latency_seconds_bucket{stage="db",le="+Inf"} 3' in rendered
+    assert 'latency_seconds_sum{stage="db"} 5.55' in rendered
+    assert 'latency_seconds_count{stage="db"} 3' in rendered
+    assert histogram.count("db") == 3
+
+
+def test_callback_metric_reads_values_on_render():
+    """
+    Tests that callback metrics are evaluated at render time.
+    """
+    state = {"size": 1}
+    registry = Registry()
+    registry.register(CallbackMetric("cache_size", "Size", (), lambda: [((), state["size"])]))
+    state["size"] = 7
+
+    assert "cache_size 7" in registry.render()
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(client, mocker):
+    """
+    Tests that /metrics exposes per-route request counters and stage latencies.
+
+    Args:
+        client: FastAPI TestClient fixture.
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch(
+        "app.tron_service.get_wallet_info",
+        AsyncMock(return_value={"balance_trx": 1.0, "bandwidth": 1, "energy": 1})
+    )
+    client.post("/wallet", json={"address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="POST",path="/wallet",status="200"}' in body
+    assert 'stage_duration_seconds_count{stage="validation"}' in body
+    assert 'stage_duration_seconds_count{stage="serialization"}' in body
+    assert "wallet_cache_size" in body
+    assert 'db_pool{stat="pool_size"}' in body
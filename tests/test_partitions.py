@@ -0,0 +1,111 @@
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from datetime import datetime, timedelta, UTC
+from app.models import Request
+from utils.partitions import (
+    LEGACY_PARTITION, partition_start, next_partition_start, partition_name, parse_bounds, ensure_partitions,
+    apply_retention, list_partitions, migrate
+)
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def test_partition_periods():
+    """
+    Tests period boundaries and names of daily and monthly partitions.
+    """
+    moment = datetime(2026, 12, 31, 23, 59, tzinfo=UTC)
+
+    day = partition_start(moment, "day")
+    assert day == datetime(2026, 12, 31, tzinfo=UTC)
+    assert next_partition_start(day, "day") == datetime(2027, 1, 1, tzinfo=UTC)
+    assert partition_name(day, "day") == "requests_p20261231"
+
+    month = partition_start(moment, "month")
+    assert month == datetime(2026, 12, 1, tzinfo=UTC)
+    assert next_partition_start(month, "month") == datetime(2027, 1, 1, tzinfo=UTC)
+    assert next_partition_start(datetime(2027, 1, 1, tzinfo=UTC), "month") == datetime(2027, 2, 1, tzinfo=UTC)
+    assert partition_name(month, "month") == "requests_p202612"
+
+    with pytest.raises(ValueError):
+        partition_start(moment, "week")
+
+
+def test_parse_bounds():
+    """
+    Tests parsing of partition bounds reported by PostgreSQL.
+    """
+    assert parse_bounds("DEFAULT") is None
+    assert parse_bounds("FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')") == (
+        datetime(2026, 10, 1, tzinfo=UTC), datetime(2026, 11, 1, tzinfo=UTC)
+    )
+    assert parse_bounds("FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00+00')") == (
+        None, datetime(2026, 11, 1, tzinfo=UTC)
+    )
+
+
+@pytest.mark.anyio
+async def test_partitioning_requires_postgresql(async_engine):
+    """
+    Tests that partition maintenance refuses to run on other databases.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+    """
+    async with async_engine.connect() as conn:
+        with pytest.raises(ValueError):
+            await ensure_partitions(conn, "month", 1)
+        with pytest.raises(ValueError):
+            await apply_retention(conn, 30)
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+async def test_migrate_then_maintain_on_postgresql():
+    """
+    Tests converting a table created by `utils.init_db` and maintaining it afterwards, on a real PostgreSQL.
+    """
+    engine = create_async_engine(POSTGRES_URL)
+    now = datetime.now(UTC)
+    current = partition_start(now, "month")
+    following = next_partition_start(current, "month")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS requests CASCADE"))
+            await conn.run_sync(Request.__table__.create)
+            await conn.execute(
+                Request.__table__.insert(),
+                [
+                    {"wallet_address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "created_at": now - timedelta(days=400)},
+                    {"wallet_address": "TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy", "created_at": now}
+                ]
+            )
+
+        async with engine.begin() as conn:
+            assert await migrate(conn, "month", 1)
+            assert not await migrate(conn, "month", 1)
+            partitions = await list_partitions(conn)
+            assert partitions[LEGACY_PARTITION] == (None, following)
+            assert partition_name(following, "month") in partitions
+
+            # New rows continue the id sequence and land in the partition of their period.
+            new_id = (await conn.execute(
+                Request.__table__.insert().returning(Request.__table__.c.id),
+                {"wallet_address": "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", "created_at": following}
+            )).scalar()
+            assert new_id == 3
+            located = (await conn.execute(text("SELECT tableoid::regclass::text FROM requests WHERE id = 3"))).scalar()
+            assert located == partition_name(following, "month")
+
+            third = next_partition_start(following, "month")
+            assert await ensure_partitions(conn, "month", 2) == [partition_name(third, "month")]
+            assert await apply_retention(conn, 1, now=third + timedelta(days=1)) == sorted(
+                [LEGACY_PARTITION, partition_name(following, "month")]
+            )
+            assert (await conn.execute(text("SELECT count(*) FROM requests"))).scalar() == 0
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS requests CASCADE"))
+        await engine.dispose()
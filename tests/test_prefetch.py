@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from datetime import datetime, UTC
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app import crud
+from app.cache import TTLCache
+from app.prefetch import Prefetcher
+
+HOT = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+WARM = "TLsV52sRDL79HXGGm9yzwKibb6BeruhUzy"
+COLD = "TNPeeaaFB7K9cmo4uQpcU32zGK8G1NYqeL"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_prefetcher(async_engine, cache: TTLCache, calls: list[tuple[str, str]], **kwargs) -> Prefetcher:
+    """
+    Creates a prefetcher reading top addresses from the test database and recording its wallet lookups.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        cache (TTLCache): The wallet cache.
+        calls (list[tuple[str, str]]): Receives `("load" | "refresh", address)` for every lookup.
+        **kwargs: Further `Prefetcher` arguments.
+
+    Returns:
+        Prefetcher: The prefetcher.
+    """
+    async def load(address: str) -> dict:
+        calls.append(("load", address))
+        return await cache.get_or_load(address, lambda: fetch(address))
+
+    async def refresh(address: str) -> dict:
+        calls.append(("refresh", address))
+        wallet_info = await fetch(address)
+        await cache.set(address, wallet_info)
+        return wallet_info
+
+    async def fetch(address: str) -> dict:
+        if address == COLD:
+            raise ValueError("Invalid address")
+        return {"balance_trx": 1.0, "bandwidth": 0, "energy": 0}
+
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    return Prefetcher(cache, session_factory, load, refresh, top_k=2, rate=0, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_warm_up_loads_top_addresses(async_engine, async_session):
+    """
+    Tests that the warm-up loads the most requested addresses through the cache.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    await crud.create_requests(async_session, [HOT, HOT, HOT, WARM, WARM, COLD])
+    cache = TTLCache(maxsize=10, ttl=10)
+    calls = []
+    prefetcher = make_prefetcher(async_engine, cache, calls)
+
+    assert await prefetcher.warm_up() == 2
+
+    assert sorted(calls) == sorted([("load", HOT), ("load", WARM)])
+    assert HOT in cache and WARM in cache
+    assert prefetcher.stats.warmed == 2
+
+
+@pytest.mark.anyio
+async def test_prefetch_refreshes_entries_about_to_expire(async_engine, async_session):
+    """
+    Tests that a pass refreshes only cached top addresses whose entries are about to become stale, counting failures.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    await crud.create_requests(async_session, [HOT, HOT, COLD, COLD, WARM])
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    calls = []
+    prefetcher = make_prefetcher(async_engine, cache, calls, lead=3)
+    await cache.set(HOT, {"balance_trx": 0.0})
+    await cache.set(COLD, {"balance_trx": 0.0})
+
+    assert await prefetcher.prefetch() == 0
+    assert calls == []
+
+    clock.now += 8
+    assert await prefetcher.prefetch() == 1
+    assert sorted(calls) == sorted([("refresh", COLD), ("refresh", HOT)])
+    assert prefetcher.stats.errors == 1
+    assert cache.fresh_for(HOT) == 10
+
+    # Top addresses that are not cached are left to the requests for them.
+    await cache.invalidate(HOT)
+    calls.clear()
+    assert await prefetcher.prefetch() == 0
+    assert calls == [("refresh", COLD)]
+
+
+@pytest.mark.anyio
+async def test_prefetcher_is_ready_after_warm_up(async_engine, async_session):
+    """
+    Tests that the prefetcher reports ready after the warm-up, and immediately when disabled.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    await crud.create_requests(async_session, [HOT], [datetime.now(UTC)])
+    cache = TTLCache(maxsize=10, ttl=10)
+    prefetcher = make_prefetcher(async_engine, cache, [], interval=60)
+
+    await prefetcher.start()
+    try:
+        assert not prefetcher.ready
+        while not prefetcher.ready:
+            await asyncio.sleep(0.01)
+        assert HOT in cache
+    finally:
+        await prefetcher.stop()
+
+    disabled = make_prefetcher(async_engine, cache, [])
+    disabled.top_k = 0
+    await disabled.start()
+    assert disabled.ready
+    assert not disabled.running
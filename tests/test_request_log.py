@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models import Request
+from app.request_log import BatchWriter, RequestLogWriter
+
+
+@pytest.fixture
+def session_factory(async_engine, async_session):
+    """
+    Provides a session factory bound to the test engine (after the requests table was cleared).
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: The async SQLAlchemy session fixture, used to reset the table.
+
+    Returns:
+        async_sessionmaker: Factory producing sessions for the test engine.
+    """
+    return async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_batches_on_stop(session_factory, async_session):
+    """
+    Tests that buffered records are written in batches and flushed on shutdown.
+
+    Args:
+        session_factory: Session factory fixture for the test engine.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    writer = RequestLogWriter(session_factory, batch_size=2, flush_interval=60)
+    written = []
+    writer.on_written.append(written.append)
+    await writer.start()
+
+    await writer.enqueue_many(["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"] * 3)
+    await writer.stop()
+
+    result = await async_session.execute(select(Request))
+    assert len(result.scalars().all()) == 3
+    assert writer.stats.written == 3
+    assert writer.stats.batches == 2
+    assert written == [2, 1]
+
+
+@pytest.mark.anyio
+async def test_writer_drops_records_when_full(session_factory):
+    """
+    Tests the "drop" overflow policy when the buffer is full.
+
+    Args:
+        session_factory: Session factory fixture for the test engine.
+    """
+    writer = RequestLogWriter(session_factory, max_queue_size=1, flush_interval=60, overflow_policy="drop")
+    await writer.start()
+
+    await writer.enqueue_many(["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"] * 3)
+    await writer.stop()
+
+    assert writer.stats.dropped >= 1
+    assert writer.stats.written + writer.stats.dropped == 3
+
+
+@pytest.mark.anyio
+async def test_writer_writes_directly_when_not_started(session_factory, async_session):
+    """
+    Tests that records are written synchronously when the background worker is not running.
+
+    Args:
+        session_factory: Session factory fixture for the test engine.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    writer = RequestLogWriter(session_factory)
+
+    await writer.enqueue("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb")
+
+    result = await async_session.execute(select(Request))
+    assert len(result.scalars().all()) == 1
+    assert writer.stats.direct_writes == 1
+
+
+def test_batch_writer_requires_write(session_factory):
+    """
+    Tests that a batch writer that does not define how batches are written cannot be created.
+
+    Args:
+        session_factory: Session factory fixture.
+    """
+    with pytest.raises(TypeError):
+        BatchWriter(session_factory)
@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+from app.cache import CacheEntry, SharedStateCacheBackend
+from app.shared_state import StateStore, LocalSharedState, ManagerSharedState, start_state_server
+from app.singleflight import SharedSingleFlight
+from app.upstream import SharedTokenBucket
+
+
+class FakeClock:
+    """
+    Manually advanced time source.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_state_store_expiry_tokens_and_leases():
+    """
+    Tests value expiry, token bucket accounting and lease exclusivity of the state store.
+    """
+    clock = FakeClock()
+    store = StateStore(clock=clock)
+    store.set("key", "value", ttl=1)
+    assert store.acquire("lease", ttl=5)
+    assert not store.acquire("lease", ttl=5)
+    assert store.take_token("bucket", rate=2, burst=1) == 0
+    assert store.take_token("bucket", rate=2, burst=1) == pytest.approx(0.5)
+
+    clock.now = 1.0
+    assert store.get("key") is None
+    assert store.take_token("bucket", rate=2, burst=1) == 0
+    assert not store.acquire("lease", ttl=5)
+
+    clock.now = 5.0
+    assert store.acquire("lease", ttl=5)
+
+
+def test_state_store_sweeps_expired_keys_and_idle_buckets():
+    """
+    Tests that expired values, expired leases and refilled token buckets are removed, so the store shrinks.
+    """
+    clock = FakeClock()
+    store = StateStore(clock=clock, sweep_interval=10)
+    for index in range(100):
+        store.set(f"wallet:{index}", index, ttl=5)
+        store.take_token(f"ip:{index}", rate=1, burst=2)
+    store.acquire("lease", ttl=5)
+    store.set("long", "value", ttl=60)
+    store.take_token("busy", rate=0.01, burst=1)
+    assert len(store) == 203
+
+    clock.now = 9.0
+    store.set("fresh", "value", ttl=60)
+    assert len(store) == 204
+
+    clock.now = 10.0
+    store.set("fresh", "value", ttl=60)
+    # Only the unexpired values and the bucket still refilling remain.
+    assert len(store) == 3
+    assert store.get("long") == "value"
+    assert store.take_token("busy", rate=0.01, burst=1) > 0
+
+    clock.now = 200.0
+    assert store.sweep() == 3
+    assert len(store) == 0
+
+
+@pytest.mark.anyio
+async def test_shared_single_flight_coalesces_across_instances():
+    """
+    Tests that two single-flight instances (as in two workers) sharing state run a call once.
+    """
+    state = LocalSharedState()
+    first, second = SharedSingleFlight(state, poll_interval=0.01), SharedSingleFlight(state, poll_interval=0.01)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"balance_trx": 1.0}
+
+    results = await asyncio.gather(first.do("A", fetch), second.do("A", fetch))
+
+    assert results == [{"balance_trx": 1.0}, {"balance_trx": 1.0}]
+    assert calls == 1
+    assert first.remote_shared + second.remote_shared == 1
+
+
+@pytest.mark.anyio
+async def test_shared_single_flight_takes_over_after_failure():
+    """
+    Tests that a waiting worker runs the call itself when the leader fails.
+    """
+    state = LocalSharedState()
+    first, second = SharedSingleFlight(state, poll_interval=0.01), SharedSingleFlight(state, poll_interval=0.01)
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("boom")
+
+    async def succeeding():
+        return "ok"
+
+    results = await asyncio.gather(first.do("A", failing), second.do("A", succeeding), return_exceptions=True)
+
+    assert isinstance(results[0], ValueError)
+    assert results[1] == "ok"
+
+
+@pytest.mark.anyio
+async def test_shared_state_cache_backend_round_trip():
+    """
+    Tests that cache entries are stored in shared state until they go stale.
+    """
+    backend = SharedStateCacheBackend(LocalSharedState(), clock=lambda: 100.0)
+    await backend.set("A", CacheEntry(value={"energy": 1}, fresh_until=110.0, stale_until=130.0))
+    await backend.set("B", CacheEntry(value={"energy": 2}, fresh_until=90.0, stale_until=95.0))
+
+    assert (await backend.get("A")).value == {"energy": 1}
+    assert await backend.get("B") is None
+    await backend.delete("A")
+    assert await backend.get("A") is None
+
+
+@pytest.mark.anyio
+async def test_manager_shared_state_is_shared_between_clients():
+    """
+    Tests that clients of a state server (one per worker) see the same values and rate limit.
+    """
+    server = start_state_server()
+    try:
+        first = ManagerSharedState(server.address, server._authkey)
+        second = ManagerSharedState(server.address, server._authkey)
+        await first.set("key", {"value": 1})
+        assert await second.get("key") == {"value": 1}
+        assert await first.acquire("lease", ttl=5)
+        assert not await second.acquire("lease", ttl=5)
+
+        limiter = SharedTokenBucket(second, "ratelimit", rate=0.01, burst=1)
+        await limiter.acquire()
+        assert await first.take_token("ratelimit", 0.01, 1) > 0
+    finally:
+        server.shutdown()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from app import tron_service
+from app.cache import TTLCache
+from app.singleflight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_execution():
+    """
+    Tests that concurrent callers with the same key share a single call and its result.
+    """
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"balance_trx": 1.0}
+
+    results = await asyncio.gather(*(flight.do("addr", fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"balance_trx": 1.0} for result in results)
+    assert flight.shared == 9
+    assert len(flight) == 0
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_the_error():
+    """
+    Tests that every caller of a failed shared call receives the same error.
+    """
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("Invalid address")
+
+    results = await asyncio.gather(*(flight.do("addr", fetch) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.calls == 1
+
+
+@pytest.mark.anyio
+async def test_get_wallet_info_coalesces_address_formats(mocker):
+    """
+    Tests that base58 and hex forms of the same address trigger a single upstream fetch.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(tron_service, "wallet_cache", TTLCache(maxsize=10, ttl=10))
+    mocker.patch.object(tron_service, "inflight_lookups", SingleFlight())
+    calls = []
+
+    async def fake_fetch(address):
+        calls.append(address)
+        await asyncio.sleep(0.01)
+        return {"balance_trx": 1.0, "bandwidth": 0, "energy": 0}
+
+    mocker.patch("app.tron_service.fetch_wallet_info", fake_fetch)
+
+    await asyncio.gather(
+        tron_service.get_wallet_info("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"),
+        tron_service.get_wallet_info("410000000000000000000000000000000000000000"),
+    )
+
+    assert calls == ["T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"]
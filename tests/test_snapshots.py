@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime, timedelta, UTC
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app import crud
+from app.cache import TTLCache
+from app.snapshots import SnapshotWriter, SnapshotCacheBackend
+
+ADDRESS = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+
+@pytest.fixture
+def session_factory(async_engine, async_session):
+    """
+    Provides a session factory bound to the test engine.
+
+    Args:
+        async_engine: The async SQLAlchemy engine fixture.
+        async_session: Async SQLAlchemy session fixture (clears the tables).
+
+    Returns:
+        async_sessionmaker: Factory for sessions on the test database.
+    """
+    return async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.mark.anyio
+async def test_cache_records_fetched_values_as_snapshots(session_factory, async_session):
+    """
+    Tests that values loaded into a cache with a snapshot backend are stored as snapshots.
+
+    Args:
+        session_factory: Session factory fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    cache = TTLCache(maxsize=10, ttl=10, backend=SnapshotCacheBackend(SnapshotWriter(session_factory)))
+
+    async def loader():
+        return {"balance_trx": 1.5, "bandwidth": 10, "energy": 20}
+
+    await cache.get_or_load(ADDRESS, loader)
+
+    snapshot = await crud.get_latest_snapshot(async_session, ADDRESS)
+    assert (snapshot.balance_trx, snapshot.bandwidth, snapshot.energy) == (1.5, 10, 20)
+
+
+@pytest.mark.anyio
+async def test_recent_snapshot_is_served_without_loading(session_factory, async_session):
+    """
+    Tests that a snapshot within the freshness bound answers a cache miss, and an older one does not.
+
+    Args:
+        session_factory: Session factory fixture.
+        async_session: Async SQLAlchemy session fixture.
+    """
+    await crud.create_snapshots(async_session, [
+        (ADDRESS, datetime.now(UTC) - timedelta(seconds=30), {"balance_trx": 2.0, "bandwidth": 1, "energy": 2}),
+    ])
+    backend = SnapshotCacheBackend(SnapshotWriter(session_factory), max_age=60)
+
+    async def loader():
+        raise AssertionError("loader must not be called")
+
+    cache = TTLCache(maxsize=10, ttl=10, backend=backend)
+    assert await cache.get_or_load(ADDRESS, loader) == {"balance_trx": 2.0, "bandwidth": 1, "energy": 2}
+
+    backend.max_age = 10
+    assert await backend.get(ADDRESS) is None
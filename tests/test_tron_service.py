@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from tronpy.exceptions import AddressNotFound
+from app import tron_service
+from app.cache import TTLCache
+from app.upstream import UpstreamPool, UpstreamClient, UpstreamUnavailableError
+
+
+class FakeTronClient:
+    def __init__(self, account_error: Exception | None = None, resource_delay: float = 0.0):
+        self.account_error = account_error
+        self.resource_delay = resource_delay
+        self.resource_cancelled = False
+
+    async def get_account(self, address):
+        await asyncio.sleep(0.01)
+        if self.account_error:
+            raise self.account_error
+        return {"balance": 2_500_000}
+
+    async def get_account_resource(self, address):
+        try:
+            await asyncio.sleep(self.resource_delay)
+        except asyncio.CancelledError:
+            self.resource_cancelled = True
+            raise
+        return {"freeNetLimit": 600, "freeNetUsed": 100, "EnergyLimit": 50, "EnergyUsed": 10}
+
+
+@pytest.mark.anyio
+async def test_fetch_wallet_info_runs_calls_concurrently(mocker):
+    """
+    Tests that account and resource calls overlap instead of running back to back.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    client = FakeTronClient()
+    # Each call only returns once both are in flight, so running them back to back would time out.
+    barrier = asyncio.Barrier(2)
+    get_account, get_account_resource = client.get_account, client.get_account_resource
+
+    async def wait_for_sibling(call, address):
+        await barrier.wait()
+        return await call(address)
+
+    mocker.patch.object(client, "get_account", lambda address: wait_for_sibling(get_account, address))
+    mocker.patch.object(
+        client, "get_account_resource", lambda address: wait_for_sibling(get_account_resource, address)
+    )
+    mocker.patch.object(
+        tron_service, "upstream_pool", UpstreamPool([UpstreamClient("fake", client)], call_timeout=1, max_retries=0)
+    )
+
+    wallet_info = await tron_service.fetch_wallet_info("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb")
+
+    assert wallet_info == {"balance_trx": 2.5, "bandwidth": 500, "energy": 40}
+
+
+@pytest.mark.anyio
+async def test_fetch_wallet_info_cancels_sibling_on_address_not_found(mocker):
+    """
+    Tests that the resource call is cancelled once the account call reports an unknown address.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    client = FakeTronClient(account_error=AddressNotFound("account not found on-chain"), resource_delay=10)
+    mocker.patch.object(tron_service, "upstream_pool", UpstreamPool([UpstreamClient("fake", client)]))
+
+    with pytest.raises(ValueError, match="Invalid address"):
+        await tron_service.fetch_wallet_info("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb")
+
+    assert client.resource_cancelled
+
+
+@pytest.mark.anyio
+async def test_get_wallet_info_serves_last_known_value_when_upstream_unavailable(mocker):
+    """
+    Tests that an expired cache entry is served when all circuit breakers are open.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    cache = TTLCache(maxsize=10, ttl=0)
+    await cache.set("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb", {"balance_trx": 1.0, "bandwidth": 0, "energy": 0})
+    mocker.patch.object(tron_service, "wallet_cache", cache)
+    mocker.patch("app.tron_service.fetch_wallet_info", AsyncMock(side_effect=UpstreamUnavailableError()))
+
+    wallet_info = await tron_service.get_wallet_info("T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb")
+
+    assert wallet_info["balance_trx"] == 1.0
+
+
+@pytest.mark.anyio
+async def test_upstream_pool_is_created_on_first_use(mocker):
+    """
+    Tests that the Tron API client pool is built lazily and requires an API key only when it is built.
+
+    Args:
+        mocker: Pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(tron_service, "upstream_pool", None)
+    mocker.patch.object(tron_service, "TRON_API_KEYS", [])
+    with pytest.raises(tron_service.TronNotConfiguredError):
+        tron_service.get_upstream_pool()
+
+    mocker.patch.object(tron_service, "TRON_API_KEYS", ["key"])
+    pool = tron_service.get_upstream_pool()
+    assert tron_service.get_upstream_pool() is pool
+
+    await tron_service.close_upstream_pool()
+    assert tron_service.upstream_pool is None
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from tronpy.exceptions import AddressNotFound, ApiError
+from app.upstream import CircuitBreaker, TokenBucket, UpstreamClient, UpstreamPool, UpstreamUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class HangingTron:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.hang = True
+
+    async def get_account(self, address):
+        self.started.set()
+        if self.hang:
+            await asyncio.Event().wait()
+        return {"balance": 1}
+
+
+class FlakyTron:
+    def __init__(self, failures: int = 0, error: Exception | None = None):
+        self.failures = failures
+        self.error = error or ApiError("temporary failure")
+        self.calls = 0
+
+    async def get_account(self, address):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return {"balance": 1}
+
+
+def test_token_bucket_limits_bursts():
+    """
+    Tests that the token bucket allows a burst and then refills at the configured rate.
+    """
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 0.5
+    assert bucket.try_acquire()
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """
+    Tests that the breaker opens after consecutive failures and closes after a successful trial call.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.anyio
+async def test_pool_retries_transient_errors():
+    """
+    Tests that transient API errors are retried until the call succeeds.
+    """
+    tron = FlakyTron(failures=2)
+    pool = UpstreamPool([UpstreamClient("fake", tron)], max_retries=2, backoff_base=0)
+
+    assert await pool.call(lambda client: client.get_account("T9yD14")) == {"balance": 1}
+    assert tron.calls == 3
+
+
+@pytest.mark.anyio
+async def test_pool_does_not_retry_address_not_found():
+    """
+    Tests that non-transient errors are raised immediately.
+    """
+    tron = FlakyTron(failures=1, error=AddressNotFound("account not found on-chain"))
+    pool = UpstreamPool([UpstreamClient("fake", tron)], max_retries=2, backoff_base=0)
+
+    with pytest.raises(AddressNotFound):
+        await pool.call(lambda client: client.get_account("T9yD14"))
+    assert tron.calls == 1
+
+
+@pytest.mark.anyio
+async def test_pool_fails_fast_when_circuit_open():
+    """
+    Tests that calls are rejected without contacting the upstream once the breaker is open.
+    """
+    tron = FlakyTron(failures=10)
+    client = UpstreamClient("fake", tron, breaker=CircuitBreaker(failure_threshold=1))
+    pool = UpstreamPool([client], max_retries=0)
+
+    with pytest.raises(ApiError):
+        await pool.call(lambda c: c.get_account("T9yD14"))
+    with pytest.raises(UpstreamUnavailableError):
+        await pool.call(lambda c: c.get_account("T9yD14"))
+    assert tron.calls == 1
+
+
+@pytest.mark.anyio
+async def test_pool_round_robin_spreads_calls():
+    """
+    Tests that round-robin selection alternates between clients.
+    """
+    first, second = FlakyTron(), FlakyTron()
+    pool = UpstreamPool([UpstreamClient("first", first), UpstreamClient("second", second)])
+
+    for _ in range(4):
+        await pool.call(lambda client: client.get_account("T9yD14"))
+
+    assert first.calls == 2
+    assert second.calls == 2
+
+
+@pytest.mark.anyio
+async def test_pool_releases_cancelled_trial_call():
+    """
+    Tests that cancelling the half-open trial call lets a later call make the trial and close the breaker.
+    """
+    clock = FakeClock()
+    tron = HangingTron()
+    client = UpstreamClient("fake", tron, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock))
+    pool = UpstreamPool([client], max_retries=0)
+    client.breaker.record_failure()
+    clock.now += 10
+
+    task = asyncio.create_task(pool.call(lambda c: c.get_account("T9yD14")))
+    await tron.started.wait()
+    with pytest.raises(UpstreamUnavailableError):
+        await pool.call(lambda c: c.get_account("T9yD14"))
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    tron.hang = False
+    assert await pool.call(lambda c: c.get_account("T9yD14")) == {"balance": 1}
+    assert client.breaker.state == "closed"
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from app.watch import WalletWatcher
+
+
+class FakeFetch:
+    """
+    Fake wallet fetcher returning configurable wallet information and counting calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.balances: dict[str, float] = {}
+
+    async def __call__(self, address: str) -> dict:
+        self.calls += 1
+        if address not in self.balances:
+            raise ValueError("Invalid address")
+        return {"balance_trx": self.balances[address], "bandwidth": 0, "energy": 0}
+
+
+async def next_update(subscription, timeout: float = 1.0) -> dict:
+    """
+    Waits for the next update of a subscription.
+
+    Args:
+        subscription: The subscription.
+        timeout (float): Seconds to wait.
+
+    Returns:
+        dict: The update.
+    """
+    return await asyncio.wait_for(subscription.get(), timeout)
+
+
+@pytest.mark.anyio
+async def test_watcher_polls_each_address_once_for_all_subscribers():
+    """
+    Tests that subscribers of the same address share one upstream fetch per interval.
+    """
+    fetch = FakeFetch()
+    fetch.balances["A"] = 1.0
+    watcher = WalletWatcher(fetch, interval=0.05)
+    first, second = watcher.subscribe(), watcher.subscribe()
+    watcher.watch(first, ["A"])
+    watcher.watch(second, ["A"])
+    await watcher.start()
+    try:
+        assert (await next_update(first))["wallet"]["balance_trx"] == 1.0
+        assert (await next_update(second))["wallet"]["balance_trx"] == 1.0
+        await asyncio.sleep(0.2)
+    finally:
+        await watcher.stop()
+
+    assert watcher.watched == 1
+    assert 2 <= fetch.calls <= 6
+
+
+@pytest.mark.anyio
+async def test_watcher_sends_only_changes():
+    """
+    Tests that unchanged wallet information is not pushed again and changes are.
+    """
+    fetch = FakeFetch()
+    fetch.balances["A"] = 1.0
+    watcher = WalletWatcher(fetch, interval=0.02)
+    subscription = watcher.subscribe()
+    watcher.watch(subscription, ["A"])
+    await watcher.start()
+    try:
+        await next_update(subscription)
+        await asyncio.sleep(0.1)
+        with pytest.raises(asyncio.TimeoutError):
+            await next_update(subscription, timeout=0.05)
+        fetch.balances["A"] = 2.0
+        assert (await next_update(subscription))["wallet"]["balance_trx"] == 2.0
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.anyio
+async def test_watcher_reports_errors_and_replays_last_state():
+    """
+    Tests that fetch errors are delivered as updates and late subscribers get the last known state.
+    """
+    fetch = FakeFetch()
+    watcher = WalletWatcher(fetch, interval=10)
+    first = watcher.subscribe()
+    watcher.watch(first, ["missing"])
+    await watcher.start()
+    try:
+        update = await next_update(first)
+        assert update == {"address": "missing", "wallet": None, "error": "Invalid address"}
+
+        late = watcher.subscribe()
+        watcher.watch(late, ["missing"])
+        assert (await next_update(late)) == update
+        assert fetch.calls == 1
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.anyio
+async def test_watcher_stops_polling_unwatched_addresses():
+    """
+    Tests that addresses without subscribers are no longer polled and limits are enforced.
+    """
+    fetch = FakeFetch()
+    fetch.balances["A"] = 1.0
+    watcher = WalletWatcher(fetch, interval=0.02, max_addresses=1)
+    subscription = watcher.subscribe()
+    watcher.watch(subscription, ["A"])
+    with pytest.raises(ValueError):
+        watcher.watch(subscription, ["B"])
+    await watcher.start()
+    try:
+        await next_update(subscription)
+        watcher.unsubscribe(subscription)
+        calls = fetch.calls
+        await asyncio.sleep(0.1)
+    finally:
+        await watcher.stop()
+
+    assert fetch.calls == calls
+    assert watcher.watched == 0
+    assert watcher.subscriptions == 0
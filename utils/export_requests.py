@@ -0,0 +1,46 @@
+"""
+Exports the request log as NDJSON or CSV, streaming rows from a server-side cursor.
+
+Memory use is bounded by one batch, so a day (or all) of requests can be exported in one run.
+
+Usage:
+    python -m utils.export_requests [--format ndjson|csv] [--wallet-address T...]
+        [--created-from 2025-01-01T00:00:00+00:00] [--created-to 2025-01-02T00:00:00+00:00]
+        [--batch-size 1000] [--output requests.ndjson]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from app.database import get_engine, async_session
+from app.export import EXPORT_FORMATS, iter_export
+
+
+async def export_requests(args: argparse.Namespace):
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in iter_export(
+                async_session, args.format, args.batch_size, args.wallet_address, args.created_from, args.created_to
+        ):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson", help="Output format")
+    parser.add_argument("--wallet-address", help="Only export requests for this wallet address")
+    parser.add_argument(
+        "--created-from", type=datetime.fromisoformat, help="Inclusive lower bound of created_at (ISO 8601)"
+    )
+    parser.add_argument(
+        "--created-to", type=datetime.fromisoformat, help="Exclusive upper bound of created_at (ISO 8601)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows fetched at a time")
+    parser.add_argument("--output", help="Output file (default: standard output)")
+    asyncio.run(export_requests(parser.parse_args()))
@@ -1,10 +1,15 @@
 import asyncio
-from app.database import engine
+from app.database import get_engine
 from app.models import Base
 
 async def init_db():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add indexes introduced later explicitly
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+    await get_engine().dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+"""
+Time-based partitioning and retention of the `requests` table (PostgreSQL only).
+
+The table is range-partitioned by `created_at`, one partition per day or month, plus a default partition
+that catches rows outside every range. Old partitions are detached and dropped (or moved to an archive
+schema) as a whole, so retention never deletes rows one by one and queries bounded by `created_at` only
+touch the partitions that can contain matching rows.
+
+Usage:
+    python -m utils.partitions migrate    # convert an existing (or freshly created) table, run once
+    python -m utils.partitions maintain   # create upcoming partitions and apply retention, run from cron
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from datetime import datetime, timedelta, UTC
+from dotenv import load_dotenv
+import argparse
+import asyncio
+import os
+import re
+from app.database import get_engine
+from app.models import Request
+from app.logger import setup_logger
+
+logger = setup_logger("partitions")
+
+load_dotenv()
+
+TABLE = "requests"
+DEFAULT_PARTITION = f"{TABLE}_default"
+LEGACY_PARTITION = f"{TABLE}_legacy"
+PARTITION_INTERVALS = ("day", "month")
+RETENTION_MODES = ("drop", "archive")
+
+_BOUND_VALUE = re.compile(r"MINVALUE|MAXVALUE|'([^']+)'")
+
+
+def partition_start(moment: datetime, interval: str) -> datetime:
+    """
+    Returns the start of the partition period containing `moment`.
+
+    Args:
+        moment (datetime): Timezone-aware point in time.
+        interval (str): Partition period, "day" or "month".
+
+    Returns:
+        datetime: Midnight UTC of the day, or of the first day of the month, containing `moment`.
+
+    Raises:
+        ValueError: If the interval is not supported.
+    """
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Unsupported partition interval: {interval}")
+    start = moment.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start if interval == "day" else start.replace(day=1)
+
+
+def next_partition_start(start: datetime, interval: str) -> datetime:
+    """
+    Returns the start of the partition period following the one starting at `start`.
+
+    Args:
+        start (datetime): Start of a partition period.
+        interval (str): Partition period, "day" or "month".
+
+    Returns:
+        datetime: Start of the next period.
+    """
+    if interval == "day":
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    """
+    Returns the table name of the partition for the period starting at `start`.
+
+    Args:
+        start (datetime): Start of a partition period.
+        interval (str): Partition period, "day" or "month".
+
+    Returns:
+        str: Name such as "requests_p20261017" (daily) or "requests_p202610" (monthly).
+    """
+    return f"{TABLE}_p{start:%Y%m%d}" if interval == "day" else f"{TABLE}_p{start:%Y%m}"
+
+
+def parse_bounds(expression: str) -> tuple[datetime | None, datetime | None] | None:
+    """
+    Parses a range partition bound as returned by `pg_get_expr(relpartbound, oid)`.
+
+    Args:
+        expression (str): Bound such as "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO (MAXVALUE)".
+
+    Returns:
+        tuple[datetime | None, datetime | None] | None: Lower and upper bound, None for MINVALUE/MAXVALUE;
+            None for the default partition.
+    """
+    if expression.strip().upper() == "DEFAULT":
+        return None
+    lower, upper = [
+        datetime.fromisoformat(match.group(1)) if match.group(1) else None
+        for match in _BOUND_VALUE.finditer(expression)
+    ]
+    return lower, upper
+
+
+def _require_postgresql(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "postgresql":
+        raise ValueError(f"Partitioning requires PostgreSQL, not {conn.dialect.name}")
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """
+    Tells whether the requests table is already partitioned.
+
+    Args:
+        conn (AsyncConnection): Connection to the PostgreSQL database.
+
+    Returns:
+        bool: True if the table exists and is partitioned.
+    """
+    result = await conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"), {"table": TABLE}
+    )
+    return result.scalar() is not None
+
+
+async def list_partitions(conn: AsyncConnection) -> dict[str, tuple[datetime | None, datetime | None] | None]:
+    """
+    Lists the partitions of the requests table with their bounds.
+
+    Args:
+        conn (AsyncConnection): Connection to the PostgreSQL database.
+
+    Returns:
+        dict[str, tuple[datetime | None, datetime | None] | None]: Bounds by partition name (see
+            `parse_bounds`).
+    """
+    result = await conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": TABLE})
+    return {name: parse_bounds(bound) for name, bound in result.all()}
+
+
+async def ensure_partitions(
+        conn: AsyncConnection,
+        interval: str,
+        premake: int,
+        now: datetime | None = None
+) -> list[str]:
+    """
+    Creates the partitions for the current period and the `premake` following ones.
+
+    Args:
+        conn (AsyncConnection): Connection to the PostgreSQL database, inside a transaction.
+        interval (str): Partition period, "day" or "month".
+        premake (int): Number of future periods to create in advance.
+        now (datetime, optional): Current time, overridable for backfills.
+
+    Returns:
+        list[str]: Names of the partitions created.
+
+    Raises:
+        ValueError: If the database is not PostgreSQL or the table is not partitioned.
+
+    Notes:
+        - Periods overlapping an existing partition (e.g. the legacy one) are skipped.
+        - Concurrent runs are serialized with a transaction-level advisory lock.
+        - Creating a partition fails if the default partition already holds rows of its period, so
+          partitions should be created ahead of time.
+    """
+    _require_postgresql(conn)
+    if not await is_partitioned(conn):
+        raise ValueError(f"Table {TABLE} is not partitioned; run `python -m utils.partitions migrate` first")
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": TABLE})
+
+    existing = [bounds for bounds in (await list_partitions(conn)).values() if bounds is not None]
+    created = []
+    start = partition_start(now or datetime.now(UTC), interval)
+    for _ in range(premake + 1):
+        end = next_partition_start(start, interval)
+        overlaps = any(
+            (lower is None or lower < end) and (upper is None or start < upper) for lower, upper in existing
+        )
+        if not overlaps:
+            name = partition_name(start, interval)
+            await conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            existing.append((start, end))
+            created.append(name)
+            logger.info("Created partition %s", name)
+        start = end
+    return created
+
+
+async def apply_retention(
+        conn: AsyncConnection,
+        retention_days: int,
+        mode: str = "drop",
+        archive_schema: str = "archive",
+        now: datetime | None = None
+) -> list[str]:
+    """
+    Detaches partitions whose rows are all older than the retention period and drops or archives them.
+
+    Args:
+        conn (AsyncConnection): Connection to the PostgreSQL database, inside a transaction.
+        retention_days (int): Days of requests to keep.
+        mode (str): "drop" to delete detached partitions, "archive" to move them to `archive_schema`.
+        archive_schema (str): Schema receiving archived partitions.
+        now (datetime, optional): Current time, overridable in tests.
+
+    Returns:
+        list[str]: Names of the partitions removed from the requests table.
+
+    Raises:
+        ValueError: If the mode is unknown or the database is not PostgreSQL.
+
+    Notes:
+        - Removing a partition is a catalog operation, independent of the number of rows it holds.
+        - The default partition is never removed.
+    """
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"Unsupported retention mode: {mode}")
+    _require_postgresql(conn)
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": TABLE})
+
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=retention_days)
+    expired = sorted(
+        name for name, bounds in (await list_partitions(conn)).items()
+        if bounds is not None and bounds[1] is not None and bounds[1] <= cutoff
+    )
+    if expired and mode == "archive":
+        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+    for name in expired:
+        await conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        if mode == "drop":
+            await conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        logger.info("Removed partition %s (%s)", name, mode)
+    return expired
+
+
+async def migrate(conn: AsyncConnection, interval: str, premake: int) -> bool:
+    """
+    Converts the plain requests table into a partitioned one.
+
+    The existing table becomes the legacy partition covering everything up to the end of the current
+    period, so no rows are copied; new partitions start after it.
+
+    Args:
+        conn (AsyncConnection): Connection to the PostgreSQL database, inside a transaction.
+        interval (str): Partition period, "day" or "month".
+        premake (int): Number of future periods to create in advance.
+
+    Returns:
+        bool: True if the table was converted, False if it was already partitioned.
+
+    Raises:
+        ValueError: If the database is not PostgreSQL.
+
+    Notes:
+        - Holds an exclusive lock on the table while replacing its `id` primary key with the
+          `(id, created_at)` one required by partitioning and attaching it as the legacy partition, which
+          scans it once.
+    """
+    _require_postgresql(conn)
+    if await is_partitioned(conn):
+        return False
+
+    await conn.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    sequence = (await conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": TABLE})).scalar()
+    newest = (await conn.execute(text(f"SELECT max(created_at) FROM {TABLE}"))).scalar()
+    now = datetime.now(UTC)
+    upper = next_partition_start(partition_start(max(now, newest or now), interval), interval)
+
+    # Free the table and index names for the partitioned table.
+    await conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_PARTITION}"))
+    indexes = await conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": LEGACY_PARTITION}
+    )
+    for (index,) in indexes.all():
+        await conn.execute(text(f"ALTER INDEX {index} RENAME TO {index}_legacy"))
+    await conn.execute(text(f"DELETE FROM {LEGACY_PARTITION} WHERE created_at IS NULL"))
+    await conn.execute(text(f"ALTER TABLE {LEGACY_PARTITION} ALTER COLUMN created_at SET NOT NULL"))
+    # A partition cannot keep its own primary key: attaching it adds the parent's `(id, created_at)` one.
+    primary_key = (await conn.execute(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'p'"),
+        {"table": LEGACY_PARTITION}
+    )).scalar()
+    if primary_key is not None:
+        await conn.execute(text(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT {primary_key}"))
+    await conn.execute(text(
+        f"ALTER TABLE {LEGACY_PARTITION} ADD CONSTRAINT {LEGACY_PARTITION}_pkey PRIMARY KEY (id, created_at)"
+    ))
+
+    await conn.execute(text(
+        f"CREATE TABLE {TABLE} ("
+        f"id INTEGER NOT NULL DEFAULT nextval('{sequence}'), "
+        f"created_at TIMESTAMP WITH TIME ZONE NOT NULL, "
+        f"wallet_address VARCHAR NOT NULL, "
+        f"PRIMARY KEY (id, created_at)"
+        f") PARTITION BY RANGE (created_at)"
+    ))
+    await conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+    await conn.execute(text(f"ALTER TABLE {LEGACY_PARTITION} ALTER COLUMN id DROP DEFAULT"))
+    for index in Request.__table__.indexes:
+        await conn.run_sync(index.create)
+    await conn.execute(text(
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY_PARTITION} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{upper.isoformat()}')"
+    ))
+    await conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    await ensure_partitions(conn, interval, premake)
+    logger.info("Partitioned table %s by %s; legacy rows up to %s", TABLE, interval, upper.isoformat())
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("migrate", "maintain"))
+    parser.add_argument(
+        "--interval", choices=PARTITION_INTERVALS, default=os.getenv("REQUESTS_PARTITION_INTERVAL", "month")
+    )
+    parser.add_argument("--premake", type=int, default=int(os.getenv("REQUESTS_PARTITION_PREMAKE", "3")))
+    parser.add_argument(
+        "--retention-days", type=int, default=int(os.getenv("REQUESTS_RETENTION_DAYS", "0")),
+        help="days of requests to keep (0 keeps everything)"
+    )
+    parser.add_argument(
+        "--retention-mode", choices=RETENTION_MODES, default=os.getenv("REQUESTS_RETENTION_MODE", "drop")
+    )
+    parser.add_argument("--archive-schema", default=os.getenv("REQUESTS_ARCHIVE_SCHEMA", "archive"))
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        async with get_engine().begin() as conn:
+            if args.command == "migrate":
+                if not await migrate(conn, args.interval, args.premake):
+                    logger.info("Table %s is already partitioned", TABLE)
+                return
+            await ensure_partitions(conn, args.interval, args.premake)
+            if args.retention_days > 0:
+                await apply_retention(conn, args.retention_days, args.retention_mode, args.archive_schema)
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
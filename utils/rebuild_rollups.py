@@ -0,0 +1,24 @@
+"""
+Recomputes the request analytics rollups from the `requests` table.
+
+Needed after loading or deleting request rows outside the application (e.g. after dropping old
+partitions), or to initialise the rollups of an existing database.
+
+Usage:
+    python -m utils.rebuild_rollups
+"""
+import asyncio
+from app import crud
+from app.database import get_engine, async_session
+
+
+async def rebuild_rollups():
+    try:
+        async with async_session() as db:
+            await crud.rebuild_rollups(db)
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_rollups())